@@ -20,9 +20,48 @@ class Producto:
     def from_dict(data):
         return Producto(data["id"], data["nombre"], data["cantidad"], data["precio"])
 
+class ColeccionProductos:
+    # Productos en orden de inserción con índice por ID. El dict de Python conserva
+    # el orden de inserción, así que buscar, borrar y actualizar por ID es O(1) y
+    # recorrer sigue dando los productos en el orden en que se agregaron.
+    def __init__(self, productos=()):
+        self._por_id = {}
+        self.extend(productos)
+
+    def __iter__(self):
+        return iter(self._por_id.values())
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __contains__(self, id_producto):
+        return id_producto in self._por_id
+
+    def obtener(self, id_producto):
+        return self._por_id.get(id_producto)
+
+    def append(self, producto):
+        if producto.id in self._por_id:
+            raise ValueError(f"ID duplicado: {producto.id}")
+        self._por_id[producto.id] = producto
+
+    def extend(self, productos):
+        for p in productos:
+            self.append(p)
+
+    def remove(self, producto):
+        if self._por_id.get(producto.id) is not producto:
+            raise ValueError("El producto no está en la colección.")
+        del self._por_id[producto.id]
+
+    def quitar(self, id_producto):
+        # devuelve el producto quitado o None si no existía
+        return self._por_id.pop(id_producto, None)
+
+
 class Inventario:
     def __init__(self, archivo="inventario.json"):
-        self.productos = []
+        self.productos = ColeccionProductos()
         self.archivo = archivo
         self.cargar_desde_archivo()
 
@@ -33,7 +72,11 @@ class Inventario:
             with open(self.archivo, 'r') as f:
                 data = json.load(f)
                 for item in data:
-                    self.productos.append(Producto.from_dict(item))
+                    producto = Producto.from_dict(item)
+                    if producto.id in self.productos:
+                        print(f"ID duplicado en el archivo, se ignora: {producto.id}")
+                    else:
+                        self.productos.append(producto)
         except (FileNotFoundError, PermissionError, json.JSONDecodeError) as e:
             print(f"Error al leer el archivo: {e}")
 
@@ -45,7 +88,7 @@ class Inventario:
             print("Error: no se puede escribir en el archivo.")
 
     def agregar_producto(self, producto):
-        if any(p.id == producto.id for p in self.productos):
+        if producto.id in self.productos:
             print("ID ya existe.")
         else:
             self.productos.append(producto)
@@ -53,25 +96,23 @@ class Inventario:
             print("Producto agregado y guardado en el archivo.")
 
     def eliminar_producto(self, id_producto):
-        for p in self.productos:
-            if p.id == id_producto:
-                self.productos.remove(p)
-                self.guardar_en_archivo()
-                print("Producto eliminado y cambios guardados.")
-                return
-        print("Producto no encontrado.")
+        if self.productos.quitar(id_producto) is None:
+            print("Producto no encontrado.")
+            return
+        self.guardar_en_archivo()
+        print("Producto eliminado y cambios guardados.")
 
     def actualizar_producto(self, id_producto, cantidad=None, precio=None):
-        for p in self.productos:
-            if p.id == id_producto:
-                if cantidad is not None:
-                    p.cantidad = cantidad
-                if precio is not None:
-                    p.precio = precio
-                self.guardar_en_archivo()
-                print("Producto actualizado y cambios guardados.")
-                return
-        print("Producto no encontrado.")
+        p = self.productos.obtener(id_producto)
+        if p is None:
+            print("Producto no encontrado.")
+            return
+        if cantidad is not None:
+            p.cantidad = cantidad
+        if precio is not None:
+            p.precio = precio
+        self.guardar_en_archivo()
+        print("Producto actualizado y cambios guardados.")
 
     def buscar_producto(self, nombre):
         resultados = [p for p in self.productos if nombre.lower() in p.nombre.lower()]
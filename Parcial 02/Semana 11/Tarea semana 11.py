@@ -1,9 +1,25 @@
+import argparse
+import csv
+import itertools
 import json
 import os
-from typing import Dict, List, Set, Optional, Tuple
-from collections import defaultdict
+import sqlite3
+from typing import Dict, List, Set, Optional, Tuple, Any, Iterator, Iterable, Callable
+from bisect import bisect_left, bisect_right, insort
+import heapq
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 
 DEFAULT_FILE = "inventario.json"
+DEFAULT_DB = "inventario.db"
+EXTENSION_DIARIO = ".log"
+UMBRAL_COMPACTACION = 1000  # registros en el diario antes de volcar un snapshot nuevo
+TAMANO_NGRAMA = 3  # longitud de los n-gramas del índice de subcadenas
+TAMANO_LOTE_IMPORTACION = 10_000  # filas validadas por lote en importar()
+DISTANCIA_DIFUSA = 2  # máximo de errores tolerados por palabra en buscar_aproximado()
+CAPACIDAD_CACHE = 256  # consultas recordadas por buscar_por_nombre() (0 = sin caché)
+TAMANO_BUFFER_EXPORTACION = 1 << 20  # bytes de buffer al escribir en exportar()
+COLUMNAS = ("id", "nombre", "cantidad", "precio")
 
 
 # -------------------------
@@ -13,8 +29,11 @@ class Producto:
     """
     Representa un producto con ID único, nombre, cantidad y precio.
     Provee validaciones en los setters y serialización a dict (para JSON).
+    Usa __slots__ (sin __dict__ por instancia) para reducir memoria en catálogos grandes.
     """
 
+    __slots__ = ("_id", "_nombre", "_cantidad", "_precio")
+
     def __init__(self, id: str, nombre: str, cantidad: int, precio: float):
         # Utilizamos los setters para validar
         self.id = id
@@ -77,10 +96,10 @@ class Producto:
     # serialización para persistencia
     def to_dict(self) -> Dict:
         return {
-            "id": self.id,
-            "nombre": self.nombre,
-            "cantidad": self.cantidad,
-            "precio": self.precio
+            "id": self._id,
+            "nombre": self._nombre,
+            "cantidad": self._cantidad,
+            "precio": self._precio
         }
 
     @staticmethod
@@ -92,10 +111,216 @@ class Producto:
             precio=float(d.get("precio", 0.0))
         )
 
+    @staticmethod
+    def from_dict_confiable(d: Dict) -> "Producto":
+        """
+        Construcción rápida sin pasar por los setters.
+        Solo para datos que ya fueron validados (escritos por Inventario.guardar o el diario).
+        """
+        prod = object.__new__(Producto)
+        prod._id = d["id"]
+        prod._nombre = d["nombre"]
+        prod._cantidad = d["cantidad"]
+        prod._precio = d["precio"]
+        return prod
+
+    @staticmethod
+    def registro_valido(d: Any) -> bool:
+        """
+        Comprobación barata de que un registro ya cumple lo que exigen los setters
+        (claves presentes, tipos exactos, texto sin espacios sobrantes y valores >= 0),
+        así que from_dict_confiable daría el mismo Producto que from_dict.
+        """
+        if type(d) is not dict:
+            return False
+        pid, nombre, cantidad, precio = d.get("id"), d.get("nombre"), d.get("cantidad"), d.get("precio")
+        return (type(pid) is str and pid != "" and pid == pid.strip()
+                and type(nombre) is str and nombre != "" and nombre == nombre.strip()
+                and type(cantidad) is int and cantidad >= 0
+                and type(precio) is float and precio >= 0)
+
+    @staticmethod
+    def desde_registro(d: Dict) -> "Producto":
+        """Ruta rápida si el registro pasa registro_valido(); si no, validación completa."""
+        if Producto.registro_valido(d):
+            return Producto.from_dict_confiable(d)
+        return Producto.from_dict(d)
+
     def __str__(self) -> str:
         return f"{self.id:<8} | {self.nombre:<25} | Cant: {self.cantidad:<6} | ${self.precio:>8.2f}"
 
 
+# -------------------------
+# Lista ordenada por bloques
+# -------------------------
+class ListaOrdenada:
+    """
+    Colección siempre ordenada, sin dependencias externas.
+
+    Guarda los valores en bloques ordenados de tamaño acotado (lista de listas):
+    localizar un valor es una búsqueda binaria sobre los máximos de cada bloque más
+    otra dentro del bloque, así que insertar/quitar cuesta O(log n + tamaño de bloque)
+    y recorrer un rango cuesta O(log n + k), sin reordenar ni copiar toda la colección.
+    """
+
+    TAMANO_BLOQUE = 512
+
+    def __init__(self, valores: Iterable = ()):
+        ordenados = sorted(valores)
+        b = self.TAMANO_BLOQUE
+        self._bloques: List[list] = [ordenados[i:i + b] for i in range(0, len(ordenados), b)]
+        self._maximos: List[Any] = [bloque[-1] for bloque in self._bloques]
+        self._largo = len(ordenados)
+
+    def __len__(self) -> int:
+        return self._largo
+
+    def __iter__(self) -> Iterator:
+        for bloque in self._bloques:
+            yield from bloque
+
+    def añadir(self, valor: Any) -> None:
+        if not self._bloques:
+            self._bloques.append([valor])
+            self._maximos.append(valor)
+            self._largo = 1
+            return
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._bloques):
+            i -= 1
+        bloque = self._bloques[i]
+        insort(bloque, valor)
+        self._maximos[i] = bloque[-1]
+        self._largo += 1
+        if len(bloque) > 2 * self.TAMANO_BLOQUE:
+            # dividimos el bloque para mantener acotado el costo de insort
+            mitad = len(bloque) // 2
+            self._bloques[i:i + 1] = [bloque[:mitad], bloque[mitad:]]
+            self._maximos[i:i + 1] = [bloque[mitad - 1], bloque[-1]]
+
+    def quitar(self, valor: Any) -> None:
+        """Quita `valor`; lanza ValueError si no está."""
+        i = bisect_left(self._maximos, valor)
+        if i < len(self._bloques):
+            bloque = self._bloques[i]
+            j = bisect_left(bloque, valor)
+            if j < len(bloque) and bloque[j] == valor:
+                del bloque[j]
+                self._largo -= 1
+                if bloque:
+                    self._maximos[i] = bloque[-1]
+                else:
+                    del self._bloques[i]
+                    del self._maximos[i]
+                return
+        raise ValueError(f"{valor!r} no está en la lista.")
+
+    def desde(self, minimo: Any, incluir: bool = True) -> Iterator:
+        """Recorre en orden los valores >= minimo (o > minimo si incluir=False)."""
+        buscar = bisect_left if incluir else bisect_right
+        i = buscar(self._maximos, minimo)
+        if i == len(self._bloques):
+            return
+        bloque = self._bloques[i]
+        yield from itertools.islice(bloque, buscar(bloque, minimo), None)
+        for bloque in itertools.islice(self._bloques, i + 1, None):
+            yield from bloque
+
+    def rango(self, minimo: Any = None, maximo: Any = None) -> Iterator:
+        """Recorre en orden los valores con minimo <= valor <= maximo (None = sin límite)."""
+        valores = iter(self) if minimo is None else self.desde(minimo)
+        if maximo is None:
+            return valores
+        return itertools.takewhile(lambda v: v <= maximo, valores)
+
+
+# -------------------------
+# Escritura atómica
+# -------------------------
+@contextmanager
+def escritura_atomica(ruta: str, modo: str = "w", sincronizar: bool = False, **opciones) -> Iterator[Any]:
+    """
+    Abre "<ruta>.tmp" y, si el bloque termina sin error, lo renombra sobre `ruta` con
+    os.replace: quien lea `ruta` ve el archivo anterior o el nuevo completo, nunca uno
+    a medias. Si el bloque falla se borra el temporal. Con sincronizar=True se hace
+    fsync antes del renombrado (el contenido está en disco antes de reemplazar).
+    """
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, modo, **opciones) as f:
+            yield f
+            if sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+    os.replace(temporal, ruta)
+
+
+# -------------------------
+# Exportación en streaming
+# -------------------------
+def exportar_filas(filas: Iterable[Tuple[str, str, int, float]], ruta: str, formato: Optional[str] = None,
+                   tamano_buffer: int = TAMANO_BUFFER_EXPORTACION) -> int:
+    """
+    Escribe tuplas (id, nombre, cantidad, precio) en CSV, JSONL o texto de ancho fijo
+    ("txt") a medida que el generador las produce, con un buffer de `tamano_buffer`
+    bytes. Si no se indica, el formato sale de la extensión. Devuelve las filas escritas.
+    """
+    if formato is None:
+        extension = os.path.splitext(ruta)[1].lower()
+        formato = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".txt": "txt"}.get(extension, "")
+    if formato not in ("csv", "jsonl", "txt"):
+        raise ValueError(f"Formato no soportado: '{formato}' (usa csv, jsonl o txt).")
+    escritas = 0
+    with escritura_atomica(ruta, encoding="utf-8", newline="", buffering=tamano_buffer) as f:
+        if formato == "csv":
+            # misma cabecera que espera importar()
+            escritor = csv.writer(f, lineterminator="\n")
+            escritor.writerow(COLUMNAS)
+            escribir = escritor.writerow
+        elif formato == "jsonl":
+            codificar = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+            escribir = lambda fila: f.write(codificar(dict(zip(COLUMNAS, fila))) + "\n")
+        else:
+            f.write(f"{'ID':<10} {'Nombre':<40} {'Cant':>8} {'Precio':>12}\n{'-' * 73}\n")
+            plantilla = "{:<10.10} {:<40.40} {:>8} {:>12.2f}\n".format
+            escribir = lambda fila: f.write(plantilla(*fila))
+        for fila in filas:
+            escribir(fila)
+            escritas += 1
+    return escritas
+
+
+# -------------------------
+# Distancia de edición
+# -------------------------
+def distancia_edicion(a: str, b: str, maximo: int) -> int:
+    """
+    Distancia de Damerau-Levenshtein (transposiciones adyacentes) entre a y b.
+    Corta en cuanto se sabe que supera `maximo` y en ese caso devuelve maximo + 1.
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2: List[int] = []
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return min(anterior[-1], maximo + 1)
+
+
 # -------------------------
 # Clase Inventario
 # -------------------------
@@ -105,12 +330,60 @@ class Inventario:
     Estructura:
       - _productos: Dict[id, Producto]  -> acceso rápido por ID (O(1))
       - _indice_nombre: Dict[nombre_normalizado, Set[ids]] -> búsqueda rápida por nombre exacto
+      - _indice_trigramas: Dict[trigrama, Set[ids]] -> reduce los candidatos de la búsqueda por subcadena
+        (se construye en la primera búsqueda parcial, así cargar() no paga su costo)
+      - _orden_ids / _orden_precio / _orden_cantidad: ListaOrdenada de ids, (precio, id)
+        y (cantidad, id) para listados paginados y consultas por rango
+        (se construyen en el primer listado/rango y luego se mantienen incrementalmente)
+      - _indice_palabras: Dict[palabra, Set[ids]] y _indice_borrados: Dict[variante, Set[palabras]]
+        -> búsqueda tolerante a errores por borrado simétrico (se construyen en la primera
+        búsqueda aproximada)
+      - _cache: OrderedDict[consulta_normalizada, Tuple[ids]] -> resultados recientes de
+        buscar_por_nombre (LRU). Un cambio de nombre solo invalida las consultas que son
+        subcadena del nombre afectado; cantidad y precio no la afectan.
+
+    Persistencia:
+      - modo normal: cada cambio reescribe el archivo completo (guardar()).
+      - modo diario (diario=True): cada cambio se añade como un registro compacto
+        al final de "<archivo>.log"; cargar() aplica el diario sobre el último
+        snapshot y, al superar umbral_compactacion registros, se compacta.
+      - transaccion(): agrupa varios cambios y persiste una sola vez al confirmar;
+        si ocurre una excepción se deshacen los cambios en memoria.
+
+    Suscriptores: suscribir(funcion) recibe (registro, valor_anterior) por cada cambio
+    ya persistido (los de una transacción, al confirmarla) y ({"op": "reset"}, None)
+    cuando el contenido se reemplaza entero (cargar, importar).
     """
 
-    def __init__(self, archivo: str = DEFAULT_FILE):
+    def __init__(self, archivo: str = DEFAULT_FILE, diario: bool = False,
+                 umbral_compactacion: int = UMBRAL_COMPACTACION, capacidad_cache: int = CAPACIDAD_CACHE):
         self.ARCHIVO = archivo
+        self.ARCHIVO_DIARIO = archivo + EXTENSION_DIARIO
+        self.diario = diario
+        self.umbral_compactacion = umbral_compactacion
+        self._registros_diario = 0
         self._productos: Dict[str, Producto] = {}
         self._indice_nombre: Dict[str, Set[str]] = defaultdict(set)
+        self._indice_trigramas: Dict[str, Set[str]] = defaultdict(set)
+        self._trigramas_construidos = False
+        self._orden_ids = ListaOrdenada()
+        self._orden_precio = ListaOrdenada()
+        self._orden_cantidad = ListaOrdenada()
+        self._ordenes_construidos = False
+        self._indice_palabras: Dict[str, Set[str]] = defaultdict(set)
+        self._indice_borrados: Dict[str, Set[str]] = defaultdict(set)
+        self._difuso_construido = False
+        self.capacidad_cache = capacidad_cache
+        self._cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._cache_aciertos = 0
+        self._cache_fallos = 0
+        self._cache_desalojos = 0
+        self._cache_invalidaciones = 0
+        # estado de transacción: profundidad de anidamiento, registros pendientes y valores anteriores
+        self._nivel_transaccion = 0
+        self._pendientes: List[Dict] = []
+        self._deshacer: List[Tuple[Dict, Any]] = []
+        self._suscriptores: List[Callable[[Dict, Any], None]] = []
         # Intentamos cargar el archivo si existe
         try:
             self.cargar()
@@ -118,15 +391,33 @@ class Inventario:
             # Si archivo corrupto o error, iniciamos vacío (no rompemos el programa)
             self._productos = {}
             self._indice_nombre = defaultdict(set)
+            self._invalidar_indices_derivados()
+            self._registros_diario = 0
 
     # ---------- utilidades internas ----------
     @staticmethod
     def _normalizar(texto: str) -> str:
         return texto.strip().lower()
 
+    @staticmethod
+    def _trigramas(clave: str) -> Set[str]:
+        n = TAMANO_NGRAMA
+        return {clave[i:i + n] for i in range(len(clave) - n + 1)}
+
     def _indexar(self, producto: Producto) -> None:
         clave = self._normalizar(producto.nombre)
         self._indice_nombre[clave].add(producto.id)
+        self._invalidar_cache(clave)
+        if self._trigramas_construidos:
+            for trigrama in self._trigramas(clave):
+                self._indice_trigramas[trigrama].add(producto.id)
+        if self._ordenes_construidos:
+            self._orden_ids.añadir(producto.id)
+            self._orden_precio.añadir((producto.precio, producto.id))
+            self._orden_cantidad.añadir((producto.cantidad, producto.id))
+        if self._difuso_construido:
+            for palabra in set(clave.split()):
+                self._indexar_palabra(palabra, producto.id)
 
     def _desindexar(self, producto: Producto) -> None:
         clave = self._normalizar(producto.nombre)
@@ -135,6 +426,201 @@ class Inventario:
             ids.remove(producto.id)
             if not ids:
                 del self._indice_nombre[clave]
+        self._invalidar_cache(clave)
+        if self._ordenes_construidos:
+            self._orden_ids.quitar(producto.id)
+            self._orden_precio.quitar((producto.precio, producto.id))
+            self._orden_cantidad.quitar((producto.cantidad, producto.id))
+        if self._difuso_construido:
+            for palabra in set(clave.split()):
+                self._desindexar_palabra(palabra, producto.id)
+        if self._trigramas_construidos:
+            for trigrama in self._trigramas(clave):
+                ids = self._indice_trigramas.get(trigrama)
+                if ids and producto.id in ids:
+                    ids.remove(producto.id)
+                    if not ids:
+                        del self._indice_trigramas[trigrama]
+
+    def _cambiar_valor(self, producto: Producto, campo: str, valor: Any) -> None:
+        """Asigna cantidad o precio (validando) y mantiene su índice ordenado."""
+        orden = self._orden_cantidad if campo == "cantidad" else self._orden_precio
+        if self._ordenes_construidos:
+            orden.quitar((getattr(producto, campo), producto.id))
+        try:
+            setattr(producto, campo, valor)
+        finally:
+            if self._ordenes_construidos:
+                orden.añadir((getattr(producto, campo), producto.id))
+
+    def _construir_ordenes(self) -> None:
+        productos = self._productos.values()
+        self._orden_ids = ListaOrdenada(self._productos.keys())
+        self._orden_precio = ListaOrdenada((p.precio, p.id) for p in productos)
+        self._orden_cantidad = ListaOrdenada((p.cantidad, p.id) for p in productos)
+        self._ordenes_construidos = True
+
+    def _invalidar_indices_derivados(self) -> None:
+        """Descarta los índices que se construyen bajo demanda (trigramas, ordenados y difuso) y la caché."""
+        self._indice_trigramas.clear()
+        self._trigramas_construidos = False
+        self._orden_ids = ListaOrdenada()
+        self._orden_precio = ListaOrdenada()
+        self._orden_cantidad = ListaOrdenada()
+        self._ordenes_construidos = False
+        self._indice_palabras.clear()
+        self._indice_borrados.clear()
+        self._difuso_construido = False
+        self._cache_invalidaciones += len(self._cache)
+        self._cache.clear()
+
+    def _construir_trigramas(self) -> None:
+        indice = self._indice_trigramas
+        indice.clear()
+        for clave, ids in self._indice_nombre.items():
+            for trigrama in self._trigramas(clave):
+                indice[trigrama].update(ids)
+        self._trigramas_construidos = True
+
+    def _candidatos_subcadena(self, clave: str) -> Optional[Set[str]]:
+        """
+        IDs cuyo nombre contiene todos los trigramas de `clave`.
+        Devuelve None si la consulta es demasiado corta para usar el índice.
+        """
+        trigramas = self._trigramas(clave)
+        if not trigramas:
+            return None
+        if not self._trigramas_construidos:
+            self._construir_trigramas()
+        conjuntos = []
+        for trigrama in trigramas:
+            ids = self._indice_trigramas.get(trigrama)
+            if not ids:
+                return set()
+            conjuntos.append(ids)
+        # intersectamos empezando por el conjunto más pequeño
+        conjuntos.sort(key=len)
+        candidatos = set(conjuntos[0])
+        for ids in conjuntos[1:]:
+            candidatos &= ids
+            if not candidatos:
+                break
+        return candidatos
+
+    # ---------- caché LRU de búsquedas ----------
+    def _leer_cache(self, clave: str) -> Optional[Tuple[str, ...]]:
+        ids = self._cache.get(clave)
+        if ids is None:
+            self._cache_fallos += 1
+            return None
+        self._cache.move_to_end(clave)
+        self._cache_aciertos += 1
+        return ids
+
+    def _escribir_cache(self, clave: str, ids: Tuple[str, ...]) -> None:
+        if self.capacidad_cache <= 0:
+            return
+        self._cache[clave] = ids
+        self._cache.move_to_end(clave)
+        while len(self._cache) > self.capacidad_cache:
+            self._cache.popitem(last=False)
+            self._cache_desalojos += 1
+
+    def _invalidar_cache(self, clave: str) -> None:
+        """
+        Descarta las consultas cuyo resultado puede cambiar porque un producto con
+        nombre normalizado `clave` entra o sale: las que son subcadena de `clave`.
+        """
+        cache = self._cache
+        if not cache:
+            return
+        n = len(clave)
+        if len(cache) <= n * (n + 1) // 2:
+            afectadas = [consulta for consulta in cache if consulta in clave]
+        else:
+            # caché grande: es más barato probar cada subcadena del nombre
+            subcadenas = {clave[i:j] for i in range(n + 1) for j in range(i, n + 1)}
+            afectadas = [consulta for consulta in subcadenas if consulta in cache]
+        for consulta in afectadas:
+            del cache[consulta]
+        self._cache_invalidaciones += len(afectadas)
+
+    def estadisticas_cache(self) -> Dict[str, int]:
+        """Contadores de la caché de búsquedas, para dimensionar capacidad_cache."""
+        return {
+            "capacidad": self.capacidad_cache,
+            "entradas": len(self._cache),
+            "aciertos": self._cache_aciertos,
+            "fallos": self._cache_fallos,
+            "desalojos": self._cache_desalojos,
+            "invalidaciones": self._cache_invalidaciones,
+        }
+
+    # ---------- índice difuso (borrado simétrico) ----------
+    @staticmethod
+    def _borrados(palabra: str, distancia: int = DISTANCIA_DIFUSA) -> Set[str]:
+        """La palabra y todas las variantes que resultan de borrarle hasta `distancia` letras."""
+        variantes = {palabra}
+        frontera = {palabra}
+        for _ in range(distancia):
+            frontera = {v[:i] + v[i + 1:] for v in frontera for i in range(len(v))}
+            variantes |= frontera
+        return variantes
+
+    def _indexar_palabra(self, palabra: str, id_producto: str) -> None:
+        ids = self._indice_palabras[palabra]
+        if not ids:
+            # palabra nueva en el vocabulario
+            for variante in self._borrados(palabra):
+                self._indice_borrados[variante].add(palabra)
+        ids.add(id_producto)
+
+    def _desindexar_palabra(self, palabra: str, id_producto: str) -> None:
+        ids = self._indice_palabras.get(palabra)
+        if not ids or id_producto not in ids:
+            return
+        ids.remove(id_producto)
+        if ids:
+            return
+        del self._indice_palabras[palabra]
+        for variante in self._borrados(palabra):
+            palabras = self._indice_borrados.get(variante)
+            if palabras is not None:
+                palabras.discard(palabra)
+                if not palabras:
+                    del self._indice_borrados[variante]
+
+    def _construir_difuso(self) -> None:
+        self._indice_palabras.clear()
+        self._indice_borrados.clear()
+        for clave, ids in self._indice_nombre.items():
+            for palabra in set(clave.split()):
+                for pid in ids:
+                    self._indexar_palabra(palabra, pid)
+        # la marca va al final: quien la vea activa encuentra el índice completo
+        self._difuso_construido = True
+
+    @staticmethod
+    def _tolerancia(palabra: str, distancia_maxima: int) -> int:
+        """Errores admitidos según el largo: ninguno en palabras muy cortas."""
+        if len(palabra) <= 2:
+            return 0
+        if len(palabra) <= 5:
+            return min(1, distancia_maxima)
+        return distancia_maxima
+
+    def _palabras_cercanas(self, palabra: str, distancia_maxima: int) -> Dict[str, int]:
+        """Palabras del vocabulario a distancia <= tolerancia de `palabra`, con su distancia."""
+        tolerancia = self._tolerancia(palabra, distancia_maxima)
+        candidatas: Set[str] = set()
+        for variante in self._borrados(palabra, tolerancia):
+            candidatas |= self._indice_borrados.get(variante, set())
+        cercanas = {}
+        for candidata in candidatas:
+            d = distancia_edicion(palabra, candidata, tolerancia)
+            if d <= tolerancia:
+                cercanas[candidata] = d
+        return cercanas
 
     # ---------- operaciones requeridas ----------
     def añadir_producto(self, producto: Producto) -> None:
@@ -144,7 +630,7 @@ class Inventario:
         self._productos[producto.id] = producto
         self._indexar(producto)
         # se guarda automáticamente para persistencia inmediata
-        self.guardar()
+        self._persistir({"op": "add", "producto": producto.to_dict()})
 
     def eliminar_producto(self, id_producto: str) -> None:
         """Elimina un producto por ID; lanza KeyError si no existe."""
@@ -153,59 +639,190 @@ class Inventario:
         prod = self._productos[id_producto]
         self._desindexar(prod)
         del self._productos[id_producto]
-        self.guardar()
+        self._persistir({"op": "del", "id": id_producto}, anterior=prod)
 
     def actualizar_cantidad(self, id_producto: str, nueva_cantidad: int) -> None:
         """Actualiza cantidad; lanza KeyError si el ID no existe."""
         if id_producto not in self._productos:
             raise KeyError(f"Producto con ID '{id_producto}' no encontrado.")
-        self._productos[id_producto].cantidad = nueva_cantidad
-        self.guardar()
+        prod = self._productos[id_producto]
+        anterior = prod.cantidad
+        self._cambiar_valor(prod, "cantidad", nueva_cantidad)
+        self._persistir({"op": "set", "id": id_producto, "campo": "cantidad", "valor": prod.cantidad},
+                        anterior=anterior)
 
     def actualizar_precio(self, id_producto: str, nuevo_precio: float) -> None:
         """Actualiza precio; lanza KeyError si el ID no existe."""
         if id_producto not in self._productos:
             raise KeyError(f"Producto con ID '{id_producto}' no encontrado.")
-        self._productos[id_producto].precio = nuevo_precio
-        self.guardar()
+        prod = self._productos[id_producto]
+        anterior = prod.precio
+        self._cambiar_valor(prod, "precio", nuevo_precio)
+        self._persistir({"op": "set", "id": id_producto, "campo": "precio", "valor": prod.precio},
+                        anterior=anterior)
 
     def actualizar_nombre(self, id_producto: str, nuevo_nombre: str) -> None:
         """Actualiza el nombre y mantiene el índice por nombre."""
         if id_producto not in self._productos:
             raise KeyError(f"Producto con ID '{id_producto}' no encontrado.")
         prod = self._productos[id_producto]
+        anterior = prod.nombre
         self._desindexar(prod)
-        prod.nombre = nuevo_nombre
-        self._indexar(prod)
-        self.guardar()
+        try:
+            prod.nombre = nuevo_nombre
+        finally:
+            # si el nombre es inválido se reindexa con el nombre anterior
+            self._indexar(prod)
+        self._persistir({"op": "set", "id": id_producto, "campo": "nombre", "valor": prod.nombre},
+                        anterior=anterior)
 
     # ---------- búsquedas y listados ----------
     def buscar_por_nombre(self, texto: str) -> List[Producto]:
         """
         Devuelve lista de Productos cuya nombre contiene texto (case-insensitive).
         Primero intenta coincidencia exacta por índice (palabra completa normalizada).
-        Si no hay, hace búsqueda por subcadena (lineal).
+        Si no hay, hace búsqueda por subcadena: el índice de trigramas reduce los
+        candidatos y solo esos se comprueban (lineal solo si la consulta tiene < 3 caracteres).
+        Los IDs resultantes de las consultas recientes se guardan en la caché LRU.
         """
         clave = self._normalizar(texto)
-        resultados: List[Producto] = []
+        ids = self._leer_cache(clave)
+        if ids is not None:
+            return [self._productos[pid] for pid in ids]
 
-        # 1) coincidencia exacta por índice
         if clave in self._indice_nombre:
-            for pid in sorted(self._indice_nombre[clave]):
-                resultados.append(self._productos[pid])
-            return resultados
+            # 1) coincidencia exacta por índice
+            ids = tuple(sorted(self._indice_nombre[clave]))
+        else:
+            # 2) fallback: búsqueda por subcadena sobre los candidatos del índice de trigramas
+            candidatos = self._candidatos_subcadena(clave)
+            productos = self._productos.values() if candidatos is None else (self._productos[pid] for pid in candidatos)
+            # devolvemos ordenado por ID
+            ids = tuple(sorted(p.id for p in productos if clave in self._normalizar(p.nombre)))
+        self._escribir_cache(clave, ids)
+        return [self._productos[pid] for pid in ids]
+
+    def buscar_aproximado(self, texto: str, k: int = 10,
+                          distancia_maxima: int = DISTANCIA_DIFUSA) -> List[Tuple[Producto, int]]:
+        """
+        Búsqueda tolerante a errores de escritura ("tornilo" encuentra "Tornillo ...").
+        Cada palabra de la consulta debe parecerse a alguna palabra del nombre (hasta
+        `distancia_maxima` errores, menos en palabras cortas). Devuelve hasta k pares
+        (producto, distancia total) ordenados por distancia y luego por ID.
+
+        Solo se comparan las palabras que comparten algún borrado con la consulta,
+        así que el costo depende del vocabulario cercano y no del tamaño del catálogo.
+        """
+        palabras = self._normalizar(texto).split()
+        if not palabras:
+            return []
+        if not self._difuso_construido:
+            self._construir_difuso()
+
+        # por cada palabra de la consulta: id -> menor distancia entre sus palabras cercanas
+        por_palabra: List[Dict[str, int]] = []
+        for palabra in palabras:
+            distancias: Dict[str, int] = {}
+            for cercana, d in self._palabras_cercanas(palabra, distancia_maxima).items():
+                for pid in self._indice_palabras[cercana]:
+                    if d < distancias.get(pid, d + 1):
+                        distancias[pid] = d
+            if not distancias:
+                return []
+            por_palabra.append(distancias)
 
-        # 2) fallback: búsqueda por subcadena en cada nombre
-        for p in self._productos.values():
-            if clave in self._normalizar(p.nombre):
-                resultados.append(p)
-        # devolvemos ordenado por ID
-        return sorted(resultados, key=lambda x: x.id)
+        # todas las palabras deben coincidir: partimos del conjunto más pequeño
+        por_palabra.sort(key=len)
+        totales = dict(por_palabra[0])
+        for distancias in por_palabra[1:]:
+            totales = {pid: d + distancias[pid] for pid, d in totales.items() if pid in distancias}
+        mejores = heapq.nsmallest(k, totales.items(), key=lambda x: (x[1], x[0]))
+        return [(self._productos[pid], d) for pid, d in mejores]
 
     def mostrar_todos(self) -> List[Tuple[str, str, int, float]]:
         """Devuelve una lista de tuplas (id, nombre, cantidad, precio) ordenada por ID."""
-        productos = [self._productos[k] for k in sorted(self._productos.keys())]
-        return [(p.id, p.nombre, p.cantidad, p.precio) for p in productos]
+        return self._filas(self._indice_ids())
+
+    def listar(self, desde: Optional[str] = None, limite: int = 50) -> List[Tuple[str, str, int, float]]:
+        """
+        Página de hasta `limite` tuplas ordenadas por ID.
+        `desde` es el cursor: el último ID de la página anterior (se devuelven IDs mayores).
+        """
+        ids = iter(self._indice_ids()) if desde is None else self._indice_ids().desde(desde, incluir=False)
+        return self._filas(itertools.islice(ids, limite))
+
+    def rango_ids(self, minimo: Optional[str] = None, maximo: Optional[str] = None) -> List[Tuple[str, str, int, float]]:
+        """Tuplas con minimo <= id <= maximo (límites inclusivos; None = sin límite)."""
+        return self._filas(self._indice_ids().rango(minimo, maximo))
+
+    def filtrar_por_precio(self, minimo: Optional[float] = None,
+                           maximo: Optional[float] = None) -> List[Producto]:
+        """Productos con minimo <= precio <= maximo, ordenados por precio y luego ID."""
+        return self._rango_valor("precio", minimo, maximo)
+
+    def filtrar_por_cantidad(self, minimo: Optional[int] = None,
+                             maximo: Optional[int] = None) -> List[Producto]:
+        """Productos con minimo <= cantidad <= maximo (p. ej. maximo=4 -> menos de 5 unidades)."""
+        return self._rango_valor("cantidad", minimo, maximo)
+
+    def recorrer(self, orden: str = "id", precio_min: Optional[float] = None, precio_max: Optional[float] = None,
+                 cantidad_min: Optional[int] = None,
+                 cantidad_max: Optional[int] = None) -> Iterator[Tuple[str, str, int, float]]:
+        """
+        Genera tuplas (id, nombre, cantidad, precio) ordenadas por "id", "precio" o
+        "cantidad" (a igual valor, por ID) sin armar la lista completa. Los límites son
+        inclusivos (None = sin límite); el del campo de orden solo recorre ese tramo del
+        índice. No se debe modificar el inventario mientras se consume el generador.
+        """
+        if orden == "id":
+            ids = iter(self._indice_ids())
+        elif orden == "precio":
+            ids = self._ids_por_valor("precio", precio_min, precio_max)
+        elif orden == "cantidad":
+            ids = self._ids_por_valor("cantidad", cantidad_min, cantidad_max)
+        else:
+            raise ValueError(f"Orden no soportado: '{orden}' (usa id, precio o cantidad).")
+        infinito = float("inf")
+        pmin = -infinito if precio_min is None else precio_min
+        pmax = infinito if precio_max is None else precio_max
+        cmin = -infinito if cantidad_min is None else cantidad_min
+        cmax = infinito if cantidad_max is None else cantidad_max
+        productos = self._productos
+        for pid in ids:
+            p = productos[pid]
+            if pmin <= p.precio <= pmax and cmin <= p.cantidad <= cmax:
+                yield p.id, p.nombre, p.cantidad, p.precio
+
+    def exportar(self, ruta: str, formato: Optional[str] = None, orden: str = "id", **filtros) -> int:
+        """
+        Exporta el listado a CSV, JSONL o texto de ancho fijo en streaming (ver recorrer()
+        para `orden` y los filtros precio_min/precio_max/cantidad_min/cantidad_max).
+        Devuelve las filas escritas.
+        """
+        return exportar_filas(self.recorrer(orden, **filtros), ruta, formato)
+
+    def _indice_ids(self) -> ListaOrdenada:
+        if not self._ordenes_construidos:
+            self._construir_ordenes()
+        return self._orden_ids
+
+    def _filas(self, ids: Iterable[str]) -> List[Tuple[str, str, int, float]]:
+        productos = self._productos
+        return [(p.id, p.nombre, p.cantidad, p.precio) for p in (productos[pid] for pid in ids)]
+
+    def _ids_por_valor(self, campo: str, minimo, maximo) -> Iterator[str]:
+        """IDs con minimo <= campo <= maximo, en orden de (valor, id)."""
+        if not self._ordenes_construidos:
+            self._construir_ordenes()
+        orden = self._orden_cantidad if campo == "cantidad" else self._orden_precio
+        # (minimo, "") queda por debajo de cualquier (minimo, id)
+        valores = iter(orden) if minimo is None else orden.desde((minimo, ""))
+        if maximo is not None:
+            valores = itertools.takewhile(lambda v: v[0] <= maximo, valores)
+        return (pid for _, pid in valores)
+
+    def _rango_valor(self, campo: str, minimo, maximo) -> List[Producto]:
+        return [self._productos[pid] for pid in self._ids_por_valor(campo, minimo, maximo)]
 
     def obtener_producto(self, id_producto: str) -> Optional[Producto]:
         return self._productos.get(id_producto)
@@ -213,26 +830,589 @@ class Inventario:
     def contar(self) -> int:
         return len(self._productos)
 
+    # ---------- importación masiva ----------
+    @staticmethod
+    def _leer_filas(ruta: str, formato: str) -> Iterator[Tuple[int, Any]]:
+        """
+        Genera (número de línea, fila) leyendo el archivo en streaming. Una línea CSV
+        que el lector no puede analizar llega como la excepción csv.Error en lugar de
+        la fila (el lector sigue con la siguiente).
+        """
+        if formato == "csv":
+            with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+                lector = csv.DictReader(f)
+                while True:
+                    try:
+                        fila = next(lector)
+                    except StopIteration:
+                        break
+                    except csv.Error as e:
+                        yield lector.line_num + 1, e
+                        continue
+                    yield lector.line_num, fila
+        elif formato == "jsonl":
+            with open(ruta, "r", encoding="utf-8") as f:
+                for num, linea in enumerate(f, start=1):
+                    linea = linea.strip()
+                    if linea:
+                        yield num, linea
+        else:
+            raise ValueError(f"Formato no soportado: '{formato}' (usa csv o jsonl).")
+
+    @staticmethod
+    def _producto_de_fila(fila: Any, formato: str) -> Producto:
+        """Producto validado de una fila de _leer_filas; ValueError, KeyError, TypeError o csv.Error si no vale."""
+        if isinstance(fila, csv.Error):
+            raise fila
+        datos = json.loads(fila) if formato == "jsonl" else fila
+        if not isinstance(datos, dict):
+            raise ValueError("La fila no es un objeto.")
+        return Producto.from_dict(datos)
+
+    @staticmethod
+    def _escribir_rechazo(rechazos, num: int, error: Exception, fila: Any) -> None:
+        motivo = error.args[0] if error.args else str(error)
+        if isinstance(fila, csv.Error):
+            fila = None
+        rechazos.write(json.dumps({"linea": num, "motivo": str(motivo), "fila": fila},
+                                  ensure_ascii=False) + "\n")
+
+    def importar(self, ruta: str, formato: Optional[str] = None, ruta_rechazos: Optional[str] = None,
+                 tamano_lote: int = TAMANO_LOTE_IMPORTACION) -> Tuple[int, int]:
+        """
+        Importa productos desde un CSV (id,nombre,cantidad,precio) o JSONL en streaming.
+
+        Las filas se validan por lotes; las inválidas o con ID repetido se escriben en
+        `ruta_rechazos` (por defecto "<ruta>.rechazos.jsonl") con el motivo, sin abortar.
+        Al final se persiste una sola vez. Devuelve (importados, rechazados).
+        """
+        if self._nivel_transaccion:
+            raise RuntimeError("importar() no puede usarse dentro de una transacción.")
+        if formato is None:
+            extension = os.path.splitext(ruta)[1].lower()
+            formato = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension, "")
+        ruta_rechazos = ruta_rechazos or ruta + ".rechazos.jsonl"
+
+        importados = rechazados = 0
+        filas = self._leer_filas(ruta, formato)
+        try:
+            with open(ruta_rechazos, "w", encoding="utf-8") as rechazos:
+                while True:
+                    lote = list(itertools.islice(filas, tamano_lote))
+                    if not lote:
+                        break
+                    validos: List[Producto] = []
+                    try:
+                        for num, fila in lote:
+                            try:
+                                prod = self._producto_de_fila(fila, formato)
+                                if prod.id in self._productos:
+                                    raise KeyError(f"ID '{prod.id}' ya existe.")
+                            except (ValueError, KeyError, TypeError, csv.Error) as e:
+                                rechazados += 1
+                                self._escribir_rechazo(rechazos, num, e, fila)
+                                continue
+                            # se inserta ya para detectar IDs repetidos dentro del mismo archivo
+                            self._productos[prod.id] = prod
+                            validos.append(prod)
+                    finally:
+                        # índice por nombre en bloque para todo el lote (también si se cortó a medias)
+                        nuevos: Dict[str, List[str]] = defaultdict(list)
+                        for prod in validos:
+                            nuevos[self._normalizar(prod.nombre)].append(prod.id)
+                        for clave, ids in nuevos.items():
+                            self._indice_nombre[clave].update(ids)
+                        importados += len(validos)
+        finally:
+            if importados:
+                # los índices bajo demanda se reconstruyen en la próxima consulta que los use
+                self._invalidar_indices_derivados()
+
+        if importados:
+            self.guardar()
+            self._notificar([({"op": "reset"}, None)])
+        return importados, rechazados
+
     # ---------- persistencia ----------
+    def _instantanea(self) -> Dict[str, Dict]:
+        """Copia serializable del contenido actual (lo que escribe guardar())."""
+        return {pid: prod.to_dict() for pid, prod in self._productos.items()}
+
     def guardar(self, ruta: Optional[str] = None) -> None:
         ruta = ruta or self.ARCHIVO
-        data = {pid: prod.to_dict() for pid, prod in self._productos.items()}
-        with open(ruta, "w", encoding="utf-8") as f:
+        data = self._instantanea()
+        # escribimos en un temporal y lo renombramos: un fallo a mitad no deja el snapshot corrupto
+        with escritura_atomica(ruta, encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=4)
+        if ruta == self.ARCHIVO:
+            # el snapshot ya contiene todo lo registrado en el diario
+            self._vaciar_diario()
 
-    def cargar(self, ruta: Optional[str] = None) -> None:
+    def cargar(self, ruta: Optional[str] = None, validar: Optional[bool] = None) -> None:
+        """
+        Carga el snapshot (y el diario, si es el archivo propio).
+        validar=None (por defecto): cada registro pasa una comprobación barata y solo
+        los que no la cumplen (p. ej. editados a mano) se construyen con from_dict.
+        validar=True fuerza from_dict para todos; validar=False usa la construcción
+        rápida sin comprobar nada (solo para datos que se sabe que son válidos).
+        """
         ruta = ruta or self.ARCHIVO
-        if not os.path.exists(ruta):
+        if validar is None:
+            crear = Producto.desde_registro
+        else:
+            crear = Producto.from_dict if validar else Producto.from_dict_confiable
+        con_diario = ruta == self.ARCHIVO and os.path.exists(self.ARCHIVO_DIARIO)
+        if not os.path.exists(ruta) and not con_diario:
             return
-        with open(ruta, "r", encoding="utf-8") as f:
-            data = json.load(f)
         # reconstruir estructura en memoria
         self._productos.clear()
         self._indice_nombre.clear()
-        for pid, d in data.items():
-            prod = Producto.from_dict(d)
-            self._productos[pid] = prod
+        self._invalidar_indices_derivados()
+        self._registros_diario = 0
+        if os.path.exists(ruta):
+            with open(ruta, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for pid, d in data.items():
+                prod = crear(d)
+                self._productos[pid] = prod
+                self._indexar(prod)
+        if con_diario:
+            self._reproducir_diario()
+        self._notificar([({"op": "reset"}, None)])
+
+    def compactar(self) -> None:
+        """Vuelca el estado actual en un snapshot nuevo y vacía el diario."""
+        self.guardar()
+
+    # ---------- transacciones ----------
+    @contextmanager
+    def transaccion(self) -> Iterator["Inventario"]:
+        """
+        Agrupa varias mutaciones y las persiste una sola vez al salir del bloque:
+
+            with inv.transaccion():
+                inv.actualizar_cantidad("001", 5)
+                inv.actualizar_precio("002", 9.99)
+
+        Si el bloque lanza una excepción se restauran _productos y _indice_nombre
+        y no se escribe nada. Las transacciones anidadas se unen a la exterior.
+        """
+        self._nivel_transaccion += 1
+        try:
+            yield self
+        except BaseException:
+            self._nivel_transaccion -= 1
+            if self._nivel_transaccion == 0:
+                self._revertir_transaccion()
+            raise
+        self._nivel_transaccion -= 1
+        if self._nivel_transaccion == 0:
+            self._confirmar_transaccion()
+
+    def _confirmar_transaccion(self) -> None:
+        pendientes = self._pendientes
+        cambios = self._deshacer
+        self._pendientes = []
+        self._deshacer = []
+        if not pendientes:
+            return
+        try:
+            if self.diario:
+                self._escribir_diario(pendientes)
+            else:
+                self.guardar()
+        except BaseException:
+            # no llegó a disco: se deshace también en memoria para no divergir de lo persistido
+            self._deshacer = cambios
+            self._revertir_transaccion()
+            raise
+        self._notificar(cambios)
+
+    def _revertir_transaccion(self) -> None:
+        # se deshace en orden inverso para que cada valor anterior sea el correcto
+        for registro, anterior in reversed(self._deshacer):
+            op = registro["op"]
+            if op == "add":
+                prod = self._productos.pop(registro["producto"]["id"])
+                self._desindexar(prod)
+            elif op == "del":
+                self._productos[anterior.id] = anterior
+                self._indexar(anterior)
+            elif op == "set":
+                prod = self._productos[registro["id"]]
+                if registro["campo"] == "nombre":
+                    self._desindexar(prod)
+                    prod.nombre = anterior
+                    self._indexar(prod)
+                else:
+                    self._cambiar_valor(prod, registro["campo"], anterior)
+        self._pendientes = []
+        self._deshacer = []
+
+    # ---------- diario (append-only) ----------
+    def _persistir(self, registro: Dict, anterior: Any = None) -> None:
+        """Punto único de persistencia tras cada mutación."""
+        if self._nivel_transaccion:
+            self._pendientes.append(registro)
+            self._deshacer.append((registro, anterior))
+            return
+        if self.diario:
+            self._escribir_diario([registro])
+        else:
+            self.guardar()
+        self._notificar([(registro, anterior)])
+
+    # ---------- suscriptores ----------
+    def suscribir(self, funcion: Callable[[Dict, Any], None]) -> None:
+        """Registra una función que se llama con (registro, valor_anterior) tras cada cambio."""
+        self._suscriptores.append(funcion)
+
+    def desuscribir(self, funcion: Callable[[Dict, Any], None]) -> None:
+        self._suscriptores.remove(funcion)
+
+    def _notificar(self, cambios: List[Tuple[Dict, Any]]) -> None:
+        for funcion in self._suscriptores:
+            for registro, anterior in cambios:
+                funcion(registro, anterior)
+
+    def _escribir_diario(self, registros: List[Dict]) -> None:
+        lineas = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in registros)
+        with open(self.ARCHIVO_DIARIO, "a", encoding="utf-8") as f:
+            f.write(lineas)
+        self._registros_diario += len(registros)
+        if self._registros_diario >= self.umbral_compactacion:
+            try:
+                self.compactar()
+            except OSError:
+                # los registros ya están en el diario: la compactación se reintenta en la próxima escritura
+                pass
+
+    def _aplicar_registro(self, registro: Dict) -> None:
+        """Aplica un registro del diario. Es idempotente: reaplicarlo no cambia el resultado."""
+        op = registro.get("op")
+        if op == "add":
+            prod = Producto.from_dict_confiable(registro["producto"])
+            anterior = self._productos.get(prod.id)
+            if anterior is not None:
+                self._desindexar(anterior)
+            self._productos[prod.id] = prod
             self._indexar(prod)
+        elif op == "del":
+            prod = self._productos.pop(registro["id"], None)
+            if prod is not None:
+                self._desindexar(prod)
+        elif op == "set":
+            prod = self._productos.get(registro["id"])
+            if prod is None:
+                return
+            campo = registro["campo"]
+            if campo == "nombre":
+                self._desindexar(prod)
+                prod.nombre = registro["valor"]
+                self._indexar(prod)
+            elif campo in ("cantidad", "precio"):
+                self._cambiar_valor(prod, campo, registro["valor"])
+
+    def _reproducir_diario(self) -> None:
+        """
+        Aplica el diario y deja el archivo listo para seguir agregando: una última línea
+        a medio escribir (corte durante un append) se elimina del archivo, y si solo le
+        faltaba el salto de línea se le añade. Si no, el siguiente registro quedaría
+        pegado a ella y se perdería en la próxima recuperación.
+        """
+        completo = 0  # bytes hasta el final del último registro completo
+        cola_cortada = falta_salto = False
+        with open(self.ARCHIVO_DIARIO, "rb") as f:
+            for linea in f:
+                termina = linea.endswith(b"\n")
+                if linea.strip():
+                    try:
+                        registro = json.loads(linea)
+                    except ValueError:
+                        if not termina:
+                            cola_cortada = True
+                            break
+                        # línea dañada entre registros completos: se salta
+                        completo += len(linea)
+                        continue
+                    self._aplicar_registro(registro)
+                    self._registros_diario += 1
+                    falta_salto = not termina
+                completo += len(linea)
+        if cola_cortada:
+            with open(self.ARCHIVO_DIARIO, "r+b") as f:
+                f.truncate(completo)
+        elif falta_salto:
+            with open(self.ARCHIVO_DIARIO, "ab") as f:
+                f.write(b"\n")
+
+    def _vaciar_diario(self) -> None:
+        if os.path.exists(self.ARCHIVO_DIARIO):
+            os.remove(self.ARCHIVO_DIARIO)
+        self._registros_diario = 0
+
+
+# -------------------------
+# Motor SQLite
+# -------------------------
+class InventarioSQLite:
+    """
+    Mismo API público que Inventario, pero los datos viven en un archivo SQLite
+    (módulo estándar sqlite3) en lugar de un dict en memoria + JSON.
+
+      - tabla productos(id PK, nombre, nombre_norm, cantidad, precio)
+      - índice sobre nombre_norm -> búsqueda por nombre exacto
+      - índices sobre (precio, id) y (cantidad, id) -> consultas por rango
+      - cada cambio actualiza solo su fila; el archivo usa modo WAL
+    """
+
+    COLUMNAS = COLUMNAS
+
+    def __init__(self, archivo: str = DEFAULT_DB):
+        self.ARCHIVO = archivo
+        self._nivel_transaccion = 0
+        # isolation_level=None: autocommit; las transacciones se abren explícitamente
+        self._conexion = sqlite3.connect(archivo, isolation_level=None)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS productos ("
+            " id TEXT PRIMARY KEY,"
+            " nombre TEXT NOT NULL,"
+            " nombre_norm TEXT NOT NULL,"
+            " cantidad INTEGER NOT NULL,"
+            " precio REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre_norm)")
+        self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_productos_precio ON productos(precio, id)")
+        self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_productos_cantidad ON productos(cantidad, id)")
+
+    _normalizar = staticmethod(Inventario._normalizar)
+
+    def cerrar(self) -> None:
+        self._conexion.close()
+
+    def _a_producto(self, fila: Tuple) -> Producto:
+        return Producto.from_dict_confiable(dict(zip(self.COLUMNAS, fila)))
+
+    def _exigir(self, id_producto: str) -> Producto:
+        prod = self.obtener_producto(id_producto)
+        if prod is None:
+            raise KeyError(f"Producto con ID '{id_producto}' no encontrado.")
+        return prod
+
+    # ---------- operaciones requeridas ----------
+    def añadir_producto(self, producto: Producto) -> None:
+        """Añade un nuevo producto; lanza KeyError si el ID ya existe."""
+        try:
+            self._conexion.execute(
+                "INSERT INTO productos (id, nombre, nombre_norm, cantidad, precio) VALUES (?, ?, ?, ?, ?)",
+                (producto.id, producto.nombre, self._normalizar(producto.nombre), producto.cantidad, producto.precio))
+        except sqlite3.IntegrityError:
+            raise KeyError(f"ID '{producto.id}' ya existe.")
+
+    def eliminar_producto(self, id_producto: str) -> None:
+        """Elimina un producto por ID; lanza KeyError si no existe."""
+        cursor = self._conexion.execute("DELETE FROM productos WHERE id = ?", (id_producto,))
+        if cursor.rowcount == 0:
+            raise KeyError(f"Producto con ID '{id_producto}' no encontrado.")
+
+    def actualizar_cantidad(self, id_producto: str, nueva_cantidad: int) -> None:
+        """Actualiza cantidad; lanza KeyError si el ID no existe."""
+        prod = self._exigir(id_producto)
+        prod.cantidad = nueva_cantidad
+        self._conexion.execute("UPDATE productos SET cantidad = ? WHERE id = ?", (prod.cantidad, id_producto))
+
+    def actualizar_precio(self, id_producto: str, nuevo_precio: float) -> None:
+        """Actualiza precio; lanza KeyError si el ID no existe."""
+        prod = self._exigir(id_producto)
+        prod.precio = nuevo_precio
+        self._conexion.execute("UPDATE productos SET precio = ? WHERE id = ?", (prod.precio, id_producto))
+
+    def actualizar_nombre(self, id_producto: str, nuevo_nombre: str) -> None:
+        """Actualiza el nombre (y su forma normalizada indexada)."""
+        prod = self._exigir(id_producto)
+        prod.nombre = nuevo_nombre
+        self._conexion.execute("UPDATE productos SET nombre = ?, nombre_norm = ? WHERE id = ?",
+                               (prod.nombre, self._normalizar(prod.nombre), id_producto))
+
+    # ---------- búsquedas y listados ----------
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        """Misma semántica que Inventario.buscar_por_nombre: nombre exacto y, si no hay, subcadena."""
+        clave = self._normalizar(texto)
+        filas = self._conexion.execute(
+            "SELECT id, nombre, cantidad, precio FROM productos WHERE nombre_norm = ? ORDER BY id",
+            (clave,)).fetchall()
+        if not filas:
+            # nombre_norm se calcula en Python, así que instr() compara igual que `in`
+            filas = self._conexion.execute(
+                "SELECT id, nombre, cantidad, precio FROM productos WHERE instr(nombre_norm, ?) > 0 ORDER BY id",
+                (clave,)).fetchall()
+        return [self._a_producto(f) for f in filas]
+
+    def mostrar_todos(self) -> List[Tuple[str, str, int, float]]:
+        """Devuelve una lista de tuplas (id, nombre, cantidad, precio) ordenada por ID."""
+        return self._conexion.execute("SELECT id, nombre, cantidad, precio FROM productos ORDER BY id").fetchall()
+
+    def listar(self, desde: Optional[str] = None, limite: int = 50) -> List[Tuple[str, str, int, float]]:
+        """Página de hasta `limite` tuplas con ID mayor que el cursor `desde`."""
+        if desde is None:
+            return self._conexion.execute(
+                "SELECT id, nombre, cantidad, precio FROM productos ORDER BY id LIMIT ?", (limite,)).fetchall()
+        return self._conexion.execute(
+            "SELECT id, nombre, cantidad, precio FROM productos WHERE id > ? ORDER BY id LIMIT ?",
+            (desde, limite)).fetchall()
+
+    def rango_ids(self, minimo: Optional[str] = None, maximo: Optional[str] = None) -> List[Tuple[str, str, int, float]]:
+        """Tuplas con minimo <= id <= maximo (límites inclusivos; None = sin límite)."""
+        condiciones, parametros = self._condiciones_rango(("id", minimo, maximo))
+        return self._conexion.execute(
+            f"SELECT id, nombre, cantidad, precio FROM productos {condiciones} ORDER BY id", parametros).fetchall()
+
+    def filtrar_por_precio(self, minimo: Optional[float] = None,
+                           maximo: Optional[float] = None) -> List[Producto]:
+        """Productos con minimo <= precio <= maximo, ordenados por precio y luego ID."""
+        return self._rango_valor("precio", minimo, maximo)
+
+    def filtrar_por_cantidad(self, minimo: Optional[int] = None,
+                             maximo: Optional[int] = None) -> List[Producto]:
+        """Productos con minimo <= cantidad <= maximo."""
+        return self._rango_valor("cantidad", minimo, maximo)
+
+    def recorrer(self, orden: str = "id", precio_min: Optional[float] = None, precio_max: Optional[float] = None,
+                 cantidad_min: Optional[int] = None,
+                 cantidad_max: Optional[int] = None) -> Iterator[Tuple[str, str, int, float]]:
+        """Igual que Inventario.recorrer: el cursor de SQLite entrega las filas a medida que se piden."""
+        if orden not in ("id", "precio", "cantidad"):
+            raise ValueError(f"Orden no soportado: '{orden}' (usa id, precio o cantidad).")
+        condiciones, parametros = self._condiciones_rango(
+            ("precio", precio_min, precio_max), ("cantidad", cantidad_min, cantidad_max))
+        orden_sql = "id" if orden == "id" else f"{orden}, id"
+        yield from self._conexion.execute(
+            f"SELECT id, nombre, cantidad, precio FROM productos {condiciones} ORDER BY {orden_sql}", parametros)
+
+    def exportar(self, ruta: str, formato: Optional[str] = None, orden: str = "id", **filtros) -> int:
+        """Igual que Inventario.exportar."""
+        return exportar_filas(self.recorrer(orden, **filtros), ruta, formato)
+
+    @staticmethod
+    def _condiciones_rango(*rangos: Tuple[str, Any, Any]) -> Tuple[str, Tuple]:
+        """Cláusula WHERE para rangos (columna, minimo, maximo) inclusivos; None = sin límite."""
+        condiciones, parametros = [], []
+        for columna, minimo, maximo in rangos:
+            if minimo is not None:
+                condiciones.append(f"{columna} >= ?")
+                parametros.append(minimo)
+            if maximo is not None:
+                condiciones.append(f"{columna} <= ?")
+                parametros.append(maximo)
+        return ("WHERE " + " AND ".join(condiciones) if condiciones else ""), tuple(parametros)
+
+    def _rango_valor(self, columna: str, minimo, maximo) -> List[Producto]:
+        condiciones, parametros = self._condiciones_rango((columna, minimo, maximo))
+        filas = self._conexion.execute(
+            f"SELECT id, nombre, cantidad, precio FROM productos {condiciones} ORDER BY {columna}, id",
+            parametros).fetchall()
+        return [self._a_producto(f) for f in filas]
+
+    def obtener_producto(self, id_producto: str) -> Optional[Producto]:
+        fila = self._conexion.execute("SELECT id, nombre, cantidad, precio FROM productos WHERE id = ?",
+                                      (id_producto,)).fetchone()
+        return self._a_producto(fila) if fila else None
+
+    def contar(self) -> int:
+        return self._conexion.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+
+    # ---------- transacciones ----------
+    @contextmanager
+    def transaccion(self) -> Iterator["InventarioSQLite"]:
+        """Agrupa cambios en una transacción SQLite; ROLLBACK si hay excepción."""
+        if self._nivel_transaccion == 0:
+            self._conexion.execute("BEGIN")
+        self._nivel_transaccion += 1
+        try:
+            yield self
+        except BaseException:
+            self._nivel_transaccion -= 1
+            if self._nivel_transaccion == 0:
+                self._conexion.execute("ROLLBACK")
+            raise
+        self._nivel_transaccion -= 1
+        if self._nivel_transaccion == 0:
+            self._conexion.execute("COMMIT")
+
+    # ---------- importación masiva ----------
+    def importar(self, ruta: str, formato: Optional[str] = None, ruta_rechazos: Optional[str] = None,
+                 tamano_lote: int = TAMANO_LOTE_IMPORTACION) -> Tuple[int, int]:
+        """Igual que Inventario.importar, insertando fila a fila dentro de una transacción."""
+        if formato is None:
+            extension = os.path.splitext(ruta)[1].lower()
+            formato = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension, "")
+        ruta_rechazos = ruta_rechazos or ruta + ".rechazos.jsonl"
+        importados = rechazados = 0
+        with self.transaccion(), open(ruta_rechazos, "w", encoding="utf-8") as rechazos:
+            for num, fila in Inventario._leer_filas(ruta, formato):
+                try:
+                    self.añadir_producto(Inventario._producto_de_fila(fila, formato))
+                except (ValueError, KeyError, TypeError, csv.Error) as e:
+                    rechazados += 1
+                    Inventario._escribir_rechazo(rechazos, num, e, fila)
+                    continue
+                importados += 1
+        return importados, rechazados
+
+    # ---------- persistencia ----------
+    def guardar(self, ruta: Optional[str] = None) -> None:
+        """
+        Cada cambio ya está confirmado en la base; con `ruta` se exporta un snapshot
+        JSON con el mismo formato que Inventario.guardar.
+        """
+        if ruta is None:
+            return
+        data = {fila[0]: dict(zip(self.COLUMNAS, fila)) for fila in self.mostrar_todos()}
+        with escritura_atomica(ruta, encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+    def cargar(self, ruta: Optional[str] = None) -> None:
+        """
+        Sin `ruta` no hay nada que recargar (se lee de la base en cada consulta).
+        Con `ruta` reemplaza el contenido por el de un inventario.json validado.
+        """
+        if ruta is None or not os.path.exists(ruta):
+            return
+        with open(ruta, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        filas = []
+        for d in data.values():
+            prod = Producto.from_dict(d)
+            filas.append((prod.id, prod.nombre, self._normalizar(prod.nombre), prod.cantidad, prod.precio))
+        with self.transaccion():
+            self._conexion.execute("DELETE FROM productos")
+            self._conexion.executemany(
+                "INSERT OR REPLACE INTO productos (id, nombre, nombre_norm, cantidad, precio) VALUES (?, ?, ?, ?, ?)",
+                filas)
+
+
+def abrir_inventario(archivo: Optional[str] = None, motor: str = "json", **opciones):
+    """Crea el inventario con el motor de almacenamiento elegido ("json" o "sqlite")."""
+    if motor == "json":
+        return Inventario(archivo or DEFAULT_FILE, **opciones)
+    if motor == "sqlite":
+        return InventarioSQLite(archivo or DEFAULT_DB)
+    raise ValueError(f"Motor de almacenamiento desconocido: '{motor}'.")
+
+
+def migrar_json_a_sqlite(ruta_json: str = DEFAULT_FILE, ruta_db: str = DEFAULT_DB) -> int:
+    """Copia un inventario.json existente a una base SQLite. Devuelve cuántos productos migró."""
+    if not os.path.exists(ruta_json):
+        raise FileNotFoundError(f"No existe '{ruta_json}'.")
+    inv = InventarioSQLite(ruta_db)
+    try:
+        inv.cargar(ruta_json)
+        return inv.contar()
+    finally:
+        inv.cerrar()
 
 
 # -------------------------
@@ -260,14 +1440,28 @@ def leer_float(prompt: str) -> float:
             print("Entrada inválida. Escribe un número (puede tener decimales).")
 
 
+def leer_float_opcional(prompt: str) -> Optional[float]:
+    """Como leer_float, pero una entrada vacía significa "sin valor" (None)."""
+    while True:
+        s = input(prompt).strip()
+        if not s:
+            return None
+        try:
+            return float(s)
+        except ValueError:
+            print("Entrada inválida. Escribe un número o deja vacío.")
+
+
 def mostrar_producto_console(p: Producto) -> None:
     print(p)
 
 
-def menu():
-    inv = Inventario()
+def menu(diario: bool = False, motor: str = "json"):
+    inv = abrir_inventario(motor=motor, **({"diario": diario} if motor == "json" else {}))
     print("=== Sistema Avanzado de Gestión de Inventario ===")
     print(f"Archivo de datos: {inv.ARCHIVO} (productos cargados: {inv.contar()})")
+    if getattr(inv, "diario", False):
+        print(f"Modo diario activo: los cambios se registran en {inv.ARCHIVO_DIARIO}")
 
     while True:
         print("\nMenú:")
@@ -280,9 +1474,11 @@ def menu():
         print("7) Mostrar todos")
         print("8) Guardar manualmente")
         print("9) Cargar desde archivo")
+        print("10) Importar productos (CSV/JSONL)")
+        print("11) Exportar listado (CSV/JSONL/TXT)")
         print("0) Salir (guarda automáticamente)")
 
-        opcion = leer_texto("Selecciona una opción (0-9): ")
+        opcion = leer_texto("Selecciona una opción (0-11): ")
 
         try:
             if opcion == "1":
@@ -324,21 +1520,29 @@ def menu():
                 texto = leer_texto("Nombre o parte del nombre: ")
                 encontrados = inv.buscar_por_nombre(texto)
                 if not encontrados:
-                    print("No se encontraron productos.")
+                    aproximado = getattr(inv, "buscar_aproximado", None)
+                    sugerencias = aproximado(texto, k=5) if aproximado is not None else []
+                    if sugerencias:
+                        print("No hay coincidencias exactas. ¿Quisiste decir...?")
+                        for p, _ in sugerencias:
+                            mostrar_producto_console(p)
+                    else:
+                        print("No se encontraron productos.")
                 else:
                     print(f"Se encontraron {len(encontrados)} producto(s):")
                     for p in encontrados:
                         mostrar_producto_console(p)
 
             elif opcion == "7":
-                todos = inv.mostrar_todos()
-                if not todos:
+                total = inv.contar()
+                if not total:
                     print("Inventario vacío.")
                 else:
-                    print(f"Inventario ({len(todos)} productos):")
+                    print(f"Inventario ({total} productos):")
                     print("ID      | Nombre                    | Cant  | Precio")
                     print("-" * 60)
-                    for id_, nombre, cant, precio in todos:
+                    # se imprime a medida que se recorre, sin armar la lista completa
+                    for id_, nombre, cant, precio in inv.recorrer():
                         print(f"{id_:<8} | {nombre:<25} | {cant:<6} | ${precio:>8.2f}")
 
             elif opcion == "8":
@@ -349,6 +1553,22 @@ def menu():
                 inv.cargar()
                 print("Inventario recargado desde archivo.")
 
+            elif opcion == "10":
+                ruta = leer_texto("Ruta del archivo (.csv o .jsonl): ")
+                importados, rechazados = inv.importar(ruta)
+                print(f"Importados: {importados}. Rechazados: {rechazados}.")
+                if rechazados:
+                    print(f"Detalle de rechazos en: {ruta}.rechazos.jsonl")
+
+            elif opcion == "11":
+                ruta = leer_texto("Ruta de salida (.csv, .jsonl o .txt): ")
+                precio_min = leer_float_opcional("Precio mínimo (vacío = sin límite): ")
+                precio_max = leer_float_opcional("Precio máximo (vacío = sin límite): ")
+                bajo = leer_float_opcional("Solo stock bajo: cantidad máxima (vacío = todos): ")
+                escritas = inv.exportar(ruta, precio_min=precio_min, precio_max=precio_max,
+                                        cantidad_max=None if bajo is None else int(bajo))
+                print(f"Exportadas {escritas} filas a {ruta}.")
+
             elif opcion == "0":
                 inv.guardar()
                 print("Inventario guardado. Saliendo...")
@@ -368,4 +1588,15 @@ def menu():
 
 # Ejecutar menú si se llama el archivo directamente
 if __name__ == "__main__":
-    menu()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sistema Avanzado de Gestión de Inventario")
+    parser.add_argument("--diario", action="store_true",
+                        help="registrar los cambios en un diario append-only (motor JSON)")
+    parser.add_argument("--sqlite", action="store_true", help=f"usar el motor SQLite ({DEFAULT_DB})")
+    parser.add_argument("--migrar", nargs=2, metavar=("JSON", "DB"),
+                        help="migrar un inventario.json a una base SQLite y salir")
+    args = parser.parse_args()
+    if args.migrar:
+        migrados = migrar_json_a_sqlite(*args.migrar)
+        print(f"Migrados {migrados} productos a {args.migrar[1]}.")
+    else:
+        menu(diario=args.diario, motor="sqlite" if args.sqlite else "json")
\ No newline at end of file
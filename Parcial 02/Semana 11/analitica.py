@@ -0,0 +1,177 @@
+"""
+Analítica vectorizada del Inventario (Semana 11) con NumPy.
+
+Exporta el inventario una sola vez a columnas (ids, cantidad, precio) y las
+mantiene al día con los cambios que notifica Inventario.suscribir(), así que
+valoración, percentiles, alertas de stock bajo y clasificación ABC se calculan
+con operaciones vectorizadas en lugar de recorrer los productos en Python.
+
+Uso:
+    inv = Inventario()
+    analitica = AnaliticaInventario(inv)
+    analitica.valor_total()
+    analitica.bajo_stock(5)
+    analitica.clasificacion_abc()
+"""
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+CAPACIDAD_INICIAL = 1024
+
+
+class AnaliticaInventario:
+    """
+    Columnas NumPy sincronizadas con un Inventario.
+
+      - _ids: array de objetos (id de cada fila)
+      - _cantidad: int64, _precio: float64
+      - _fila: Dict[id, posición] -> actualizar o borrar una fila en O(1)
+
+    Las columnas tienen capacidad de reserva (crecen al doble) y un borrado mueve la
+    última fila al hueco, de modo que los cambios nunca copian todo el inventario.
+
+    Una consulta dentro de una transacción abierta (o con cambios de
+    InventarioConcurrente aún sin notificar) ve cambios que todavía pueden deshacerse
+    o que llegarán notificados después: esas columnas no se dan por sincronizadas y se
+    reconstruyen en la siguiente consulta. Además, aplicar un cambio que las columnas
+    ya reflejan no tiene efecto (add reemplaza la fila, del/set de un ID ausente se ignoran).
+    """
+
+    def __init__(self, inventario):
+        self._inventario = inventario
+        self._n = 0
+        self._ids = np.empty(0, dtype=object)
+        self._cantidad = np.empty(0, dtype=np.int64)
+        self._precio = np.empty(0, dtype=np.float64)
+        self._fila: Dict[str, int] = {}
+        self._desactualizado = True
+        inventario.suscribir(self._al_cambiar)
+
+    def cerrar(self) -> None:
+        """Deja de seguir los cambios del inventario."""
+        self._inventario.desuscribir(self._al_cambiar)
+
+    # ---------- sincronización ----------
+    def _reconstruir(self) -> None:
+        productos = list(self._inventario._productos.values())
+        n = len(productos)
+        capacidad = max(CAPACIDAD_INICIAL, 2 * n)
+        self._ids = np.empty(capacidad, dtype=object)
+        self._cantidad = np.zeros(capacidad, dtype=np.int64)
+        self._precio = np.zeros(capacidad, dtype=np.float64)
+        self._ids[:n] = [p.id for p in productos]
+        self._cantidad[:n] = np.fromiter((p.cantidad for p in productos), dtype=np.int64, count=n)
+        self._precio[:n] = np.fromiter((p.precio for p in productos), dtype=np.float64, count=n)
+        self._fila = {p.id: i for i, p in enumerate(productos)}
+        self._n = n
+        self._desactualizado = not self._estado_confirmado()
+
+    def _estado_confirmado(self) -> bool:
+        """True si _productos solo tiene cambios confirmados y ya notificados."""
+        inv = self._inventario
+        return not getattr(inv, "_nivel_transaccion", 0) and not getattr(inv, "_encolados", None)
+
+    def _columnas(self):
+        """Devuelve las vistas (ids, cantidad, precio) de las filas ocupadas."""
+        if self._desactualizado:
+            self._reconstruir()
+        n = self._n
+        return self._ids[:n], self._cantidad[:n], self._precio[:n]
+
+    def _crecer(self) -> None:
+        capacidad = 2 * len(self._ids)
+        for nombre in ("_ids", "_cantidad", "_precio"):
+            anterior = getattr(self, nombre)
+            nueva = np.zeros(capacidad, dtype=anterior.dtype)
+            nueva[:self._n] = anterior[:self._n]
+            setattr(self, nombre, nueva)
+
+    def _al_cambiar(self, registro: Dict, anterior: Any) -> None:
+        if self._desactualizado:
+            # nadie ha consultado todavía: se reconstruye todo en la próxima consulta
+            return
+        op = registro["op"]
+        if op == "add":
+            d = registro["producto"]
+            i = self._fila.get(d["id"])
+            if i is None:
+                if self._n == len(self._ids):
+                    self._crecer()
+                i = self._n
+                self._ids[i] = d["id"]
+                self._fila[d["id"]] = i
+                self._n += 1
+            self._cantidad[i] = d["cantidad"]
+            self._precio[i] = d["precio"]
+        elif op == "del":
+            i = self._fila.pop(registro["id"], None)
+            if i is None:
+                return
+            ultima = self._n - 1
+            if i != ultima:
+                # la última fila ocupa el hueco
+                self._ids[i] = self._ids[ultima]
+                self._cantidad[i] = self._cantidad[ultima]
+                self._precio[i] = self._precio[ultima]
+                self._fila[self._ids[i]] = i
+            self._ids[ultima] = None
+            self._n = ultima
+        elif op == "set":
+            i = self._fila.get(registro["id"])
+            if i is None:
+                return
+            if registro["campo"] == "cantidad":
+                self._cantidad[i] = registro["valor"]
+            elif registro["campo"] == "precio":
+                self._precio[i] = registro["valor"]
+        else:
+            self._desactualizado = True
+
+    # ---------- indicadores ----------
+    def valor_total(self) -> float:
+        """Valor del stock: suma de cantidad * precio."""
+        _, cantidad, precio = self._columnas()
+        return float(np.dot(cantidad, precio))
+
+    def valor_por_producto(self) -> Dict[str, float]:
+        ids, cantidad, precio = self._columnas()
+        return dict(zip(ids.tolist(), (cantidad * precio).tolist()))
+
+    def percentiles(self, campo: str = "precio", q: Sequence[float] = (25, 50, 75, 90)) -> Dict[float, float]:
+        """Percentiles de "precio", "cantidad" o "valor" (cantidad * precio)."""
+        _, cantidad, precio = self._columnas()
+        columnas = {"precio": precio, "cantidad": cantidad, "valor": cantidad * precio}
+        if campo not in columnas:
+            raise ValueError(f"Campo desconocido: '{campo}' (usa precio, cantidad o valor).")
+        if self._n == 0:
+            return {p: 0.0 for p in q}
+        return dict(zip(q, np.percentile(columnas[campo], q).tolist()))
+
+    def bajo_stock(self, umbral: int) -> List[str]:
+        """IDs (ordenados) con cantidad menor que `umbral`."""
+        ids, cantidad, _ = self._columnas()
+        return sorted(ids[cantidad < umbral].tolist())
+
+    def filtrar_por_precio(self, minimo: float = 0.0, maximo: float = float("inf")) -> List[str]:
+        """IDs (ordenados) con minimo <= precio <= maximo."""
+        ids, _, precio = self._columnas()
+        return sorted(ids[(precio >= minimo) & (precio <= maximo)].tolist())
+
+    def clasificacion_abc(self, corte_a: float = 0.80, corte_b: float = 0.95) -> Dict[str, List[str]]:
+        """
+        Clasificación ABC (Pareto) por valor de stock: los productos de mayor valor
+        que suman hasta `corte_a` del total son A, hasta `corte_b` son B y el resto C.
+        Cada lista va ordenada de mayor a menor valor (los empates, en orden arbitrario).
+        """
+        ids, cantidad, precio = self._columnas()
+        valor = cantidad * precio
+        orden = np.argsort(-valor, kind="stable")
+        total = valor.sum()
+        if total <= 0:
+            return {"A": [], "B": [], "C": ids[orden].tolist()}
+        # proporción acumulada antes de cada producto: el que cruza el corte queda dentro
+        acumulado = (np.cumsum(valor[orden]) - valor[orden]) / total
+        clases = np.searchsorted([corte_a, corte_b], acumulado, side="right")
+        ordenados = ids[orden]
+        return {letra: ordenados[clases == k].tolist() for k, letra in enumerate("ABC")}
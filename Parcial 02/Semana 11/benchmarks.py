@@ -0,0 +1,795 @@
+"""
+Benchmarks del Inventario (Semana 11).
+
+Cada benchmark trabaja sobre archivos en un directorio temporal, nunca sobre
+inventario.json. Uso:
+
+    python benchmarks.py recuperacion [--productos N] [--registros N]
+    python benchmarks.py transaccion [--productos N] [--actualizaciones N] [--muestra N]
+    python benchmarks.py busqueda [--tamanos 10000 100000 1000000] [--consultas N]
+    python benchmarks.py memoria [--productos N]
+    python benchmarks.py analitica [--productos N] [--repeticiones N]   (requiere NumPy)
+    python benchmarks.py arranque [--productos N] [--consultas N]
+    python benchmarks.py difusa [--tamanos 100000 1000000] [--consultas N] [--muestra N]
+    python benchmarks.py concurrencia [--productos N] [--hilos 1 2 4 8 16 32] [--segundos S]
+    python benchmarks.py cache [--productos N] [--consultas N] [--capacidades 16 64 256]
+    python benchmarks.py particiones [--productos N] [--particiones 1 2 4 8] [--operaciones N] [--diario]
+    python benchmarks.py historial [--productos N] [--eventos N] [--consultas N]
+    python benchmarks.py reposicion [--productos N] [--dias N]   (requiere NumPy)
+    python benchmarks.py exportacion [--tamanos 100000 500000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from tarea11 import Inventario, Producto, modulo
+
+
+# -------------------------
+# Utilidades
+# -------------------------
+TIPOS = ["tornillo", "tuerca", "arandela", "clavo", "bisagra", "cable", "tubo", "codo",
+         "llave", "aceite", "arroz", "azúcar", "harina", "pintura", "brocha", "lija"]
+MATERIALES = ["acero", "inox", "bronce", "pvc", "cobre", "aluminio", "madera", "premium"]
+MARCAS = ["Truper", "Stanley", "Bosch", "Pretul", "Sika", "Pintuco", "Norton", "Genérico"]
+
+
+def nombre_sintetico(rng: random.Random) -> str:
+    return f"{rng.choice(TIPOS).capitalize()} {rng.choice(MATERIALES)} {rng.randint(1, 500)}mm {rng.choice(MARCAS)}"
+
+
+def crear_inventario(directorio: str, n: int, persistir: bool = True, clase=Inventario, **kwargs) -> Inventario:
+    """Crea un inventario con n productos sintéticos; si persistir, lo guarda en `directorio`."""
+    rng = random.Random(n)
+    inv = clase(os.path.join(directorio, "inventario.json"), **kwargs)
+    with inv.transaccion():
+        for i in range(n):
+            inv.añadir_producto(Producto(f"{i:07d}", nombre_sintetico(rng), i % 100, 1.0 + i % 50))
+        if not persistir:
+            # descartamos los registros pendientes: el inventario queda solo en memoria
+            inv._pendientes.clear()
+            inv._deshacer.clear()
+    return inv
+
+
+def cronometrar(funcion) -> float:
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+# -------------------------
+# Recuperación del diario tras un corte (user-001)
+# -------------------------
+def bench_recuperacion(args) -> None:
+    """
+    Simula un corte a mitad de un append al diario, reabre, escribe y vuelve a abrir:
+    todo lo confirmado después de la primera recuperación debe seguir ahí.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = crear_inventario(tmp, args.productos, diario=True)
+        ids = list(inv._productos)
+        rng = random.Random(1)
+        for _ in range(args.registros):
+            inv.actualizar_cantidad(rng.choice(ids), rng.randint(0, 100))
+        esperado = inv.mostrar_todos()
+        with open(inv.ARCHIVO_DIARIO, "a", encoding="utf-8") as f:
+            f.write('{"op":"set","id":"' + ids[0] + '","campo":"cant')  # append cortado
+        t_reproducir = cronometrar(lambda: Inventario(inv.ARCHIVO, diario=True))
+        recuperado = Inventario(inv.ARCHIVO, diario=True)
+        assert recuperado.mostrar_todos() == esperado, "la recuperación no coincide con lo confirmado"
+        recuperado.añadir_producto(Producto("nuevo", "Producto nuevo", 1, 1.0))
+        recuperado.actualizar_cantidad(ids[1], 99)
+        reabierto = Inventario(inv.ARCHIVO, diario=True)
+        assert reabierto.mostrar_todos() == recuperado.mostrar_todos(), \
+            "se perdieron escrituras hechas después de recuperar un diario cortado"
+    print(f"{args.productos} productos, {args.registros} registros en el diario + una línea cortada")
+    print(f"  reapertura con reproducción del diario: {t_reproducir:.3f} s;"
+          f" escrituras posteriores conservadas tras reabrir: sí")
+
+
+# -------------------------
+# Transacciones (user-002)
+# -------------------------
+def bench_transaccion(args) -> None:
+    rng = random.Random(42)
+    ids = [f"{i:07d}" for i in range(args.productos)]
+    cambios = [(rng.choice(ids), rng.randint(0, 500), round(rng.uniform(1, 100), 2))
+               for _ in range(args.actualizaciones)]
+
+    def aplicar(inv, lote):
+        for pid, cantidad, precio in lote:
+            if cantidad % 2:
+                inv.actualizar_cantidad(pid, cantidad)
+            else:
+                inv.actualizar_precio(pid, precio)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = crear_inventario(tmp, args.productos)
+
+        # sin transacción cada cambio reescribe el archivo: medimos una muestra y extrapolamos
+        muestra = cambios[:args.muestra]
+        t_muestra = cronometrar(lambda: aplicar(inv, muestra))
+        t_sin = t_muestra / len(muestra) * len(cambios)
+
+        def con_transaccion():
+            with inv.transaccion():
+                aplicar(inv, cambios)
+        t_con = cronometrar(con_transaccion)
+
+    print(f"Catálogo: {args.productos} productos, lote de {len(cambios)} actualizaciones")
+    print(f"  sin transacción: {t_sin:10.3f} s  (estimado a partir de {len(muestra)} cambios)")
+    print(f"  con transacción: {t_con:10.3f} s")
+    print(f"  aceleración:     {t_sin / t_con:10.1f}x")
+
+
+# -------------------------
+# Búsqueda por subcadena (user-003)
+# -------------------------
+def buscar_lineal(inv: Inventario, texto: str):
+    """Ruta de búsqueda anterior al índice de trigramas, como referencia."""
+    clave = inv._normalizar(texto)
+    if clave in inv._indice_nombre:
+        return [inv._productos[pid] for pid in sorted(inv._indice_nombre[clave])]
+    return sorted((p for p in inv._productos.values() if clave in inv._normalizar(p.nombre)),
+                  key=lambda x: x.id)
+
+
+def bench_busqueda(args) -> None:
+    rng = random.Random(7)
+    consultas = []
+    for _ in range(args.consultas):
+        nombre = nombre_sintetico(rng).lower()
+        inicio = rng.randrange(0, len(nombre) - 4)
+        consultas.append(nombre[inicio:inicio + rng.randint(4, 10)])
+
+    print(f"{'productos':>10} | {'lineal (ms)':>12} | {'trigramas (ms)':>14} | {'aceleración':>11}")
+    for n in args.tamanos:
+        with tempfile.TemporaryDirectory() as tmp:
+            inv = crear_inventario(tmp, n, persistir=False)
+            for q in consultas[:5]:
+                assert buscar_lineal(inv, q) == inv.buscar_por_nombre(q), q
+            t_lineal = cronometrar(lambda: [buscar_lineal(inv, q) for q in consultas])
+            t_indice = cronometrar(lambda: [inv.buscar_por_nombre(q) for q in consultas])
+        ms_lineal = t_lineal / len(consultas) * 1000
+        ms_indice = t_indice / len(consultas) * 1000
+        print(f"{n:>10} | {ms_lineal:>12.3f} | {ms_indice:>14.3f} | {ms_lineal / ms_indice:>10.1f}x")
+
+
+# -------------------------
+# Memoria y tiempo de carga de Producto (user-004)
+# -------------------------
+class ProductoConDict:
+    """Réplica del Producto anterior (atributos en __dict__, setters validados) como referencia."""
+    id = property(Producto.id.fget, Producto.id.fset)
+    nombre = property(Producto.nombre.fget, Producto.nombre.fset)
+    cantidad = property(Producto.cantidad.fget, Producto.cantidad.fset)
+    precio = property(Producto.precio.fget, Producto.precio.fset)
+    __init__ = Producto.__init__
+
+    @staticmethod
+    def from_dict(d):
+        return ProductoConDict(str(d.get("id", "")), str(d.get("nombre", "")),
+                               int(d.get("cantidad", 0)), float(d.get("precio", 0.0)))
+
+
+def bytes_por_objeto(crear, datos) -> float:
+    """Memoria asignada por objeto (sin contar las cadenas/números, compartidos con `datos`)."""
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    objetos = [crear(d) for d in datos]
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in despues.compare_to(antes, "filename"))
+    # descontamos la lista que sostiene los objetos
+    total -= 8 * len(objetos)
+    return total / len(objetos)
+
+
+def bench_memoria(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_inventario(tmp, args.productos)
+        ruta = os.path.join(tmp, "inventario.json")
+        with open(ruta, "r", encoding="utf-8") as f:
+            datos = list(json.load(f).values())
+
+        print(f"{args.productos} productos")
+        print(f"{'variante':<32} | {'bytes/producto':>14} | {'construcción (s)':>16}")
+        variantes = [
+            ("__dict__ + setters (anterior)", ProductoConDict.from_dict),
+            ("__slots__ + setters", Producto.from_dict),
+            ("__slots__ + ruta confiable", Producto.from_dict_confiable),
+        ]
+        for nombre, crear in variantes:
+            memoria = bytes_por_objeto(crear, datos[:100_000])
+            t = cronometrar(lambda: [crear(d) for d in datos])
+            print(f"{nombre:<32} | {memoria:>14.1f} | {t:>16.3f}")
+
+        inv = Inventario(ruta)
+        t_validado = cronometrar(lambda: inv.cargar(ruta, validar=True))
+        t_comprobado = cronometrar(lambda: inv.cargar(ruta))
+        t_confiable = cronometrar(lambda: inv.cargar(ruta, validar=False))
+        print(f"Inventario.cargar() completo: validado {t_validado:.3f} s, comprobado (por defecto)"
+              f" {t_comprobado:.3f} s, confiable {t_confiable:.3f} s")
+
+
+# -------------------------
+# Analítica vectorizada (user-008)
+# -------------------------
+def analitica_python(inv: Inventario, umbral: int):
+    """Cálculo con bucles de Python sobre _productos, como referencia."""
+    total = 0.0
+    bajo = []
+    valores = []
+    for p in inv._productos.values():
+        valor = p.cantidad * p.precio
+        total += valor
+        valores.append((valor, p.id))
+        if p.cantidad < umbral:
+            bajo.append(p.id)
+    bajo.sort()
+    valores.sort(key=lambda x: -x[0])
+    clases = {"A": [], "B": [], "C": []}
+    acumulado = 0.0
+    for valor, pid in valores:
+        proporcion = acumulado / total if total else 1.0
+        clases["A" if proporcion < 0.80 else "B" if proporcion < 0.95 else "C"].append(pid)
+        acumulado += valor
+    return total, bajo, clases
+
+
+def bench_analitica(args) -> None:
+    from analitica import AnaliticaInventario
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = crear_inventario(tmp, args.productos, persistir=False)
+        analitica = AnaliticaInventario(inv)
+        t_export = cronometrar(analitica._columnas)
+
+        def vectorizado():
+            return analitica.valor_total(), analitica.bajo_stock(5), analitica.clasificacion_abc()
+
+        total_py, bajo_py, abc_py = analitica_python(inv, 5)
+        total_np, bajo_np, abc_np = vectorizado()
+        assert abs(total_py - total_np) < 1e-6 * max(1.0, total_py) and bajo_py == bajo_np
+        assert {k: len(v) for k, v in abc_py.items()} == {k: len(v) for k, v in abc_np.items()}
+
+        t_py = cronometrar(lambda: [analitica_python(inv, 5) for _ in range(args.repeticiones)])
+        t_np = cronometrar(lambda: [vectorizado() for _ in range(args.repeticiones)])
+
+        # cambios incrementales: las columnas se actualizan sin reconstruirse
+        ids = list(inv._productos)[:1000]
+        with inv.transaccion():
+            for pid in ids:
+                inv.actualizar_cantidad(pid, 0)
+        t_incremental = cronometrar(vectorizado)
+        assert analitica_python(inv, 5)[1] == analitica.bajo_stock(5)
+
+    print(f"{args.productos} productos, valoración + stock bajo + ABC")
+    print(f"  exportar columnas (una vez): {t_export * 1000:9.1f} ms")
+    print(f"  bucle Python:                {t_py / args.repeticiones * 1000:9.1f} ms")
+    print(f"  NumPy:                       {t_np / args.repeticiones * 1000:9.1f} ms")
+    print(f"  NumPy tras 1000 cambios:     {t_incremental * 1000:9.1f} ms")
+
+
+# -------------------------
+# Arranque: JSON vs. snapshot binario (user-011)
+# -------------------------
+def bench_arranque(args) -> None:
+    from snapshot_binario import SnapshotBinario, escribir_snapshot
+
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = crear_inventario(tmp, args.productos)
+        ruta_json = os.path.join(tmp, "inventario.json")
+        ruta_bin = os.path.join(tmp, "inventario.invb")
+        escribir_snapshot(inv._productos.values(), ruta_bin)
+        ids = rng.sample(list(inv._productos), min(args.consultas, args.productos))
+        del inv
+
+        def con_json():
+            nuevo = Inventario(ruta_json)
+            return [nuevo.obtener_producto(pid) for pid in ids]
+
+        def con_binario():
+            with SnapshotBinario(ruta_bin) as snapshot:
+                return [snapshot.obtener_producto(pid).to_dict() for pid in ids]
+
+        t_json = cronometrar(con_json)
+        t_bin = cronometrar(con_binario)
+        with SnapshotBinario(ruta_bin) as snapshot:
+            t_recorrido = cronometrar(lambda: sum(1 for _ in snapshot))
+        tam_json = os.path.getsize(ruta_json)
+        tam_bin = os.path.getsize(ruta_bin)
+
+    print(f"{args.productos} productos, arranque + {len(ids)} consultas por ID")
+    print(f"  JSON (Inventario.__init__):  {t_json * 1000:10.1f} ms   archivo {tam_json / 1e6:8.1f} MB")
+    print(f"  snapshot binario (mmap):     {t_bin * 1000:10.1f} ms   archivo {tam_bin / 1e6:8.1f} MB")
+    print(f"  recorrido completo binario:  {t_recorrido * 1000:10.1f} ms")
+
+
+# -------------------------
+# Búsqueda tolerante a errores (user-012)
+# -------------------------
+def con_errata(palabra: str, rng: random.Random) -> str:
+    """Introduce un error de escritura: borra, duplica o intercambia una letra."""
+    i = rng.randrange(len(palabra) - 1)
+    error = rng.choice(("borrar", "duplicar", "intercambiar"))
+    if error == "borrar":
+        return palabra[:i] + palabra[i + 1:]
+    if error == "duplicar":
+        return palabra[:i] + palabra[i] + palabra[i:]
+    return palabra[:i] + palabra[i + 1] + palabra[i] + palabra[i + 2:]
+
+
+def buscar_aproximado_lineal(inv: Inventario, texto: str, k: int = 10):
+    """Misma semántica que Inventario.buscar_aproximado, comparando contra cada producto."""
+    palabras = inv._normalizar(texto).split()
+    puntuados = []
+    for p in inv._productos.values():
+        del_nombre = inv._normalizar(p.nombre).split()
+        total = 0
+        for palabra in palabras:
+            tolerancia = inv._tolerancia(palabra, modulo.DISTANCIA_DIFUSA)
+            d = min(modulo.distancia_edicion(palabra, w, tolerancia) for w in del_nombre)
+            if d > tolerancia:
+                break
+            total += d
+        else:
+            puntuados.append((total, p.id))
+    return [(inv._productos[pid], d) for d, pid in sorted(puntuados)[:k]]
+
+
+def bench_difusa(args) -> None:
+    rng = random.Random(12)
+    consultas = [f"{con_errata(rng.choice(TIPOS), rng)} {con_errata(rng.choice(MATERIALES), rng)}"
+                 for _ in range(args.consultas)]
+
+    print(f"{'productos':>10} | {'construcción (s)':>16} | {'lineal (ms)':>12} | "
+          f"{'índice (ms)':>11} | {'p99 índice (ms)':>15}")
+    for n in args.tamanos:
+        with tempfile.TemporaryDirectory() as tmp:
+            inv = crear_inventario(tmp, n, persistir=False)
+            t_construir = cronometrar(inv._construir_difuso)
+            muestra = consultas[:args.muestra]
+            for q in muestra[:2]:
+                assert [d for _, d in inv.buscar_aproximado(q)] == \
+                       [d for _, d in buscar_aproximado_lineal(inv, q)], q
+            t_lineal = cronometrar(lambda: [buscar_aproximado_lineal(inv, q) for q in muestra])
+            latencias = []
+            for q in consultas:
+                latencias.append(cronometrar(lambda: inv.buscar_aproximado(q)))
+        latencias.sort()
+        ms_lineal = t_lineal / len(muestra) * 1000
+        ms_indice = sum(latencias) / len(latencias) * 1000
+        p99 = latencias[min(len(latencias) - 1, int(0.99 * len(latencias)))] * 1000
+        print(f"{n:>10} | {t_construir:>16.2f} | {ms_lineal:>12.1f} | {ms_indice:>11.3f} | {p99:>15.3f}")
+
+
+# -------------------------
+# Concurrencia: estrés y rendimiento con 1-32 hilos (user-014)
+# -------------------------
+def verificar_indices(inv: Inventario) -> None:
+    """Comprueba que los índices coinciden con una reconstrucción desde _productos."""
+    por_nombre = {}
+    for p in inv._productos.values():
+        por_nombre.setdefault(inv._normalizar(p.nombre), set()).add(p.id)
+    assert dict(inv._indice_nombre) == por_nombre, "índice por nombre inconsistente"
+    if inv._ordenes_construidos:
+        assert list(inv._orden_ids) == sorted(inv._productos), "índice de IDs inconsistente"
+        assert list(inv._orden_cantidad) == sorted((p.cantidad, p.id) for p in inv._productos.values())
+    if inv._trigramas_construidos:
+        trigramas = {}
+        for clave, ids in por_nombre.items():
+            for t in inv._trigramas(clave):
+                trigramas.setdefault(t, set()).update(ids)
+        assert dict(inv._indice_trigramas) == trigramas, "índice de trigramas inconsistente"
+
+
+def bench_concurrencia(args) -> None:
+    from concurrente import InventarioConcurrente
+
+    print(f"{args.productos} productos, modo diario, {args.escrituras:.0%} escrituras, "
+          f"{args.segundos:.0f} s por medición")
+    print(f"{'hilos':>6} | {'ops/s':>10} | {'lecturas/s':>11} | {'escrituras/s':>12} | {'errores':>7}")
+    for hilos in args.hilos:
+        with tempfile.TemporaryDirectory() as tmp:
+            inv = crear_inventario(tmp, args.productos, clase=InventarioConcurrente, diario=True)
+            ids = list(inv._productos)
+            # construimos los índices bajo demanda para que las escrituras también los mantengan
+            inv.listar(limite=1)
+            inv.buscar_por_nombre("tor")
+            lecturas = [0] * hilos
+            escrituras = [0] * hilos
+            errores = [0] * hilos
+            fin = time.perf_counter() + args.segundos
+
+            def trabajador(k: int) -> None:
+                rng = random.Random(k)
+                while time.perf_counter() < fin:
+                    pid = rng.choice(ids)
+                    r = rng.random()
+                    if r < args.escrituras / 2:
+                        inv.actualizar_nombre(pid, nombre_sintetico(rng))
+                        escrituras[k] += 1
+                    elif r < args.escrituras:
+                        inv.actualizar_cantidad(pid, rng.randint(0, 100))
+                        escrituras[k] += 1
+                    elif r < 0.5 + args.escrituras / 2:
+                        # estrés: cada resultado debe tener exactamente el nombre buscado
+                        clave = inv._normalizar(inv.obtener_producto(pid).nombre)
+                        with inv._candado.lectura():
+                            errores[k] += sum(inv._normalizar(p.nombre) != clave
+                                              for p in inv.buscar_por_nombre(clave))
+                        lecturas[k] += 2
+                    else:
+                        inv.listar(desde=pid, limite=10)
+                        lecturas[k] += 1
+
+            hebras = [threading.Thread(target=trabajador, args=(k,)) for k in range(hilos)]
+            inicio = time.perf_counter()
+            for h in hebras:
+                h.start()
+            for h in hebras:
+                h.join()
+            duracion = time.perf_counter() - inicio
+
+            verificar_indices(inv)
+            recargado = Inventario(inv.ARCHIVO, diario=True)
+            assert recargado.mostrar_todos() == inv.mostrar_todos(), "lo persistido no coincide con memoria"
+        total_l, total_e = sum(lecturas), sum(escrituras)
+        print(f"{hilos:>6} | {(total_l + total_e) / duracion:>10.0f} | {total_l / duracion:>11.0f} | "
+              f"{total_e / duracion:>12.0f} | {sum(errores):>7}")
+
+
+# -------------------------
+# Caché LRU de búsquedas (user-015)
+# -------------------------
+def bench_cache(args) -> None:
+    rng = random.Random(15)
+    # consultas con popularidad tipo Zipf: unas pocas concentran la mayoría del tráfico
+    distintas = TIPOS + [f"{t} {m}" for t in TIPOS for m in MATERIALES]
+    rng.shuffle(distintas)
+    pesos = [1 / (rango + 1) for rango in range(len(distintas))]
+    consultas = rng.choices(distintas, weights=pesos, k=args.consultas)
+    # una de cada `cada_escritura` operaciones renombra un producto
+    renombres = [nombre_sintetico(rng) for _ in range(args.consultas // args.cada_escritura + 1)]
+
+    print(f"{args.productos} productos, {args.consultas} consultas ({len(distintas)} distintas), "
+          f"1 renombre cada {args.cada_escritura}")
+    print(f"{'capacidad':>9} | {'ms/consulta':>11} | {'aciertos':>8} | {'desalojos':>9} | {'invalidaciones':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = crear_inventario(tmp, args.productos, persistir=False)
+        ids = list(inv._productos)
+        inv.buscar_por_nombre("tor")  # índice de trigramas ya construido en todas las mediciones
+        originales = {pid: inv._productos[pid].nombre for pid in ids}
+        for capacidad in [0] + args.capacidades:
+            inv.capacidad_cache = capacidad
+            inv._invalidar_indices_derivados()
+            inv.buscar_por_nombre("tor")
+            antes = inv.estadisticas_cache()
+            elegir = random.Random(1)
+
+            def carga():
+                # los renombres se aplican en memoria (sin tocar disco) para medir solo la búsqueda
+                for i, q in enumerate(consultas):
+                    if i % args.cada_escritura == 0:
+                        prod = inv._productos[elegir.choice(ids)]
+                        inv._desindexar(prod)
+                        prod.nombre = renombres[i // args.cada_escritura]
+                        inv._indexar(prod)
+                    inv.buscar_por_nombre(q)
+
+            t = cronometrar(carga)
+            despues = inv.estadisticas_cache()
+            d = {k: despues[k] - antes[k] for k in ("aciertos", "fallos", "desalojos", "invalidaciones")}
+            tasa = d["aciertos"] / max(1, d["aciertos"] + d["fallos"])
+            print(f"{capacidad:>9} | {t / len(consultas) * 1000:>11.3f} | {tasa:>8.1%} | "
+                  f"{d['desalojos']:>9} | {d['invalidaciones']:>14}")
+            # volvemos a los nombres originales para que todas las capacidades vean lo mismo
+            for pid, nombre in originales.items():
+                prod = inv._productos[pid]
+                if prod.nombre != nombre:
+                    inv._desindexar(prod)
+                    prod.nombre = nombre
+                    inv._indexar(prod)
+
+
+# -------------------------
+# Particiones en varios procesos (user-016)
+# -------------------------
+def bench_particiones(args) -> None:
+    from particiones import InventarioParticionado
+
+    rng = random.Random(16)
+    productos = [Producto(f"{i:07d}", nombre_sintetico(rng), i % 100, 1.0 + i % 50)
+                 for i in range(args.productos)]
+    ids = [p.id for p in productos]
+    cambios = [("actualizar_cantidad", rng.choice(ids), (rng.randint(0, 100),))
+               for _ in range(args.operaciones)]
+    consultas = [rng.choice(TIPOS)[:4] + " " for _ in range(20)]
+
+    modo = "diario" if args.diario else "snapshot"
+    print(f"{args.productos} productos, modo {modo}, {os.cpu_count()} CPU")
+    print(f"{'particiones':>11} | {'alta (s)':>8} | {'escrituras/s':>12} | {'buscar (ms)':>11} | "
+          f"{'mostrar_todos (ms)':>18}")
+    referencia = None
+    for n in args.particiones:
+        with tempfile.TemporaryDirectory() as tmp, \
+                InventarioParticionado(os.path.join(tmp, "inventario.json"), n, diario=args.diario) as inv:
+            t_alta = cronometrar(lambda: inv.añadir_productos(productos))
+            t_escrituras = cronometrar(lambda: inv.ejecutar_lote(cambios))
+            t_buscar = cronometrar(lambda: [inv.buscar_por_nombre(q) for q in consultas])
+            todos = []
+            t_todos = cronometrar(lambda: todos.extend(inv.mostrar_todos()))
+            # el resultado no depende del número de particiones
+            if referencia is None:
+                referencia = todos
+            assert todos == referencia and inv.contar() == args.productos
+        print(f"{n:>11} | {t_alta:>8.2f} | {len(cambios) / t_escrituras:>12.0f} | "
+              f"{t_buscar / len(consultas) * 1000:>11.1f} | {t_todos * 1000:>18.1f}")
+
+
+# -------------------------
+# Historial de precio y stock (user-017)
+# -------------------------
+def memoria_asignada(funcion) -> int:
+    """Bytes que siguen asignados después de ejecutar funcion() (el resultado se mantiene vivo)."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return despues - antes
+
+
+def bench_historial(args) -> None:
+    from historial import HistorialInventario
+
+    rng = random.Random(17)
+    inicio = 1_700_000_000.0
+    # eventos de un año: cada uno cambia la cantidad (la mayoría) o el precio de un producto
+    eventos = []
+    t = inicio
+    paso = 365 * 86400 / args.eventos
+    for _ in range(args.eventos):
+        t += rng.expovariate(1 / paso)
+        pid = f"{rng.randrange(args.productos):07d}"
+        if rng.random() < 0.8:
+            eventos.append((pid, "cantidad", rng.randint(0, 500), t))
+        else:
+            eventos.append((pid, "precio", round(rng.uniform(1, 100), 2), t))
+    fin = t
+
+    def compacto():
+        historial = HistorialInventario()
+        for pid, campo, valor, t in eventos:
+            historial.registrar(pid, campo, valor, t)
+        return historial
+
+    def lista_de_dicts(lote):
+        series = {}
+        for pid, campo, valor, t in lote:
+            series.setdefault((pid, campo), []).append({"t": t, "valor": valor})
+        return series
+
+    # los valores y marcas de `eventos` ya existen: medimos solo lo que añade cada estructura
+    muestra = min(len(eventos), 200_000)
+    bytes_dicts = memoria_asignada(lambda: lista_de_dicts(eventos[:muestra])) / muestra
+    t_registro = cronometrar(compacto)
+    bytes_compacto = memoria_asignada(compacto) / len(eventos)
+    historial = compacto()
+
+    consultas = [(f"{rng.randrange(args.productos):07d}", rng.uniform(inicio, fin)) for _ in range(args.consultas)]
+    t_valor = cronometrar(lambda: [historial.valor_en(pid, "cantidad", t) for pid, t in consultas])
+    t_rango = cronometrar(lambda: [historial.cambios_entre(pid, "cantidad", t, t + 7 * 86400)
+                                   for pid, t in consultas])
+    # comprobación contra una búsqueda lineal en una muestra
+    for pid, t in consultas[:20]:
+        esperado = None
+        for p, campo, valor, te in eventos:
+            if p == pid and campo == "cantidad" and round(te * 1000) <= round(t * 1000):
+                esperado = valor
+        assert historial.valor_en(pid, "cantidad", t) == esperado, (pid, t)
+
+    print(f"{len(eventos)} cambios en {args.productos} productos")
+    print(f"  lista de dicts:           {bytes_dicts:8.1f} bytes/cambio (muestra de {muestra})")
+    print(f"  series compactas:         {bytes_compacto:8.1f} bytes/cambio "
+          f"(bytes_usados: {historial.bytes_usados() / len(eventos):.1f})")
+    print(f"  registro:                 {t_registro / len(eventos) * 1e6:8.2f} µs/cambio")
+    print(f"  valor en T:               {t_valor / len(consultas) * 1e6:8.2f} µs/consulta")
+    print(f"  cambios en una semana:    {t_rango / len(consultas) * 1e6:8.2f} µs/consulta")
+
+
+# -------------------------
+# Puntos de reorden (user-018)
+# -------------------------
+def reposicion_python(stock, entrega, ventana: int, z: float):
+    """Mismo cálculo que calcular_reposicion, producto por producto, como referencia."""
+    puntos = []
+    for fila, dias_entrega in zip(stock.tolist(), entrega.tolist()):
+        reciente = fila[-(ventana + 1):]
+        demanda = [max(a - b, 0) for a, b in zip(reciente, reciente[1:])]
+        media = sum(demanda) / len(demanda)
+        desviacion = (sum((d - media) ** 2 for d in demanda) / len(demanda)) ** 0.5
+        puntos.append(media * dias_entrega + z * desviacion * dias_entrega ** 0.5)
+    return puntos
+
+
+def bench_reposicion(args) -> None:
+    from statistics import NormalDist
+
+    from reposicion import (VENTANA_DEMANDA, NIVEL_SERVICIO, calcular_reposicion,
+                            generar_stock_sintetico, lista_reposicion, media_movil, demanda_diaria)
+
+    datos = []
+    t_generar = cronometrar(lambda: datos.extend(generar_stock_sintetico(args.productos, args.dias, semilla=18)))
+    ids, stock, entrega = datos
+    resultado = {}
+    t_calculo = cronometrar(lambda: resultado.update(calcular_reposicion(stock, entrega)))
+    lista = []
+    t_lista = cronometrar(lambda: lista.extend(lista_reposicion(resultado, ids, limite=args.limite)))
+    t_movil = cronometrar(lambda: media_movil(demanda_diaria(stock), VENTANA_DEMANDA))
+
+    muestra = min(args.productos, args.muestra)
+    z = NormalDist().inv_cdf(NIVEL_SERVICIO)
+    t_python = cronometrar(lambda: reposicion_python(stock[:muestra], entrega[:muestra], VENTANA_DEMANDA, z))
+    esperado = reposicion_python(stock[:muestra], entrega[:muestra], VENTANA_DEMANDA, z)
+    assert all(abs(a - b) < 1e-6 * max(1.0, a) for a, b in zip(esperado, resultado["punto_reorden"][:muestra]))
+
+    pendientes = int((resultado["cantidad_sugerida"] > 0).sum())
+    print(f"{args.productos} productos x {args.dias} días ({stock.nbytes / 1e6:.0f} MB de stock diario)")
+    print(f"  generar datos sintéticos:        {t_generar:8.2f} s")
+    print(f"  puntos de reorden (NumPy):       {t_calculo:8.3f} s")
+    print(f"  lista de reposición (top {args.limite}):   {t_lista:8.3f} s   ({pendientes} productos a pedir)")
+    print(f"  media móvil de {VENTANA_DEMANDA} días completa:  {t_movil:8.2f} s")
+    print(f"  bucle Python (estimado):         {t_python / muestra * args.productos:8.2f} s")
+    print("  más urgentes:")
+    for pid, actual, punto, cantidad, cobertura in lista[:5]:
+        print(f"    {pid}  stock {actual:>5}  reorden {punto:8.1f}  pedir {cantidad:>5}  cobertura {cobertura:5.1f} días")
+
+
+# -------------------------
+# Exportación en streaming (user-020)
+# -------------------------
+def pico_memoria(funcion) -> int:
+    """Pico de memoria asignada (bytes) durante funcion(), por encima de lo ya asignado."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico - antes
+
+
+def exportar_materializado(inv: Inventario, ruta: str) -> None:
+    """Lo que había antes: mostrar_todos() arma la lista completa y luego se escribe."""
+    import csv
+
+    todos = inv.mostrar_todos()
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f, lineterminator="\n")
+        escritor.writerow(("id", "nombre", "cantidad", "precio"))
+        escritor.writerows(todos)
+
+
+def bench_exportacion(args) -> None:
+    print(f"{'productos':>10} | {'exportación':<30} | {'filas':>9} | {'filas/s':>10} | {'pico (MB)':>9}")
+    for n in args.tamanos:
+        with tempfile.TemporaryDirectory() as tmp:
+            inv = crear_inventario(tmp, n, persistir=False)
+            # los índices ordenados se construyen una vez, fuera de la medición
+            inv.listar(limite=1)
+            casos = [
+                ("lista + csv (materializado)", lambda ruta: exportar_materializado(inv, ruta) or n, "csv"),
+                ("csv", lambda ruta: inv.exportar(ruta), "csv"),
+                ("jsonl", lambda ruta: inv.exportar(ruta), "jsonl"),
+                ("ancho fijo", lambda ruta: inv.exportar(ruta), "txt"),
+                ("csv, stock <= 4 por cantidad", lambda ruta: inv.exportar(ruta, orden="cantidad", cantidad_max=4), "csv"),
+                ("csv, precio 10-20 por id", lambda ruta: inv.exportar(ruta, precio_min=10, precio_max=20), "csv"),
+            ]
+            for nombre, exportar, extension in casos:
+                ruta = os.path.join(tmp, f"listado.{extension}")
+                filas = []
+                t = cronometrar(lambda: filas.append(exportar(ruta)))
+                pico = pico_memoria(lambda: exportar(ruta))
+                print(f"{n:>10} | {nombre:<30} | {filas[0]:>9} | {filas[0] / t:>10.0f} | {pico / 1e6:>9.2f}")
+
+
+# -------------------------
+# Línea de comandos
+# -------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks del Inventario (Semana 11)")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p = sub.add_parser("recuperacion", help="diario cortado por una caída: reabrir, escribir y reabrir")
+    p.add_argument("--productos", type=int, default=10_000)
+    p.add_argument("--registros", type=int, default=500, help="registros en el diario antes del corte")
+    p.set_defaults(funcion=bench_recuperacion)
+
+    p = sub.add_parser("transaccion", help="lote de actualizaciones con y sin transacción")
+    p.add_argument("--productos", type=int, default=10_000)
+    p.add_argument("--actualizaciones", type=int, default=50_000)
+    p.add_argument("--muestra", type=int, default=200)
+    p.set_defaults(funcion=bench_transaccion)
+
+    p = sub.add_parser("busqueda", help="latencia de búsqueda parcial: lineal vs. trigramas")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--consultas", type=int, default=50)
+    p.set_defaults(funcion=bench_busqueda)
+
+    p = sub.add_parser("memoria", help="bytes por producto y tiempo de carga")
+    p.add_argument("--productos", type=int, default=1_000_000)
+    p.set_defaults(funcion=bench_memoria)
+
+    p = sub.add_parser("analitica", help="valoración/stock bajo/ABC: bucle Python vs. NumPy")
+    p.add_argument("--productos", type=int, default=1_000_000)
+    p.add_argument("--repeticiones", type=int, default=5)
+    p.set_defaults(funcion=bench_analitica)
+
+    p = sub.add_parser("arranque", help="tiempo de arranque: JSON vs. snapshot binario con mmap")
+    p.add_argument("--productos", type=int, default=1_000_000)
+    p.add_argument("--consultas", type=int, default=100)
+    p.set_defaults(funcion=bench_arranque)
+
+    p = sub.add_parser("difusa", help="búsqueda con errores de escritura: recorrido lineal vs. índice de borrados")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[100_000, 1_000_000])
+    p.add_argument("--consultas", type=int, default=200)
+    p.add_argument("--muestra", type=int, default=3, help="consultas medidas con el recorrido lineal")
+    p.set_defaults(funcion=bench_difusa)
+
+    p = sub.add_parser("concurrencia", help="estrés y rendimiento de InventarioConcurrente con varios hilos")
+    p.add_argument("--productos", type=int, default=100_000)
+    p.add_argument("--hilos", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    p.add_argument("--segundos", type=float, default=3.0)
+    p.add_argument("--escrituras", type=float, default=0.1, help="proporción de escrituras")
+    p.set_defaults(funcion=bench_concurrencia)
+
+    p = sub.add_parser("cache", help="búsquedas repetidas con y sin caché LRU")
+    p.add_argument("--productos", type=int, default=100_000)
+    p.add_argument("--consultas", type=int, default=5_000)
+    p.add_argument("--capacidades", type=int, nargs="+", default=[16, 64, 256])
+    p.add_argument("--cada-escritura", type=int, default=100, help="consultas entre dos renombres")
+    p.set_defaults(funcion=bench_cache)
+
+    p = sub.add_parser("particiones", help="rendimiento según el número de particiones (procesos)")
+    p.add_argument("--productos", type=int, default=100_000)
+    p.add_argument("--particiones", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--operaciones", type=int, default=200, help="actualizaciones por ID")
+    p.add_argument("--diario", action="store_true", help="particiones en modo diario")
+    p.set_defaults(funcion=bench_particiones)
+
+    p = sub.add_parser("historial", help="memoria y consultas del historial de precio/stock")
+    p.add_argument("--productos", type=int, default=10_000)
+    p.add_argument("--eventos", type=int, default=2_000_000)
+    p.add_argument("--consultas", type=int, default=10_000)
+    p.set_defaults(funcion=bench_historial)
+
+    p = sub.add_parser("reposicion", help="puntos de reorden de todo el catálogo con NumPy")
+    p.add_argument("--productos", type=int, default=100_000)
+    p.add_argument("--dias", type=int, default=365)
+    p.add_argument("--limite", type=int, default=100, help="largo de la lista de reposición")
+    p.add_argument("--muestra", type=int, default=10_000, help="productos calculados con el bucle Python")
+    p.set_defaults(funcion=bench_reposicion)
+
+    p = sub.add_parser("exportacion", help="filas/s y memoria al exportar a CSV/JSONL/ancho fijo")
+    p.add_argument("--tamanos", type=int, nargs="+", default=[100_000, 500_000])
+    p.set_defaults(funcion=bench_exportacion)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Flujo de cambios (change data capture) del Inventario (Semana 11).
+
+Cada mutación confirmada del Inventario se convierte en un evento con número de
+secuencia creciente y los valores anterior y nuevo:
+
+    {"seq": 41, "ts": 1718000000.12, "op": "add", "id": "001", "antes": null,
+     "despues": {"id": "001", "nombre": "Tornillo", "cantidad": 10, "precio": 0.5}}
+    {"seq": 42, "ts": ..., "op": "set", "id": "001", "campo": "precio", "antes": 0.5, "despues": 0.45}
+    {"seq": 43, "ts": ..., "op": "del", "id": "001", "antes": {...}, "despues": null}
+    {"seq": 44, "ts": ..., "op": "reset"}          # cargar()/importar(): hay que releer todo
+
+La mutación solo arma el evento y lo deja en una cola acotada; un hilo aparte lo
+añade al archivo de cambios (JSON por línea, solo se agrega al final) y se lo pasa
+a los suscriptores. Si la cola se llena, la mutación espera a que haya sitio
+(no se pierden eventos). Los cambios revertidos de una transacción no generan eventos.
+
+Uso:
+    flujo = FlujoCambios(inv, "inventario.cambios.jsonl")
+    flujo.suscribir(lambda evento: print(evento))
+    ...
+    flujo.cerrar()
+
+    # un consumidor que se reinicia sigue desde su última secuencia
+    for evento in leer_cambios("inventario.cambios.jsonl", desde=ultima_seq):
+        ...
+"""
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+CAPACIDAD_COLA = 10_000  # eventos en espera antes de frenar a quien modifica el inventario
+_FIN = object()          # marca de cierre para el hilo despachador
+
+
+def _ultima_secuencia(ruta: str) -> int:
+    """Secuencia del último evento del archivo (0 si no existe), leyendo solo el final."""
+    if not os.path.exists(ruta):
+        return 0
+    with open(ruta, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        fin = f.tell()
+        bloque = 4096
+        while True:
+            inicio = max(0, fin - bloque)
+            f.seek(inicio)
+            lineas = f.read(fin - inicio).splitlines()
+            # la primera línea puede estar cortada salvo que hayamos llegado al principio
+            completas = lineas if inicio == 0 else lineas[1:]
+            for linea in reversed(completas):
+                if linea.strip():
+                    try:
+                        return int(json.loads(linea)["seq"])
+                    except (ValueError, KeyError):
+                        # última línea a medio escribir (caída): probamos la anterior
+                        continue
+            if inicio == 0:
+                return 0
+            bloque *= 2
+
+
+def _reparar_final(ruta: str) -> None:
+    """
+    Deja el archivo terminado en una línea completa antes de seguir agregando: una
+    última línea cortada por una caída se descarta (si es JSON válido y solo le falta
+    el salto de línea, se le añade). Así los eventos nuevos no quedan pegados a ella.
+    """
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        fin = f.tell()
+        if fin == 0:
+            return
+        f.seek(fin - 1)
+        if f.read(1) == b"\n":
+            return
+        # buscamos el último salto de línea hacia atrás
+        bloque = 4096
+        while True:
+            inicio = max(0, fin - bloque)
+            f.seek(inicio)
+            corte = f.read(fin - inicio).rfind(b"\n")
+            if corte >= 0 or inicio == 0:
+                inicio_linea = inicio + corte + 1
+                break
+            bloque *= 2
+        f.seek(inicio_linea)
+        try:
+            json.loads(f.read(fin - inicio_linea))
+        except ValueError:
+            f.truncate(inicio_linea)
+        else:
+            f.seek(fin)
+            f.write(b"\n")
+
+
+def leer_cambios(ruta: str, desde: int = 0) -> Iterator[Dict]:
+    """Eventos del archivo de cambios con secuencia mayor que `desde`, en orden."""
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                evento = json.loads(linea)
+            except ValueError:
+                # línea cortada por una caída (o aún a medio escribir si es la última):
+                # se salta, los eventos posteriores siguen siendo legibles
+                continue
+            if evento["seq"] > desde:
+                yield evento
+
+
+class FlujoCambios:
+    """
+    Publica los cambios de un Inventario a suscriptores y, opcionalmente, a un archivo.
+
+      - _cola: queue.Queue acotada entre la mutación y el hilo despachador
+      - _secuencia: último número asignado (continúa el del archivo si ya existía)
+      - errores: cuántas veces falló un suscriptor (el error no detiene el flujo)
+    """
+
+    def __init__(self, inventario, ruta: Optional[str] = None, capacidad: int = CAPACIDAD_COLA):
+        self._inventario = inventario
+        self.ruta = ruta
+        self._cola: "queue.Queue[Any]" = queue.Queue(maxsize=capacidad)
+        self._candado = threading.Lock()
+        if ruta:
+            _reparar_final(ruta)
+        self._secuencia = _ultima_secuencia(ruta) if ruta else 0
+        self._suscriptores: List[Callable[[Dict], None]] = []
+        self.errores = 0
+        self._archivo = open(ruta, "a", encoding="utf-8") if ruta else None
+        self._hilo = threading.Thread(target=self._despachar, name="flujo-cambios", daemon=True)
+        self._hilo.start()
+        inventario.suscribir(self._al_cambiar)
+
+    @property
+    def secuencia(self) -> int:
+        """Número del último evento publicado."""
+        return self._secuencia
+
+    def suscribir(self, funcion: Callable[[Dict], None]) -> None:
+        """Registra una función que recibe cada evento (se llama desde el hilo despachador)."""
+        self._suscriptores.append(funcion)
+
+    def desuscribir(self, funcion: Callable[[Dict], None]) -> None:
+        self._suscriptores.remove(funcion)
+
+    def esperar(self) -> None:
+        """Bloquea hasta que todos los eventos encolados se hayan escrito y despachado."""
+        self._cola.join()
+
+    def cerrar(self) -> None:
+        """Deja de seguir el inventario, vacía la cola y detiene el hilo."""
+        self._inventario.desuscribir(self._al_cambiar)
+        self._cola.put(_FIN)
+        self._hilo.join()
+        if self._archivo is not None:
+            self._archivo.close()
+
+    def __enter__(self) -> "FlujoCambios":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ---------- lado de la mutación ----------
+    @staticmethod
+    def _evento(registro: Dict, anterior: Any) -> Dict:
+        op = registro["op"]
+        if op == "add":
+            producto = registro["producto"]
+            return {"op": "add", "id": producto["id"], "antes": None, "despues": producto}
+        if op == "del":
+            return {"op": "del", "id": registro["id"], "antes": anterior.to_dict(), "despues": None}
+        if op == "set":
+            return {"op": "set", "id": registro["id"], "campo": registro["campo"],
+                    "antes": anterior, "despues": registro["valor"]}
+        return {"op": op}
+
+    def _al_cambiar(self, registro: Dict, anterior: Any) -> None:
+        evento = self._evento(registro, anterior)
+        # el candado mantiene el orden de la cola igual al de las secuencias
+        with self._candado:
+            self._secuencia += 1
+            evento = {"seq": self._secuencia, "ts": time.time(), **evento}
+            self._cola.put(evento)
+
+    # ---------- hilo despachador ----------
+    def _despachar(self) -> None:
+        while True:
+            evento = self._cola.get()
+            if evento is _FIN:
+                self._cola.task_done()
+                return
+            lote = [evento]
+            # agrupamos lo que ya esté en cola para escribir y vaciar el búfer una sola vez
+            fin = False
+            while len(lote) < 1000:
+                try:
+                    siguiente = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is _FIN:
+                    fin = True
+                    break
+                lote.append(siguiente)
+            if self._archivo is not None:
+                self._archivo.write("".join(
+                    json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in lote))
+                self._archivo.flush()
+            for e in lote:
+                for funcion in list(self._suscriptores):
+                    try:
+                        funcion(e)
+                    except Exception:
+                        self.errores += 1
+            for _ in range(len(lote) + fin):
+                self._cola.task_done()
+            if fin:
+                return
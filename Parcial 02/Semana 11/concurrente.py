@@ -0,0 +1,278 @@
+"""
+Inventario (Semana 11) seguro para usar desde varios hilos.
+
+    inv = InventarioConcurrente("inventario.json", diario=True)
+    # cualquier hilo puede llamar a buscar_por_nombre, actualizar_nombre, etc.
+
+  - Las lecturas (buscar, listar, obtener, exportar, ...) corren en paralelo con un
+    candado de lectura/escritura; las mutaciones se serializan con el de escritura.
+    recorrer() conserva el candado de lectura hasta que se agota o se cierra el
+    generador, así que hay que consumirlo entero (o cerrarlo) en el mismo hilo.
+  - La persistencia ocurre fuera de la sección crítica: la mutación solo deja su
+    registro en una cola y, ya sin el candado de escritura, quien consigue el candado
+    de persistencia escribe a disco todo lo encolado (también lo de otros hilos), así
+    que con muchos escritores las escrituras a disco se agrupan solas.
+  - Una transacción toma el candado de escritura durante todo el bloque.
+  - Los índices que se construyen bajo demanda se construyen una sola vez aunque
+    varios lectores los pidan a la vez, y la caché de búsquedas (que los lectores
+    también modifican) tiene su propio candado.
+
+No se debe llamar a guardar(), cargar() ni importar() con el candado de escritura
+tomado (p. ej. dentro de una transacción): lanzan RuntimeError en lugar de bloquearse.
+"""
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from tarea11 import Inventario
+
+
+class CandadoLecturaEscritura:
+    """
+    Varios lectores o un único escritor. Da preferencia a los escritores que esperan
+    (un flujo constante de lecturas no los deja sin turno). Es reentrante: un hilo
+    puede anidar lecturas, anidar escrituras o leer mientras escribe; lo que no puede
+    es pedir escritura mientras solo tiene lectura.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritor: Optional[int] = None
+        self._escritores_esperando = 0
+        self._local = threading.local()
+
+    def escribiendo(self) -> bool:
+        """True si el hilo actual tiene el candado de escritura."""
+        return self._escritor == threading.get_ident()
+
+    @contextmanager
+    def lectura(self) -> Iterator[None]:
+        if self.escribiendo():
+            yield
+            return
+        anidadas = getattr(self._local, "lecturas", 0)
+        if anidadas == 0:
+            with self._condicion:
+                while self._escritor is not None or self._escritores_esperando:
+                    self._condicion.wait()
+                self._lectores += 1
+        self._local.lecturas = anidadas + 1
+        try:
+            yield
+        finally:
+            self._local.lecturas = anidadas
+            if anidadas == 0:
+                with self._condicion:
+                    self._lectores -= 1
+                    if self._lectores == 0:
+                        self._condicion.notify_all()
+
+    @contextmanager
+    def escritura(self) -> Iterator[None]:
+        if self.escribiendo():
+            yield
+            return
+        if getattr(self._local, "lecturas", 0):
+            raise RuntimeError("No se puede pedir escritura mientras se tiene el candado de lectura.")
+        yo = threading.get_ident()
+        with self._condicion:
+            self._escritores_esperando += 1
+            while self._escritor is not None or self._lectores:
+                self._condicion.wait()
+            self._escritores_esperando -= 1
+            self._escritor = yo
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._escritor = None
+                self._condicion.notify_all()
+
+
+def _lectura(metodo):
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _lectura_generador(metodo):
+    # el candado de lectura se mantiene mientras se consume el generador: hay que
+    # agotarlo o cerrarlo (close()) en el mismo hilo para no dejar bloqueados a los escritores
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado.lectura():
+            yield from metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _escritura(metodo):
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado.escritura():
+            resultado = metodo(self, *args, **kwargs)
+        self._persistir_encolados()
+        return resultado
+    return envoltura
+
+
+class InventarioConcurrente(Inventario):
+    """
+    Inventario con candado de lectura/escritura.
+
+      - _candado: CandadoLecturaEscritura sobre _productos y todos los índices
+      - _persistencia: RLock; solo quien lo tiene escribe a disco y notifica
+      - _encolados: List[(registro, valor_anterior)] mutados pero aún sin persistir
+        (se agregan con el candado de escritura y se retiran con el de lectura)
+      - _construccion: Lock para construir una sola vez los índices bajo demanda
+      - _candado_cache: Lock para la caché LRU, que se modifica también al leer
+
+    Orden de los candados: _persistencia -> _candado. Nadie pide _persistencia
+    teniendo ya el candado de escritura (por eso guardar(), cargar() e importar() lo rechazan).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._candado = CandadoLecturaEscritura()
+        self._persistencia = threading.RLock()
+        self._hilo_persistencia: Optional[int] = None
+        self._construccion = threading.Lock()
+        self._candado_cache = threading.Lock()
+        self._encolados: List[Tuple[Dict, Any]] = []
+        super().__init__(*args, **kwargs)
+
+    # ---------- lecturas en paralelo ----------
+    buscar_por_nombre = _lectura(Inventario.buscar_por_nombre)
+    buscar_aproximado = _lectura(Inventario.buscar_aproximado)
+    mostrar_todos = _lectura(Inventario.mostrar_todos)
+    listar = _lectura(Inventario.listar)
+    rango_ids = _lectura(Inventario.rango_ids)
+    filtrar_por_precio = _lectura(Inventario.filtrar_por_precio)
+    filtrar_por_cantidad = _lectura(Inventario.filtrar_por_cantidad)
+    obtener_producto = _lectura(Inventario.obtener_producto)
+    contar = _lectura(Inventario.contar)
+    # la exportación completa corre con el candado de lectura; recorrer() lo mantiene
+    # hasta que el generador se agota o se cierra
+    exportar = _lectura(Inventario.exportar)
+    recorrer = _lectura_generador(Inventario.recorrer)
+
+    # ---------- escrituras serializadas ----------
+    añadir_producto = _escritura(Inventario.añadir_producto)
+    eliminar_producto = _escritura(Inventario.eliminar_producto)
+    actualizar_cantidad = _escritura(Inventario.actualizar_cantidad)
+    actualizar_precio = _escritura(Inventario.actualizar_precio)
+    actualizar_nombre = _escritura(Inventario.actualizar_nombre)
+
+    @contextmanager
+    def transaccion(self) -> Iterator["InventarioConcurrente"]:
+        """Como Inventario.transaccion, con el candado de escritura durante todo el bloque."""
+        with self._candado.escritura():
+            with super().transaccion():
+                yield self
+        self._persistir_encolados()
+
+    # ---------- operaciones que reemplazan todo el contenido ----------
+    def importar(self, *args, **kwargs) -> Tuple[int, int]:
+        self._exigir_sin_escritura("importar")
+        with self._persistiendo(), self._candado.escritura():
+            return super().importar(*args, **kwargs)
+
+    def cargar(self, ruta: Optional[str] = None, validar: Optional[bool] = None) -> None:
+        self._exigir_sin_escritura("cargar")
+        with self._persistiendo(), self._candado.escritura():
+            super().cargar(ruta, validar)
+
+    def guardar(self, ruta: Optional[str] = None) -> None:
+        self._exigir_sin_escritura("guardar")
+        with self._persistiendo():
+            super().guardar(ruta)
+
+    # ---------- persistencia fuera de la sección crítica ----------
+    def _exigir_sin_escritura(self, operacion: str) -> None:
+        """
+        Estas operaciones toman _persistencia: pedirlo con el candado de escritura ya
+        tomado invertiría el orden _persistencia -> _candado y podría bloquearse.
+        """
+        if self._candado.escribiendo() and self._hilo_persistencia != threading.get_ident():
+            raise RuntimeError(f"{operacion}() no puede llamarse con el candado de escritura tomado "
+                               "(p. ej. dentro de una transacción).")
+
+    @contextmanager
+    def _persistiendo(self) -> Iterator[None]:
+        with self._persistencia:
+            previo = self._hilo_persistencia
+            self._hilo_persistencia = threading.get_ident()
+            try:
+                yield
+            finally:
+                self._hilo_persistencia = previo
+
+    def _instantanea(self) -> Dict[str, Dict]:
+        # con lectores en paralelo; solo se excluye a los escritores mientras se copia
+        with self._candado.lectura():
+            return super()._instantanea()
+
+    def _persistir(self, registro: Dict, anterior: Any = None) -> None:
+        if self._nivel_transaccion:
+            super()._persistir(registro, anterior)
+        else:
+            self._encolados.append((registro, anterior))
+
+    def _confirmar_transaccion(self) -> None:
+        self._encolados.extend(self._deshacer)
+        self._pendientes = []
+        self._deshacer = []
+
+    def _persistir_encolados(self) -> None:
+        """Escribe a disco y notifica todo lo encolado, en el orden en que se aplicó."""
+        if self._candado.escribiendo():
+            # transacción exterior todavía abierta: persistirá al cerrarse
+            return
+        with self._persistiendo():
+            with self._candado.lectura():
+                lote, self._encolados = self._encolados, []
+            if not lote:
+                # otro hilo ya persistió nuestros cambios junto con los suyos
+                return
+            try:
+                if self.diario:
+                    self._escribir_diario([registro for registro, _ in lote])
+                else:
+                    super().guardar()
+            except BaseException:
+                # se devuelven a la cola para el próximo intento
+                with self._candado.lectura():
+                    self._encolados[:0] = lote
+                raise
+            self._notificar(lote)
+
+    # ---------- índices bajo demanda: una sola construcción ----------
+    def _construir_trigramas(self) -> None:
+        with self._construccion:
+            if not self._trigramas_construidos:
+                super()._construir_trigramas()
+
+    def _construir_ordenes(self) -> None:
+        with self._construccion:
+            if not self._ordenes_construidos:
+                super()._construir_ordenes()
+
+    def _construir_difuso(self) -> None:
+        with self._construccion:
+            if not self._difuso_construido:
+                super()._construir_difuso()
+
+    # ---------- caché de búsquedas compartida entre lectores ----------
+    def _leer_cache(self, clave: str) -> Optional[Tuple[str, ...]]:
+        with self._candado_cache:
+            return super()._leer_cache(clave)
+
+    def _escribir_cache(self, clave: str, ids: Tuple[str, ...]) -> None:
+        with self._candado_cache:
+            super()._escribir_cache(clave, ids)
+
+    def estadisticas_cache(self) -> Dict[str, int]:
+        with self._candado_cache:
+            return super().estadisticas_cache()
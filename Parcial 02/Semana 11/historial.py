@@ -0,0 +1,215 @@
+"""
+Historial de precio y stock por producto del Inventario (Semana 11).
+
+actualizar_precio y actualizar_cantidad sobrescriben el valor; HistorialInventario
+se suscribe al inventario y guarda cada cambio en una serie temporal por producto
+y campo, con almacenamiento compacto:
+
+  - marcas de tiempo en milisegundos y valores como enteros (el precio en
+    diezmilésimas), codificados como diferencias respecto al evento anterior en
+    un array('i'): 8 bytes por cambio;
+  - cada BLOQUE eventos se guarda un punto de control absoluto (tiempo, valor),
+    así "valor en T" y "cambios entre T1 y T2" hacen búsqueda binaria sobre los
+    puntos de control y decodifican como mucho un bloque para llegar al inicio.
+
+Los productos eliminados conservan su historial. Si el reloj retrocede, el evento
+se registra con el tiempo del anterior (las series nunca van hacia atrás).
+
+Uso:
+    historial = HistorialInventario(inv)
+    inv.actualizar_precio("001", 0.45)
+    historial.valor_en("001", "precio", time.time())
+    historial.cambios_entre("001", "cantidad", inicio, fin)
+"""
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+BLOQUE = 64  # eventos entre dos puntos de control absolutos
+ESCALAS = {"cantidad": 1, "precio": 10_000}  # el precio se guarda en diezmilésimas
+_MIN_I32, _MAX_I32 = -2 ** 31, 2 ** 31 - 1
+
+Valor = Union[int, float]
+
+
+class Serie:
+    """
+    Serie temporal de un campo de un producto.
+
+      - _marcas / _bases: array('q') con tiempo (ms) y valor absolutos al inicio de cada bloque
+      - _inicios: array('I') con la posición del primer evento de cada bloque
+      - _datos: array('i') con pares (dt, dv) por evento; el primero de cada bloque es (0, 0)
+    """
+
+    __slots__ = ("_marcas", "_bases", "_inicios", "_datos", "_n", "_ultimo_t", "_ultimo_v")
+
+    def __init__(self):
+        self._marcas = array("q")
+        self._bases = array("q")
+        self._inicios = array("I")
+        self._datos = array("i")
+        self._n = 0
+        self._ultimo_t = 0
+        self._ultimo_v = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def añadir(self, t: int, v: int) -> None:
+        t = max(t, self._ultimo_t)
+        dt, dv = t - self._ultimo_t, v - self._ultimo_v
+        lleno = self._n - (self._inicios[-1] if self._inicios else 0) >= BLOQUE
+        if not self._n or lleno or dt > _MAX_I32 or not _MIN_I32 <= dv <= _MAX_I32:
+            # nuevo bloque con punto de control absoluto
+            self._marcas.append(t)
+            self._bases.append(v)
+            self._inicios.append(self._n)
+            dt = dv = 0
+        self._datos.append(dt)
+        self._datos.append(dv)
+        self._n += 1
+        self._ultimo_t, self._ultimo_v = t, v
+
+    def _recorrer(self, bloque: int) -> Iterator[Tuple[int, int]]:
+        """(t, v) de cada evento desde el inicio de `bloque` hasta el final de la serie."""
+        datos = self._datos
+        for k in range(bloque, len(self._inicios)):
+            t, v = self._marcas[k], self._bases[k]
+            fin = self._inicios[k + 1] if k + 1 < len(self._inicios) else self._n
+            yield t, v
+            for i in range(self._inicios[k] + 1, fin):
+                t += datos[2 * i]
+                v += datos[2 * i + 1]
+                yield t, v
+
+    def valor_en(self, t: int) -> Optional[int]:
+        """Último valor registrado en un instante <= t (None si la serie empieza después)."""
+        bloque = bisect_right(self._marcas, t) - 1
+        if bloque < 0:
+            return None
+        # el bloque siguiente empieza después de t: como mucho se decodifica un bloque
+        valor = None
+        for tiempo, v in self._recorrer(bloque):
+            if tiempo > t:
+                break
+            valor = v
+        return valor
+
+    def entre(self, t1: int, t2: int) -> List[Tuple[int, int]]:
+        """Eventos con t1 <= t <= t2."""
+        # el primer evento >= t1 está en el primer bloque que empieza en >= t1 o en el anterior
+        bloque = max(0, bisect_left(self._marcas, t1) - 1)
+        resultado = []
+        for t, v in self._recorrer(bloque):
+            if t > t2:
+                break
+            if t >= t1:
+                resultado.append((t, v))
+        return resultado
+
+    def bytes(self) -> int:
+        return sys.getsizeof(self) + sum(sys.getsizeof(a) for a in
+                                         (self._marcas, self._bases, self._inicios, self._datos))
+
+
+class HistorialInventario:
+    """
+    Series de cantidad y precio de cada producto, alimentadas por Inventario.suscribir().
+
+      - _series: Dict[(id, campo), Serie]
+      - _reloj: función que devuelve el instante actual en segundos (time.time por defecto)
+    """
+
+    def __init__(self, inventario=None, reloj: Callable[[], float] = time.time):
+        self._inventario = inventario
+        self._reloj = reloj
+        self._series: Dict[Tuple[str, str], Serie] = {}
+        if inventario is not None:
+            self._registrar_actuales()
+            inventario.suscribir(self._al_cambiar)
+
+    def cerrar(self) -> None:
+        """Deja de seguir los cambios del inventario (el historial se conserva)."""
+        if self._inventario is not None:
+            self._inventario.desuscribir(self._al_cambiar)
+
+    # ---------- registro ----------
+    def registrar(self, id_producto: str, campo: str, valor: Valor, t: Optional[float] = None) -> None:
+        """Añade un valor a la serie; t en segundos (por defecto, ahora)."""
+        escala = ESCALAS.get(campo)
+        if escala is None:
+            raise ValueError(f"Campo desconocido: '{campo}' (usa cantidad o precio).")
+        serie = self._series.get((id_producto, campo))
+        if serie is None:
+            serie = self._series[(id_producto, campo)] = Serie()
+        t = self._reloj() if t is None else t
+        serie.añadir(round(t * 1000), round(valor * escala))
+
+    def _registrar_actuales(self) -> None:
+        """Registra los valores actuales que difieren del último conocido (alta inicial y reset)."""
+        ahora = self._reloj()
+        for producto in self._inventario._productos.values():
+            for campo in ESCALAS:
+                valor = getattr(producto, campo)
+                serie = self._series.get((producto.id, campo))
+                if serie is None or serie._ultimo_v != round(valor * ESCALAS[campo]):
+                    self.registrar(producto.id, campo, valor, ahora)
+
+    def _al_cambiar(self, registro: Dict, anterior) -> None:
+        op = registro["op"]
+        if op == "add":
+            d = registro["producto"]
+            ahora = self._reloj()
+            self.registrar(d["id"], "cantidad", d["cantidad"], ahora)
+            self.registrar(d["id"], "precio", d["precio"], ahora)
+        elif op == "set" and registro["campo"] in ESCALAS:
+            self.registrar(registro["id"], registro["campo"], registro["valor"])
+        elif op == "reset":
+            self._registrar_actuales()
+
+    def importar_cambios(self, ruta: str, desde: int = 0) -> int:
+        """
+        Reconstruye el historial desde un archivo de cambios de FlujoCambios
+        (usa la marca "ts" de cada evento). Devuelve cuántos eventos leyó.
+        """
+        from cambios import leer_cambios
+
+        leidos = 0
+        for evento in leer_cambios(ruta, desde):
+            leidos += 1
+            if evento["op"] == "add":
+                for campo in ESCALAS:
+                    self.registrar(evento["id"], campo, evento["despues"][campo], evento["ts"])
+            elif evento["op"] == "set" and evento["campo"] in ESCALAS:
+                self.registrar(evento["id"], evento["campo"], evento["despues"], evento["ts"])
+        return leidos
+
+    # ---------- consultas ----------
+    @staticmethod
+    def _valor(campo: str, v: int) -> Valor:
+        return v if campo == "cantidad" else v / ESCALAS[campo]
+
+    def valor_en(self, id_producto: str, campo: str, t: float) -> Optional[Valor]:
+        """Valor del campo vigente en el instante t (segundos), o None si aún no existía."""
+        serie = self._series.get((id_producto, campo))
+        if serie is None:
+            return None
+        v = serie.valor_en(round(t * 1000))
+        return None if v is None else self._valor(campo, v)
+
+    def cambios_entre(self, id_producto: str, campo: str, t1: float, t2: float) -> List[Tuple[float, Valor]]:
+        """Lista de (instante en segundos, valor) con t1 <= instante <= t2."""
+        serie = self._series.get((id_producto, campo))
+        if serie is None:
+            return []
+        return [(t / 1000, self._valor(campo, v)) for t, v in serie.entre(round(t1 * 1000), round(t2 * 1000))]
+
+    def eventos(self) -> int:
+        return sum(len(serie) for serie in self._series.values())
+
+    def bytes_usados(self) -> int:
+        """Memoria aproximada: series, sus arrays y el diccionario que las indexa."""
+        return sys.getsizeof(self._series) + sum(
+            sys.getsizeof(clave) + serie.bytes() for clave, serie in self._series.items())
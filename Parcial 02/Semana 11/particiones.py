@@ -0,0 +1,255 @@
+"""
+Inventario (Semana 11) repartido en N particiones, cada una en su propio proceso.
+
+Cada partición es un Inventario normal con su propio archivo
+("inventario.p0.json", "inventario.p1.json", ...) que corre en un proceso aparte.
+El coordinador reparte los productos por crc32(id) % N:
+
+  - las operaciones por ID (añadir, eliminar, actualizar_*, obtener_producto)
+    van solo a la partición dueña;
+  - buscar_por_nombre, mostrar_todos, listar y contar se envían a todas a la vez
+    (cada una trabaja en paralelo) y el coordinador mezcla los resultados, que ya
+    vienen ordenados por ID;
+  - ejecutar_lote() manda muchas operaciones por ID sin esperar cada respuesta,
+    así las particiones procesan su parte al mismo tiempo.
+
+No hay transacciones entre particiones: añadir_productos() agrupa por partición y
+cada grupo se aplica en una transacción local.
+
+Uso:
+    with InventarioParticionado("inventario.json", particiones=4) as inv:
+        inv.añadir_producto(Producto("001", "Tornillo", 10, 0.5))
+        inv.buscar_por_nombre("torn")
+"""
+import heapq
+import itertools
+import multiprocessing
+import os
+import pickle
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from tarea11 import DEFAULT_FILE, Inventario, Producto
+
+VENTANA = 32  # peticiones sin respuesta por partición en ejecutar_lote()
+
+
+def archivo_particion(archivo: str, indice: int) -> str:
+    """inventario.json -> inventario.p<indice>.json"""
+    base, extension = os.path.splitext(archivo)
+    return f"{base}.p{indice}{extension}"
+
+
+def _añadir_lote(inv: Inventario, productos: List[Producto]) -> int:
+    with inv.transaccion():
+        for producto in productos:
+            inv.añadir_producto(producto)
+    return len(productos)
+
+
+def _buscar(inv: Inventario, texto: str) -> Tuple[bool, List[Producto]]:
+    """buscar_por_nombre indicando si hubo coincidencia exacta (entonces no se buscan subcadenas)."""
+    return inv._normalizar(texto) in inv._indice_nombre, inv.buscar_por_nombre(texto)
+
+
+# operaciones propias del proceso de partición, además de los métodos de Inventario
+_OPERACIONES_LOCALES = {"añadir_lote": _añadir_lote, "buscar": _buscar}
+
+
+def _responder(conexion, ok: bool, resultado: Any) -> None:
+    try:
+        conexion.send((ok, resultado))
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        # el resultado o la excepción no se pueden enviar entre procesos
+        conexion.send((False, RuntimeError(f"Respuesta no serializable: {e!r}")))
+
+
+def _servir_particion(conexion, archivo: str, opciones: Dict) -> None:
+    """Bucle del proceso hijo: recibe (operación, argumentos) y responde (ok, resultado)."""
+    inv = Inventario(archivo, **opciones)
+    while True:
+        mensaje = conexion.recv()
+        if mensaje is None:
+            break
+        operacion, args = mensaje
+        try:
+            if operacion in _OPERACIONES_LOCALES:
+                resultado = _OPERACIONES_LOCALES[operacion](inv, *args)
+            else:
+                resultado = getattr(inv, operacion)(*args)
+        except Exception as e:
+            # cualquier error se devuelve al coordinador: el proceso sigue atendiendo
+            _responder(conexion, False, e)
+        else:
+            _responder(conexion, True, resultado)
+    conexion.close()
+
+
+class InventarioParticionado:
+    """
+    Coordinador con la misma API de lectura/escritura que Inventario.
+
+      - _conexiones: un extremo de Pipe por partición
+      - _procesos: los procesos hijos (uno por partición)
+
+    No es seguro usar un mismo coordinador desde varios hilos a la vez.
+    """
+
+    def __init__(self, archivo: str = DEFAULT_FILE, particiones: int = 4, **opciones):
+        if particiones < 1:
+            raise ValueError("Se necesita al menos una partición.")
+        self.ARCHIVO = archivo
+        self.particiones = particiones
+        self._conexiones = []
+        self._procesos = []
+        for i in range(particiones):
+            propia, hija = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_servir_particion, args=(hija, archivo_particion(archivo, i), opciones),
+                name=f"inventario-p{i}", daemon=True)
+            proceso.start()
+            hija.close()
+            self._conexiones.append(propia)
+            self._procesos.append(proceso)
+
+    def cerrar(self) -> None:
+        for indice in range(self.particiones):
+            self._enviar(indice, None)
+        for proceso in self._procesos:
+            proceso.join()
+        for conexion in self._conexiones:
+            conexion.close()
+
+    def __enter__(self) -> "InventarioParticionado":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ---------- enrutado ----------
+    def particion_de(self, id_producto: str) -> int:
+        # crc32 y no hash(): debe dar lo mismo en todos los procesos y ejecuciones
+        return zlib.crc32(id_producto.encode("utf-8")) % self.particiones
+
+    def _enviar(self, indice: int, mensaje: Any) -> None:
+        try:
+            self._conexiones[indice].send(mensaje)
+        except (BrokenPipeError, ConnectionResetError):
+            # el proceso terminó: lo informa _recibir() al esperar la respuesta
+            pass
+
+    def _recibir(self, indice: int) -> Tuple[bool, Any]:
+        """(ok, resultado) de la partición; si su proceso murió, (False, RuntimeError) sin bloquearse."""
+        try:
+            return self._conexiones[indice].recv()
+        except (EOFError, OSError):
+            proceso = self._procesos[indice]
+            proceso.join(timeout=1)
+            return False, RuntimeError(f"La partición {indice} terminó inesperadamente "
+                                       f"(código de salida {proceso.exitcode}).")
+
+    def _respuesta(self, indice: int) -> Any:
+        ok, resultado = self._recibir(indice)
+        if not ok:
+            raise resultado
+        return resultado
+
+    def _llamar(self, indice: int, operacion: str, *args) -> Any:
+        self._enviar(indice, (operacion, args))
+        return self._respuesta(indice)
+
+    def _difundir(self, operacion: str, *args) -> List[Any]:
+        """Envía la operación a todas las particiones y luego recoge las respuestas."""
+        for indice in range(self.particiones):
+            self._enviar(indice, (operacion, args))
+        # se leen todas aunque alguna falle, para no dejar respuestas en la tubería
+        respuestas = [self._recibir(indice) for indice in range(self.particiones)]
+        for ok, resultado in respuestas:
+            if not ok:
+                raise resultado
+        return [resultado for _, resultado in respuestas]
+
+    # ---------- operaciones por ID ----------
+    def añadir_producto(self, producto: Producto) -> None:
+        self._llamar(self.particion_de(producto.id), "añadir_producto", producto)
+
+    def eliminar_producto(self, id_producto: str) -> None:
+        self._llamar(self.particion_de(id_producto), "eliminar_producto", id_producto)
+
+    def actualizar_cantidad(self, id_producto: str, nueva_cantidad: int) -> None:
+        self._llamar(self.particion_de(id_producto), "actualizar_cantidad", id_producto, nueva_cantidad)
+
+    def actualizar_precio(self, id_producto: str, nuevo_precio: float) -> None:
+        self._llamar(self.particion_de(id_producto), "actualizar_precio", id_producto, nuevo_precio)
+
+    def actualizar_nombre(self, id_producto: str, nuevo_nombre: str) -> None:
+        self._llamar(self.particion_de(id_producto), "actualizar_nombre", id_producto, nuevo_nombre)
+
+    def obtener_producto(self, id_producto: str) -> Optional[Producto]:
+        return self._llamar(self.particion_de(id_producto), "obtener_producto", id_producto)
+
+    def añadir_productos(self, productos: Iterable[Producto]) -> int:
+        """Alta masiva: un lote por partición, todas en paralelo."""
+        grupos: List[List[Producto]] = [[] for _ in range(self.particiones)]
+        for producto in productos:
+            grupos[self.particion_de(producto.id)].append(producto)
+        for indice, grupo in enumerate(grupos):
+            self._enviar(indice, ("añadir_lote", (grupo,)))
+        respuestas = [self._recibir(indice) for indice in range(self.particiones)]
+        for ok, resultado in respuestas:
+            if not ok:
+                raise resultado
+        return sum(resultado for _, resultado in respuestas)
+
+    def ejecutar_lote(self, operaciones: Sequence[Tuple[str, str, Tuple]]) -> List[Any]:
+        """
+        Ejecuta [(operación, id, argumentos_extra), ...] p. ej. ("actualizar_cantidad", "001", (5,))
+        dejando hasta VENTANA peticiones en vuelo por partición. Devuelve los resultados en
+        el mismo orden; una operación que falla deja su excepción en lugar del resultado.
+        """
+        resultados: List[Any] = [None] * len(operaciones)
+        en_vuelo: List[List[int]] = [[] for _ in range(self.particiones)]
+
+        def recoger(indice: int) -> None:
+            posicion = en_vuelo[indice].pop(0)
+            ok, resultado = self._recibir(indice)
+            resultados[posicion] = resultado
+
+        for posicion, (operacion, id_producto, extra) in enumerate(operaciones):
+            indice = self.particion_de(id_producto)
+            if len(en_vuelo[indice]) >= VENTANA:
+                recoger(indice)
+            self._enviar(indice, (operacion, (id_producto, *extra)))
+            en_vuelo[indice].append(posicion)
+        for indice in range(self.particiones):
+            while en_vuelo[indice]:
+                recoger(indice)
+        return resultados
+
+    # ---------- operaciones sobre todas las particiones ----------
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        partes = self._difundir("buscar", texto)
+        # igual que Inventario: si algún nombre coincide exactamente, solo cuentan esas coincidencias
+        if any(exacta for exacta, _ in partes):
+            partes = [(exacta, productos) for exacta, productos in partes if exacta]
+        return list(heapq.merge(*(productos for _, productos in partes), key=lambda p: p.id))
+
+    def mostrar_todos(self) -> List[Tuple[str, str, int, float]]:
+        return list(heapq.merge(*self._difundir("mostrar_todos")))
+
+    def listar(self, desde: Optional[str] = None, limite: int = 50) -> List[Tuple[str, str, int, float]]:
+        # cada partición devuelve su propia página; la global son las `limite` primeras de la mezcla
+        partes = self._difundir("listar", desde, limite)
+        return list(itertools.islice(heapq.merge(*partes), limite))
+
+    def contar(self) -> int:
+        return sum(self._difundir("contar"))
+
+    def guardar(self) -> None:
+        self._difundir("guardar")
+
+    def compactar(self) -> None:
+        self._difundir("compactar")
+
+    def contar_por_particion(self) -> List[int]:
+        return self._difundir("contar")
@@ -0,0 +1,155 @@
+"""
+Puntos de reorden vectorizados sobre el historial de stock del Inventario (Semana 11).
+
+Parte de una matriz de stock diario (productos x días) y calcula para todo el
+catálogo a la vez, con NumPy:
+
+  - demanda diaria: lo que baja el stock de un día a otro (las subidas son reposiciones
+    y cuentan como demanda 0, así que un día con venta y reposición la subestima);
+  - demanda media y desviación en los últimos `ventana` días;
+  - stock de seguridad = z * desviación * sqrt(días de entrega), con z según el nivel de servicio;
+  - punto de reorden = demanda media * días de entrega + stock de seguridad;
+  - días de cobertura y cantidad sugerida para volver a cubrir entrega + revisión.
+
+La matriz puede venir de HistorialInventario (matriz_desde_historial) o del
+generador sintético (generar_stock_sintetico).
+
+Uso:
+    ids, stock, entrega = generar_stock_sintetico(100_000, 365)
+    resultado = calcular_reposicion(stock, entrega)
+    for fila in lista_reposicion(resultado, ids, limite=20):
+        print(fila)
+"""
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+VENTANA_DEMANDA = 30     # días usados para la demanda media y su desviación
+NIVEL_SERVICIO = 0.95    # probabilidad de no quedarse sin stock durante la entrega
+DIAS_REVISION = 7        # cada cuántos días se revisa el stock (para la cantidad sugerida)
+SEGUNDOS_DIA = 86_400
+
+
+def media_movil(demanda: np.ndarray, ventana: int) -> np.ndarray:
+    """Media móvil por fila (productos x días) con sumas acumuladas: una columna por día desde `ventana`."""
+    acumulada = np.cumsum(demanda, axis=1, dtype=np.float64)
+    acumulada = np.concatenate([np.zeros((demanda.shape[0], 1)), acumulada], axis=1)
+    return (acumulada[:, ventana:] - acumulada[:, :-ventana]) / ventana
+
+
+def demanda_diaria(stock: np.ndarray) -> np.ndarray:
+    """Unidades que salen cada día: caída del stock respecto al día anterior (0 si sube)."""
+    return np.maximum(-np.diff(stock, axis=1), 0).astype(np.float32)
+
+
+def calcular_reposicion(stock: np.ndarray, dias_entrega: Union[np.ndarray, float] = 7,
+                        ventana: int = VENTANA_DEMANDA, nivel_servicio: float = NIVEL_SERVICIO,
+                        dias_revision: int = DIAS_REVISION) -> Dict[str, np.ndarray]:
+    """
+    stock: matriz (productos x días) con el stock al cierre de cada día.
+    dias_entrega: escalar o vector por producto.
+    Devuelve un dict de vectores (uno por producto): stock, demanda_media, desviacion,
+    stock_seguridad, punto_reorden, cobertura_dias y cantidad_sugerida.
+    """
+    if stock.ndim != 2 or stock.shape[1] < 2:
+        raise ValueError("stock debe ser una matriz productos x días con al menos 2 días.")
+    ventana = min(ventana, stock.shape[1] - 1)
+    # solo hacen falta los últimos `ventana` + 1 días para la demanda reciente
+    demanda = demanda_diaria(stock[:, -(ventana + 1):])
+    media = demanda.mean(axis=1, dtype=np.float64)
+    desviacion = demanda.std(axis=1, dtype=np.float64)
+    entrega = np.broadcast_to(np.asarray(dias_entrega, dtype=np.float64), media.shape)
+
+    z = NormalDist().inv_cdf(nivel_servicio)
+    seguridad = z * desviacion * np.sqrt(entrega)
+    punto_reorden = media * entrega + seguridad
+    actual = stock[:, -1].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cobertura = np.where(media > 0, actual / media, np.inf)
+    objetivo = media * (entrega + dias_revision) + seguridad
+    sugerida = np.where(actual <= punto_reorden, np.ceil(np.maximum(objetivo - actual, 0)), 0)
+    return {
+        "stock": actual,
+        "demanda_media": media,
+        "desviacion": desviacion,
+        "stock_seguridad": seguridad,
+        "punto_reorden": punto_reorden,
+        "cobertura_dias": cobertura,
+        "cantidad_sugerida": sugerida,
+    }
+
+
+def lista_reposicion(resultado: Dict[str, np.ndarray], ids: Sequence[str],
+                     limite: int = 50) -> List[Tuple[str, int, float, int, float]]:
+    """
+    Productos en o bajo su punto de reorden, del más urgente (menos días de
+    cobertura; a igual cobertura, mayor déficit frente al punto de reorden) al menos
+    urgente: (id, stock, punto_reorden, cantidad_sugerida, cobertura_dias).
+    """
+    pendientes = np.flatnonzero(resultado["cantidad_sugerida"] > 0)
+    cobertura = resultado["cobertura_dias"][pendientes]
+    deficit = resultado["punto_reorden"][pendientes] - resultado["stock"][pendientes]
+    if limite < len(pendientes):
+        # solo se ordenan los más urgentes: todos los que empatan con el último puesto
+        corte = np.partition(cobertura, limite - 1)[limite - 1]
+        candidatos = np.flatnonzero(cobertura <= corte)
+    else:
+        candidatos = np.arange(len(pendientes))
+    orden = np.lexsort((-deficit[candidatos], cobertura[candidatos]))[:limite]
+    orden = pendientes[candidatos[orden]]
+    return [(ids[i], int(resultado["stock"][i]), float(resultado["punto_reorden"][i]),
+             int(resultado["cantidad_sugerida"][i]), float(resultado["cobertura_dias"][i]))
+            for i in orden]
+
+
+# -------------------------
+# Origen de los datos
+# -------------------------
+def matriz_desde_historial(historial, ids: Sequence[str], inicio: float, dias: int) -> np.ndarray:
+    """
+    Stock al cierre de cada día (inicio + k días, k = 1..dias) a partir de un
+    HistorialInventario. Un producto sin datos aún ese día queda en 0.
+    """
+    cierres = np.round((inicio + SEGUNDOS_DIA * np.arange(1, dias + 1)) * 1000).astype(np.int64)
+    matriz = np.zeros((len(ids), dias), dtype=np.int32)
+    for fila, pid in enumerate(ids):
+        serie = historial._series.get((pid, "cantidad"))
+        if serie is None or not len(serie):
+            continue
+        eventos = np.fromiter((x for tv in serie._recorrer(0) for x in tv), dtype=np.int64,
+                              count=2 * len(serie)).reshape(-1, 2)
+        # último evento con t <= cierre de cada día
+        posiciones = np.searchsorted(eventos[:, 0], cierres, side="right") - 1
+        validos = posiciones >= 0
+        matriz[fila, validos] = eventos[posiciones[validos], 1]
+    return matriz
+
+
+def generar_stock_sintetico(productos: int, dias: int, semilla: int = 0
+                            ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Simula ventas Poisson (con demanda base log-normal y estacionalidad semanal) y
+    reposiciones al cruzar un mínimo. Devuelve (ids, stock productos x días, días de entrega).
+    """
+    rng = np.random.default_rng(semilla)
+    base = rng.lognormal(mean=1.0, sigma=1.0, size=productos)
+    entrega = rng.integers(2, 15, size=productos)
+    minimo = np.ceil(base * entrega * 1.2)
+    maximo = minimo + np.ceil(base * 30)
+    semana = 1 + 0.3 * np.sin(2 * np.pi * np.arange(dias) / 7)
+
+    stock = np.empty((productos, dias), dtype=np.int32)
+    actual = maximo.copy()
+    pedido_llega = np.full(productos, -1)
+    for dia in range(dias):
+        # los días recorren la matriz; cada día se procesan todos los productos a la vez
+        ventas = rng.poisson(base * semana[dia])
+        actual = np.maximum(actual - ventas, 0)
+        llega = pedido_llega == dia
+        actual[llega] = maximo[llega]
+        pedir = (actual < minimo) & (pedido_llega < dia)
+        pedido_llega[pedir] = dia + entrega[pedir]
+        stock[:, dia] = actual
+    ids = [f"{i:07d}" for i in range(productos)]
+    return ids, stock, entrega
@@ -0,0 +1,296 @@
+"""
+Servidor asyncio para el Inventario (Semana 11) y cliente de prueba de carga.
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea.
+
+    -> {"seq": 1, "op": "buscar", "texto": "tornillo"}
+    <- {"seq": 1, "ok": true, "resultado": [{"id": "001", "nombre": ..., ...}]}
+    -> {"seq": 2, "op": "eliminar", "id": "999"}
+    <- {"seq": 2, "ok": false, "error": "Producto con ID '999' no encontrado."}
+
+"seq" es opcional y se devuelve tal cual para emparejar respuestas.
+
+Operaciones de lectura: obtener(id), buscar(texto), listar(desde, limite),
+mostrar_todos(), contar(). De escritura: añadir(producto), eliminar(id),
+actualizar_cantidad(id, valor), actualizar_precio(id, valor), actualizar_nombre(id, valor).
+
+Las escrituras se encolan; un confirmador las aplica en grupo cada `intervalo` segundos
+dentro de una transacción (una sola escritura a disco para todas) y solo entonces
+responde a esos clientes. Si la persistencia falla, la transacción se revierte y todo
+el grupo recibe el error. Las lecturas solo ven lo confirmado: mientras el grupo se
+junta todavía no se ha aplicado, y mientras se escribe a disco (en un hilo aparte) las
+lecturas esperan a que termine.
+
+Uso:
+    python servidor.py servir [--host 127.0.0.1] [--puerto 8765] [--unix RUTA] [--diario]
+    python servidor.py carga [--clientes 50] [--peticiones 200] [--escrituras 0.1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tarea11 import DEFAULT_FILE, Inventario, Producto
+
+INTERVALO_COMMIT = 0.01  # ventana (s) en la que se agrupan escrituras antes de persistir
+
+
+class ServidorInventario:
+    """Envuelve un Inventario y lo sirve por TCP o socket Unix."""
+
+    def __init__(self, inventario: Inventario, intervalo: float = INTERVALO_COMMIT):
+        self.inventario = inventario
+        self.intervalo = intervalo
+        self._escritura = asyncio.Lock()
+        # escrituras encoladas para el próximo grupo: (operación, petición, futuro de la respuesta)
+        self._pendientes: List[Tuple[Callable[[Dict], Any], Dict, asyncio.Future]] = []
+        self._confirmando: Optional[asyncio.Future] = None  # grupo aplicado y escribiéndose a disco
+        self._hay_pendientes = asyncio.Event()
+        self._confirmador: Optional[asyncio.Task] = None
+        inv = inventario
+        self._lecturas: Dict[str, Callable[[Dict], Any]] = {
+            "obtener": lambda p: self._producto(inv.obtener_producto(p["id"])),
+            "buscar": lambda p: [pr.to_dict() for pr in inv.buscar_por_nombre(p["texto"])],
+            "listar": lambda p: inv.listar(p.get("desde"), p.get("limite", 50)),
+            "mostrar_todos": lambda p: inv.mostrar_todos(),
+            "contar": lambda p: inv.contar(),
+        }
+        self._escrituras: Dict[str, Callable[[Dict], Any]] = {
+            "añadir": lambda p: inv.añadir_producto(Producto.from_dict(p["producto"])),
+            "eliminar": lambda p: inv.eliminar_producto(p["id"]),
+            "actualizar_cantidad": lambda p: inv.actualizar_cantidad(p["id"], p["valor"]),
+            "actualizar_precio": lambda p: inv.actualizar_precio(p["id"], p["valor"]),
+            "actualizar_nombre": lambda p: inv.actualizar_nombre(p["id"], p["valor"]),
+        }
+
+    @staticmethod
+    def _producto(prod: Optional[Producto]) -> Optional[Dict]:
+        return prod.to_dict() if prod is not None else None
+
+    # ---------- ciclo de vida ----------
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8765,
+                      ruta_unix: Optional[str] = None) -> asyncio.AbstractServer:
+        self._confirmador = asyncio.create_task(self._confirmar_en_grupo())
+        if ruta_unix:
+            return await asyncio.start_unix_server(self._atender, path=ruta_unix)
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    async def detener(self) -> None:
+        """Confirma lo pendiente y detiene el confirmador."""
+        if self._confirmador is not None:
+            self._confirmador.cancel()
+            try:
+                await self._confirmador
+            except asyncio.CancelledError:
+                pass
+        await self._confirmar()
+
+    # ---------- peticiones ----------
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # línea más larga que el límite del StreamReader: se responde el error y
+                    # se cierra la conexión (el resto de la línea ya no se puede separar)
+                    error = {"seq": None, "ok": False, "error": "Petición demasiado larga."}
+                    escritor.write(json.dumps(error, ensure_ascii=False).encode("utf-8") + b"\n")
+                    await escritor.drain()
+                    break
+                if not linea:
+                    break
+                respuesta = await self._procesar(linea)
+                escritor.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _procesar(self, linea: bytes) -> Dict:
+        peticion: Dict = {}
+        try:
+            peticion = json.loads(linea)
+            if not isinstance(peticion, dict):
+                raise ValueError("La petición debe ser un objeto JSON.")
+            op = peticion.get("op")
+            if op in self._lecturas:
+                if self._confirmando is not None:
+                    # no se responde con cambios que aún no están en disco
+                    await self._confirmando
+                resultado = self._lecturas[op](peticion)
+            elif op in self._escrituras:
+                resultado = await self._escribir(self._escrituras[op], peticion)
+            else:
+                raise ValueError(f"Operación desconocida: '{op}'.")
+        except Exception as e:
+            # cualquier fallo de una petición (campos de tipo incorrecto, la persistencia del
+            # grupo falló y hay que reintentar, ...) se responde sin cerrar la conexión
+            motivo = e.args[0] if e.args else str(e)
+            return {"seq": peticion.get("seq") if isinstance(peticion, dict) else None,
+                    "ok": False, "error": str(motivo)}
+        return {"seq": peticion.get("seq"), "ok": True, "resultado": resultado}
+
+    async def _escribir(self, funcion: Callable[[Dict], Any], peticion: Dict) -> Any:
+        # se responde cuando el cambio ya está en disco (o con el error de su grupo)
+        confirmada = asyncio.get_running_loop().create_future()
+        self._pendientes.append((funcion, peticion, confirmada))
+        self._hay_pendientes.set()
+        return await confirmada
+
+    # ---------- group commit ----------
+    async def _confirmar_en_grupo(self) -> None:
+        while True:
+            await self._hay_pendientes.wait()
+            await asyncio.sleep(self.intervalo)
+            await self._confirmar()
+
+    async def _confirmar(self) -> None:
+        async with self._escritura:
+            pendientes, self._pendientes = self._pendientes, []
+            self._hay_pendientes.clear()
+            if not pendientes:
+                return
+            loop = asyncio.get_running_loop()
+            self._confirmando = loop.create_future()
+            try:
+                transaccion = self.inventario.transaccion()
+                transaccion.__enter__()
+                respuestas = []
+                for funcion, peticion, futuro in pendientes:
+                    # una operación que falla no cambia nada y el resto del grupo sigue
+                    try:
+                        respuestas.append((futuro, funcion(peticion), None))
+                    except Exception as e:
+                        respuestas.append((futuro, None, e))
+                try:
+                    # si la persistencia falla, la transacción se revierte en memoria
+                    await loop.run_in_executor(None, transaccion.__exit__, None, None, None)
+                except Exception as e:
+                    for futuro, _, _ in respuestas:
+                        if not futuro.done():  # el cliente puede haberse desconectado
+                            futuro.set_exception(e)
+                    return
+            finally:
+                self._confirmando.set_result(None)
+                self._confirmando = None
+        for futuro, resultado, error in respuestas:
+            if futuro.done():
+                continue
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+
+
+# -------------------------
+# Cliente de prueba de carga
+# -------------------------
+async def _cliente(conectar, n: int, ids: List[str], prop_escrituras: float,
+                   rng: random.Random, latencias: List[float]) -> None:
+    lector, escritor = await conectar()
+    for i in range(n):
+        pid = rng.choice(ids)
+        if rng.random() < prop_escrituras:
+            peticion = {"seq": i, "op": "actualizar_cantidad", "id": pid, "valor": rng.randint(0, 100)}
+        elif rng.random() < 0.5:
+            peticion = {"seq": i, "op": "obtener", "id": pid}
+        else:
+            peticion = {"seq": i, "op": "buscar", "texto": f"producto {rng.randint(0, 99)}"}
+        inicio = time.perf_counter()
+        escritor.write(json.dumps(peticion).encode("utf-8") + b"\n")
+        await escritor.drain()
+        respuesta = json.loads(await lector.readline())
+        latencias.append(time.perf_counter() - inicio)
+        if not respuesta["ok"]:
+            raise RuntimeError(respuesta["error"])
+    escritor.close()
+
+
+async def prueba_de_carga(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        inv = Inventario(os.path.join(tmp, "inventario.json"), diario=args.diario)
+        with inv.transaccion():
+            for i in range(args.productos):
+                inv.añadir_producto(Producto(f"{i:06d}", f"Producto {i}", 10, 1.0 + i % 50))
+        servidor = ServidorInventario(inv, args.intervalo)
+        if args.unix:
+            ruta = os.path.join(tmp, "inventario.sock")
+            red = await servidor.iniciar(ruta_unix=ruta)
+            conectar = lambda: asyncio.open_unix_connection(ruta)
+        else:
+            red = await servidor.iniciar("127.0.0.1", 0)
+            puerto = red.sockets[0].getsockname()[1]
+            conectar = lambda: asyncio.open_connection("127.0.0.1", puerto)
+
+        ids = list(inv._productos)
+        latencias: List[float] = []
+        inicio = time.perf_counter()
+        await asyncio.gather(*(
+            _cliente(conectar, args.peticiones, ids, args.escrituras, random.Random(c), latencias)
+            for c in range(args.clientes)))
+        duracion = time.perf_counter() - inicio
+
+        red.close()
+        await red.wait_closed()
+        await servidor.detener()
+
+    latencias.sort()
+    p = lambda q: latencias[min(len(latencias) - 1, int(q * len(latencias)))] * 1000
+    print(f"{args.clientes} clientes x {args.peticiones} peticiones "
+          f"({args.escrituras:.0%} escrituras, {'diario' if args.diario else 'snapshot'})")
+    print(f"  peticiones/s: {len(latencias) / duracion:10.0f}")
+    print(f"  p50: {p(0.50):8.2f} ms   p99: {p(0.99):8.2f} ms")
+
+
+# -------------------------
+# Línea de comandos
+# -------------------------
+async def servir(args) -> None:
+    inv = Inventario(args.archivo, diario=args.diario)
+    servidor = ServidorInventario(inv, args.intervalo)
+    red = await servidor.iniciar(args.host, args.puerto, args.unix)
+    destino = args.unix or f"{args.host}:{args.puerto}"
+    print(f"Inventario ({inv.contar()} productos) escuchando en {destino}")
+    try:
+        async with red:
+            await red.serve_forever()
+    finally:
+        await servidor.detener()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor asyncio del Inventario")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("servir", help="atender clientes")
+    p.add_argument("--archivo", default=DEFAULT_FILE)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--puerto", type=int, default=8765)
+    p.add_argument("--unix", help="ruta de socket Unix (en lugar de TCP)")
+    p.add_argument("--diario", action="store_true")
+    p.add_argument("--intervalo", type=float, default=INTERVALO_COMMIT)
+
+    p = sub.add_parser("carga", help="prueba de carga local (peticiones/s y p99)")
+    p.add_argument("--productos", type=int, default=10_000)
+    p.add_argument("--clientes", type=int, default=50)
+    p.add_argument("--peticiones", type=int, default=200)
+    p.add_argument("--escrituras", type=float, default=0.1, help="proporción de escrituras")
+    p.add_argument("--unix", action="store_true")
+    p.add_argument("--diario", action="store_true")
+    p.add_argument("--intervalo", type=float, default=INTERVALO_COMMIT)
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args) if args.comando == "servir" else prueba_de_carga(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Snapshot binario del Inventario (Semana 11) para arrancar casi al instante.
+
+Formato (little-endian):
+
+    cabecera   "INVB", versión, n registros, n ranuras, offsets de cada sección
+    registros  n registros de ancho fijo ordenados por ID:
+               offset/largo del id, offset/largo del nombre, cantidad (i64), precio (f64)
+    heap       cadenas UTF-8 (ids y nombres) una tras otra
+    tabla      índice hash de ids: ranuras u32 con (número de registro + 1), 0 = vacía,
+               sondeo lineal a partir de crc32(id)
+
+El archivo se abre con mmap: abrir no lee ni parsea nada, y obtener(id) o recorrer
+los productos solo toca las páginas de los registros que se usan. JSON se mantiene
+como formato de intercambio (exportar_json / convertir).
+
+Uso:
+    python snapshot_binario.py convertir inventario.json inventario.invb
+    python snapshot_binario.py exportar inventario.invb inventario.json
+"""
+import argparse
+import json
+import mmap
+import struct
+import zlib
+from array import array
+from typing import Dict, Iterable, Iterator, Optional
+
+from tarea11 import Inventario, Producto, escritura_atomica
+
+MAGIA = b"INVB"
+VERSION = 1
+CABECERA = struct.Struct("<4sIQQQQQ")  # magia, versión, n, ranuras, off registros, off heap, off tabla
+REGISTRO = struct.Struct("<QIQIqd")    # off id, largo id, off nombre, largo nombre, cantidad, precio
+RANURA = struct.Struct("<I")
+
+
+def _ranuras_para(n: int) -> int:
+    """Potencia de dos >= 2n: la tabla queda como mucho a la mitad de ocupación."""
+    ranuras = 8
+    while ranuras < 2 * n:
+        ranuras *= 2
+    return ranuras
+
+
+def escribir_snapshot(productos: Iterable[Producto], ruta: str) -> int:
+    """Escribe los productos en formato binario. Devuelve cuántos registros escribió."""
+    ordenados = sorted(productos, key=lambda p: p.id)
+    n = len(ordenados)
+    ranuras = _ranuras_para(n)
+    mascara = ranuras - 1
+
+    heap = bytearray()
+    registros = bytearray(REGISTRO.size * n)
+    tabla = array("I", bytes(4 * ranuras))
+    for i, p in enumerate(ordenados):
+        id_b = p.id.encode("utf-8")
+        nombre_b = p.nombre.encode("utf-8")
+        off_id = len(heap)
+        heap += id_b
+        off_nombre = len(heap)
+        heap += nombre_b
+        REGISTRO.pack_into(registros, i * REGISTRO.size, off_id, len(id_b), off_nombre, len(nombre_b),
+                           p.cantidad, p.precio)
+        ranura = zlib.crc32(id_b) & mascara
+        while tabla[ranura]:
+            ranura = (ranura + 1) & mascara
+        tabla[ranura] = i + 1
+
+    off_registros = CABECERA.size
+    off_heap = off_registros + len(registros)
+    off_tabla = off_heap + len(heap)
+    # alineamos la tabla a 4 bytes
+    relleno = (-off_tabla) % 4
+    off_tabla += relleno
+    # temporal + fsync + os.replace: un corte a mitad nunca deja un snapshot truncado
+    # que SnapshotBinario llegue a mapear
+    with escritura_atomica(ruta, "wb", sincronizar=True) as f:
+        f.write(CABECERA.pack(MAGIA, VERSION, n, ranuras, off_registros, off_heap, off_tabla))
+        f.write(registros)
+        f.write(heap)
+        f.write(b"\0" * relleno)
+        f.write(tabla.tobytes())
+    return n
+
+
+class SnapshotBinario:
+    """
+    Vista de solo lectura sobre un snapshot binario abierto con mmap.
+    Ofrece las consultas de lectura del Inventario sin cargarlo entero.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, n, ranuras, off_reg, off_heap, off_tabla = CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"'{ruta}' no es un snapshot binario de inventario (v{VERSION}).")
+        self._n = n
+        self._mascara = ranuras - 1
+        self._off_reg = off_reg
+        self._off_heap = off_heap
+        self._off_tabla = off_tabla
+
+    def cerrar(self) -> None:
+        self._mm.close()
+        self._archivo.close()
+
+    def __enter__(self) -> "SnapshotBinario":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ---------- acceso a registros ----------
+    def _cadena(self, offset: int, largo: int) -> bytes:
+        inicio = self._off_heap + offset
+        return self._mm[inicio:inicio + largo]
+
+    def _registro(self, i: int) -> Producto:
+        off_id, largo_id, off_nombre, largo_nombre, cantidad, precio = REGISTRO.unpack_from(
+            self._mm, self._off_reg + i * REGISTRO.size)
+        return Producto.from_dict_confiable({
+            "id": self._cadena(off_id, largo_id).decode("utf-8"),
+            "nombre": self._cadena(off_nombre, largo_nombre).decode("utf-8"),
+            "cantidad": cantidad,
+            "precio": precio,
+        })
+
+    def _buscar_registro(self, id_producto: str) -> int:
+        """Número de registro del id, o -1 si no está."""
+        id_b = id_producto.encode("utf-8")
+        ranura = zlib.crc32(id_b) & self._mascara
+        while True:
+            valor = RANURA.unpack_from(self._mm, self._off_tabla + 4 * ranura)[0]
+            if valor == 0:
+                return -1
+            i = valor - 1
+            off_id, largo_id = struct.unpack_from("<QI", self._mm, self._off_reg + i * REGISTRO.size)
+            if largo_id == len(id_b) and self._cadena(off_id, largo_id) == id_b:
+                return i
+            ranura = (ranura + 1) & self._mascara
+
+    # ---------- API de lectura (como Inventario) ----------
+    def obtener_producto(self, id_producto: str) -> Optional[Producto]:
+        i = self._buscar_registro(id_producto)
+        return self._registro(i) if i >= 0 else None
+
+    def __contains__(self, id_producto: str) -> bool:
+        return self._buscar_registro(id_producto) >= 0
+
+    def contar(self) -> int:
+        return self._n
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[Producto]:
+        """Productos en orden de ID, decodificados uno a uno."""
+        for i in range(self._n):
+            yield self._registro(i)
+
+    def mostrar_todos(self):
+        return [(p.id, p.nombre, p.cantidad, p.precio) for p in self]
+
+    # ---------- exportación ----------
+    def a_inventario(self, inventario: Inventario) -> None:
+        """Carga todo el snapshot en un Inventario (reemplaza su contenido en memoria)."""
+        inventario._productos.clear()
+        inventario._indice_nombre.clear()
+        inventario._invalidar_indices_derivados()
+        for p in self:
+            inventario._productos[p.id] = p
+            inventario._indexar(p)
+        inventario._notificar([({"op": "reset"}, None)])
+
+    def exportar_json(self, ruta: str) -> None:
+        """Escribe el snapshot en el formato JSON de Inventario.guardar."""
+        data: Dict[str, Dict] = {p.id: p.to_dict() for p in self}
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def convertir(ruta_json: str, ruta_binaria: str) -> int:
+    """Convierte un inventario.json en snapshot binario."""
+    with open(ruta_json, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return escribir_snapshot((Producto.from_dict(d) for d in data.values()), ruta_binaria)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot binario del Inventario")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("convertir", help="inventario.json -> snapshot binario")
+    p.add_argument("json")
+    p.add_argument("binario")
+    p = sub.add_parser("exportar", help="snapshot binario -> inventario.json")
+    p.add_argument("binario")
+    p.add_argument("json")
+    args = parser.parse_args()
+
+    if args.comando == "convertir":
+        n = convertir(args.json, args.binario)
+        print(f"{n} productos escritos en {args.binario}")
+    else:
+        with SnapshotBinario(args.binario) as snapshot:
+            snapshot.exportar_json(args.json)
+            print(f"{snapshot.contar()} productos exportados a {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,24 @@
+import argparse
+import gc
 import json
+import multiprocessing
 import os
+import re
+import sqlite3
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+# Peso de cada campo en la relevancia de buscar_libros (una coincidencia exacta vale el doble que un prefijo)
+PESOS_CAMPOS = {"titulo": 3, "autor": 2, "categoria": 1}
+# Un término con más de COMPROBAR_POR_LIBRO entradas por candidato se comprueba libro por libro
+COMPROBAR_POR_LIBRO = 50
+DEFAULT_DB = "biblioteca.db"
+# Si usuarios.json y prestamos.json suman al menos esto (bytes), se leen en otro proceso
+# mientras el principal lee libros.json (solo con varias CPU)
+UMBRAL_CARGA_PARALELA = 4_000_000
 
 # --- CLASES --- #
 class Libro:
@@ -34,11 +53,53 @@ class Usuario:
     def __init__(self, nombre, id_usuario):
         self.nombre = nombre
         self.id_usuario = id_usuario
-        self.libros_prestados = []  # lista de objetos Libro
+        self._libros_prestados = []  # lista de objetos Libro
+        self._pendientes = None  # carga diferida: tuplas (titulo, autor, categoria, isbn) sin convertir
+        self.isbns_prestados = set()  # ISBN de libros_prestados, para comprobar en O(1)
+
+    @property
+    def libros_prestados(self):
+        # Con carga diferida, los Libro se crean en el primer acceso
+        if self._pendientes is not None:
+            self._libros_prestados = [Libro(*datos) for datos in self._pendientes]
+            self._pendientes = None
+        return self._libros_prestados
+
+    @libros_prestados.setter
+    def libros_prestados(self, libros):
+        self.asignar_prestamos(libros)
 
     def __str__(self):
         return f"{self.nombre} (ID: {self.id_usuario})"
 
+    def tiene_prestado(self, isbn):
+        return isbn in self.isbns_prestados
+
+    def agregar_prestamo(self, libro):
+        self.libros_prestados.append(libro)
+        self.isbns_prestados.add(libro.isbn)
+
+    def quitar_prestamo(self, isbn):
+        # Devuelve el Libro quitado, o None si el usuario no lo tenía
+        if isbn not in self.isbns_prestados:
+            return None
+        self.isbns_prestados.remove(isbn)
+        for i, libro in enumerate(self.libros_prestados):
+            if libro.isbn == isbn:
+                return self.libros_prestados.pop(i)
+
+    def asignar_prestamos(self, libros):
+        self._libros_prestados = list(libros)
+        self._pendientes = None
+        self.isbns_prestados = {libro.isbn for libro in self._libros_prestados}
+
+    def asignar_prestamos_diferidos(self, datos):
+        # datos: lista de tuplas (titulo, autor, categoria, isbn); los Libro se crean
+        # la primera vez que se accede a libros_prestados
+        self._libros_prestados = []
+        self._pendientes = datos
+        self.isbns_prestados = {isbn for _, _, _, isbn in datos}
+
     def to_dict(self):
         return {
             "nombre": self.nombre,
@@ -49,20 +110,96 @@ class Usuario:
     @staticmethod
     def from_dict(data):
         usuario = Usuario(data["nombre"], data["id_usuario"])
-        usuario.libros_prestados = [Libro.from_dict(l) for l in data.get("libros_prestados", [])]
+        usuario.asignar_prestamos(Libro.from_dict(l) for l in data.get("libros_prestados", []))
         return usuario
 
 
+# --- CARGA DE LOS ARCHIVOS JSON --- #
+@contextmanager
+def _sin_recolector():
+    # Crear millones de objetos dispara una y otra vez el recolector de ciclos sin que
+    # haya basura que recoger (con 1M de libros, más de la mitad del arranque): se pausa
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def _leer_json(ruta):
+    # Contenido del archivo, o None si no existe o no es JSON válido
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return None
+
+
+def _leer_usuarios(ruta_usuarios, ruta_prestamos):
+    # [(id_usuario, nombre, [(titulo, autor, categoria, isbn), ...])] con los préstamos ya
+    # resueltos: los de prestamos.json mandan sobre los de usuarios.json, así que estos
+    # solo se usan para los usuarios que no aparecen en prestamos.json.
+    # Devuelve tuplas y no objetos para que salga barato traerlo desde otro proceso.
+    with _sin_recolector():
+        usuarios = _leer_json(ruta_usuarios)
+        if usuarios is None:
+            return []
+        prestamos = _leer_json(ruta_prestamos) or {}
+        resultado = []
+        for u in usuarios:
+            uid = u["id_usuario"]
+            libros = prestamos[uid] if uid in prestamos else u.get("libros_prestados", [])
+            resultado.append((uid, u["nombre"], [(tuple(l["titulo"]), tuple(l["autor"]), l["categoria"], l["isbn"])
+                                                 for l in libros]))
+        return resultado
+
+
+# --- BÚSQUEDA: NORMALIZACIÓN --- #
+def normalizar(texto):
+    # minúsculas y sin tildes: "Paraíso" y "paraiso" dan el mismo término
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    texto = unicodedata.normalize("NFD", texto)
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    return re.findall(r"\w+", normalizar(texto))
+
+
+def tokens_libro(libro):
+    # campo -> conjunto de términos del libro
+    return {
+        "titulo": set(tokenizar(" ".join(libro.titulo))),
+        "autor": set(tokenizar(" ".join(libro.autor))),
+        "categoria": set(tokenizar(libro.categoria)),
+    }
+
+
 # --- BIBLIOTECA --- #
 class Biblioteca:
     LIBROS_FILE = "libros.json"
     USUARIOS_FILE = "usuarios.json"
     PRESTAMOS_FILE = "prestamos.json"
 
-    def __init__(self):
+    def __init__(self, almacen=None, carga_diferida=False, paralelo=None):
+        # almacen: None = los tres archivos JSON; o un AlmacenSQLite (escrituras por fila)
+        # carga_diferida: con JSON, los libros prestados de cada usuario se crean en el primer acceso
+        # paralelo: con JSON, leer usuarios y préstamos en otro proceso (None = según tamaño y CPU)
+        self.almacen = almacen
+        self.carga_diferida = carga_diferida
+        self.paralelo = paralelo
         self.libros = {}  # isbn -> Libro
         self.usuarios = set()  # conjunto de id_usuario
         self.usuarios_data = {}  # id_usuario -> Usuario (para datos completos)
+        self.prestamos = {}  # isbn -> id_usuario que lo tiene prestado (índice inverso)
+        # Índice invertido de los libros disponibles (se construye en la primera búsqueda)
+        self._indice = {campo: {} for campo in PESOS_CAMPOS}  # campo -> término -> set de isbn
+        self._vocabulario = []  # todos los términos, ordenados (para buscar por prefijo)
+        self._indice_construido = False
         self.cargar_datos()
 
     # --- GUARDAR DATOS --- #
@@ -82,63 +219,175 @@ class Biblioteca:
         with open(self.PRESTAMOS_FILE, "w", encoding="utf-8") as f:
             json.dump(prestamos, f, indent=4, ensure_ascii=False)
 
+    def _guardar(self, operacion, *args):
+        # Persiste una operación: con almacén, solo las filas afectadas;
+        # con JSON, se reescriben los archivos que cambian
+        if self.almacen is not None:
+            getattr(self.almacen, operacion)(*args)
+            return
+        if operacion in ("agregar_libro", "quitar_libro", "prestar", "devolver"):
+            self.guardar_libros()
+        if operacion in ("registrar_usuario", "dar_baja_usuario"):
+            self.guardar_usuarios()
+        if operacion not in ("agregar_libro", "quitar_libro"):
+            self.guardar_prestamos()
+
     # --- CARGAR DATOS --- #
     def cargar_datos(self):
-        # Cargar libros
-        if os.path.exists(self.LIBROS_FILE):
-            try:
-                with open(self.LIBROS_FILE, "r", encoding="utf-8") as f:
-                    libros_data = json.load(f)
-                    for l in libros_data:
-                        libro = Libro.from_dict(l)
-                        self.libros[libro.isbn] = libro
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.libros = {}
-
-        # Cargar usuarios
-        if os.path.exists(self.USUARIOS_FILE):
-            try:
-                with open(self.USUARIOS_FILE, "r", encoding="utf-8") as f:
-                    usuarios_data = json.load(f)
-                    for u in usuarios_data:
-                        usuario = Usuario.from_dict(u)
-                        self.usuarios.add(usuario.id_usuario)
-                        self.usuarios_data[usuario.id_usuario] = usuario
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.usuarios = set()
-                self.usuarios_data = {}
-
-        # Cargar préstamos (libros prestados)
-        if os.path.exists(self.PRESTAMOS_FILE):
-            try:
-                with open(self.PRESTAMOS_FILE, "r", encoding="utf-8") as f:
-                    prestamos_data = json.load(f)
-                    for uid, libros in prestamos_data.items():
-                        if uid in self.usuarios_data:
-                            self.usuarios_data[uid].libros_prestados = [Libro.from_dict(l) for l in libros]
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+        with _sin_recolector():
+            if self.almacen is not None:
+                self.libros, self.usuarios_data = self.almacen.cargar()
+                self.usuarios = set(self.usuarios_data)
+            else:
+                self._cargar_json()
+
+        # Índice inverso de préstamos
+        self.prestamos = {}
+        for uid, usuario in self.usuarios_data.items():
+            for isbn in usuario.isbns_prestados:
+                self.prestamos[isbn] = uid
+
+        # El índice de búsqueda se reconstruirá en la próxima búsqueda
+        self._indice = {campo: {} for campo in PESOS_CAMPOS}
+        self._vocabulario = []
+        self._indice_construido = False
+
+    def _cargar_json(self):
+        # libros.json por un lado; usuarios.json y prestamos.json, ya resueltos, por otro
+        if self._carga_paralela():
+            contexto = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as ejecutor:
+                futuro = ejecutor.submit(_leer_usuarios, self.USUARIOS_FILE, self.PRESTAMOS_FILE)
+                libros_data = _leer_json(self.LIBROS_FILE)
+                usuarios_data = futuro.result()
+        else:
+            libros_data = _leer_json(self.LIBROS_FILE)
+            usuarios_data = _leer_usuarios(self.USUARIOS_FILE, self.PRESTAMOS_FILE)
+
+        self.libros = {}
+        for l in libros_data or []:
+            libro = Libro.from_dict(l)
+            self.libros[libro.isbn] = libro
+
+        self.usuarios_data = {}
+        for uid, nombre, prestados in usuarios_data:
+            usuario = Usuario(nombre, uid)
+            if self.carga_diferida:
+                usuario.asignar_prestamos_diferidos(prestados)
+            else:
+                usuario.asignar_prestamos(Libro(*datos) for datos in prestados)
+            self.usuarios_data[uid] = usuario
+        self.usuarios = set(self.usuarios_data)
+
+    def _carga_paralela(self):
+        # El proceso auxiliar se crea con un contexto fork propio (hereda el módulo y la
+        # carpeta actual) sin tocar el método de arranque global del programa. En macOS
+        # fork no es seguro y en Windows no existe: ahí siempre se carga en secuencia.
+        # Solo compensa con varias CPU y archivos grandes
+        if "fork" not in multiprocessing.get_all_start_methods() or sys.platform == "darwin":
+            return False
+        if self.paralelo is not None:
+            return self.paralelo
+        if (os.cpu_count() or 1) < 2:
+            return False
+        tamano = sum(os.path.getsize(ruta) for ruta in (self.USUARIOS_FILE, self.PRESTAMOS_FILE)
+                     if os.path.exists(ruta))
+        return tamano >= UMBRAL_CARGA_PARALELA
+
+    # --- ÍNDICE DE BÚSQUEDA --- #
+    def _construir_indice(self):
+        for libro in self.libros.values():
+            for campo, tokens in tokens_libro(libro).items():
+                por_termino = self._indice[campo]
+                for token in tokens:
+                    por_termino.setdefault(token, set()).add(libro.isbn)
+        self._vocabulario = sorted(set().union(*self._indice.values()))
+        self._indice_construido = True
+
+    def _indexar_libro(self, libro):
+        if not self._indice_construido:
+            return
+        for campo, tokens in tokens_libro(libro).items():
+            por_termino = self._indice[campo]
+            for token in tokens:
+                if not any(token in self._indice[c] for c in PESOS_CAMPOS):
+                    insort(self._vocabulario, token)
+                por_termino.setdefault(token, set()).add(libro.isbn)
+
+    def _desindexar_libro(self, libro):
+        if not self._indice_construido:
+            return
+        for campo, tokens in tokens_libro(libro).items():
+            por_termino = self._indice[campo]
+            for token in tokens:
+                isbns = por_termino.get(token)
+                if isbns is None:
+                    continue
+                isbns.discard(libro.isbn)
+                if not isbns:
+                    del por_termino[token]
+                    if not any(token in self._indice[c] for c in PESOS_CAMPOS):
+                        del self._vocabulario[bisect_left(self._vocabulario, token)]
+
+    def _estimar(self, campo, termino):
+        # cuántas entradas del índice habría que recorrer para el término
+        campos = [campo] if campo else list(PESOS_CAMPOS)
+        return sum(len(self._indice[c].get(token, ())) for token in self._terminos_con_prefijo(termino)
+                   for c in campos)
+
+    @staticmethod
+    def _puntaje_en_libro(libro, campo, termino):
+        tokens = tokens_libro(libro)
+        mejor = 0
+        for c in ([campo] if campo else PESOS_CAMPOS):
+            for token in tokens[c]:
+                if token.startswith(termino):
+                    mejor = max(mejor, PESOS_CAMPOS[c] * (2 if token == termino else 1))
+        return mejor
+
+    def _coincidencias(self, campo, termino):
+        # isbn -> mejor puntaje del término en el campo indicado (o en todos si campo es None)
+        campos = [campo] if campo else list(PESOS_CAMPOS)
+        por_puntaje = {}
+        for token in self._terminos_con_prefijo(termino):
+            factor = 2 if token == termino else 1
+            for c in campos:
+                isbns = self._indice[c].get(token)
+                if isbns:
+                    por_puntaje.setdefault(PESOS_CAMPOS[c] * factor, set()).update(isbns)
+        resultado = {}
+        for puntaje in sorted(por_puntaje):  # de menor a mayor: gana el mejor puntaje
+            resultado.update(dict.fromkeys(por_puntaje[puntaje], puntaje))
+        return resultado
+
+    def _terminos_con_prefijo(self, prefijo):
+        i = bisect_left(self._vocabulario, prefijo)
+        while i < len(self._vocabulario) and self._vocabulario[i].startswith(prefijo):
+            yield self._vocabulario[i]
+            i += 1
 
     # --- LIBROS --- #
     def agregar_libro(self, libro):
-        if libro.isbn in self.libros:
+        # Un libro prestado no está en self.libros, pero su ISBN sigue ocupado
+        if libro.isbn in self.libros or libro.isbn in self.prestamos:
             print("El libro ya existe en la biblioteca.")
             return
         self.libros[libro.isbn] = libro
-        self.guardar_libros()
+        self._indexar_libro(libro)
+        self._guardar("agregar_libro", libro)
         print(f"Libro agregado: {libro}")
 
     def quitar_libro(self, isbn):
         # Validar que el libro no esté prestado
-        for usuario in self.usuarios_data.values():
-            if any(libro.isbn == isbn for libro in usuario.libros_prestados):
-                print("No se puede eliminar el libro porque está prestado.")
-                return
+        if isbn in self.prestamos:
+            print("No se puede eliminar el libro porque está prestado.")
+            return
         if isbn not in self.libros:
             print("El libro no existe en la biblioteca.")
             return
         eliminado = self.libros.pop(isbn)
-        self.guardar_libros()
+        self._desindexar_libro(eliminado)
+        self._guardar("quitar_libro", isbn)
         print(f"Libro eliminado: {eliminado}")
 
     # --- USUARIOS --- #
@@ -148,8 +397,7 @@ class Biblioteca:
             return
         self.usuarios.add(usuario.id_usuario)
         self.usuarios_data[usuario.id_usuario] = usuario
-        self.guardar_usuarios()
-        self.guardar_prestamos()
+        self._guardar("registrar_usuario", usuario)
         print(f"Usuario registrado: {usuario}")
 
     def dar_baja_usuario(self, id_usuario):
@@ -159,11 +407,10 @@ class Biblioteca:
         # Devolver todos los libros prestados antes de eliminar usuario
         usuario = self.usuarios_data[id_usuario]
         for libro in usuario.libros_prestados[:]:  # copia para evitar modificar mientras iteramos
-            self.devolver_libro(id_usuario, libro.isbn)
+            self.devolver_libro(id_usuario, libro.isbn)  # también lo quita de self.prestamos
         self.usuarios.remove(id_usuario)
         self.usuarios_data.pop(id_usuario)
-        self.guardar_usuarios()
-        self.guardar_prestamos()
+        self._guardar("dar_baja_usuario", id_usuario)
         print(f"Usuario dado de baja: {id_usuario}")
 
     # --- PRÉSTAMOS --- #
@@ -176,13 +423,14 @@ class Biblioteca:
             return
         usuario = self.usuarios_data[id_usuario]
         # Verificar que el usuario no tenga ya el libro prestado
-        if any(libro.isbn == isbn for libro in usuario.libros_prestados):
+        if usuario.tiene_prestado(isbn):
             print("El usuario ya tiene prestado este libro.")
             return
         libro = self.libros.pop(isbn)
-        usuario.libros_prestados.append(libro)
-        self.guardar_libros()
-        self.guardar_prestamos()
+        self._desindexar_libro(libro)  # un libro prestado no aparece en las búsquedas
+        usuario.agregar_prestamo(libro)
+        self.prestamos[isbn] = id_usuario
+        self._guardar("prestar", id_usuario, isbn)
         print(f"Libro prestado: {libro} a {usuario.nombre}")
 
     def devolver_libro(self, id_usuario, isbn):
@@ -190,27 +438,61 @@ class Biblioteca:
             print("Usuario no registrado.")
             return
         usuario = self.usuarios_data[id_usuario]
-        libro = next((l for l in usuario.libros_prestados if l.isbn == isbn), None)
+        libro = usuario.quitar_prestamo(isbn)
         if libro is None:
             print("El usuario no tiene ese libro prestado.")
             return
-        usuario.libros_prestados.remove(libro)
+        if self.prestamos.get(isbn) == id_usuario:
+            del self.prestamos[isbn]
         self.libros[isbn] = libro
-        self.guardar_libros()
-        self.guardar_prestamos()
+        self._indexar_libro(libro)
+        self._guardar("devolver", id_usuario, isbn)
         print(f"Libro devuelto: {libro}")
 
     # --- BÚSQUEDA --- #
-    def buscar_libros(self, valor):
-        valor = valor.lower()
-        resultados = []
-        for libro in self.libros.values():
-            titulo_str = " ".join(libro.titulo).lower()
-            autor_str = " ".join(libro.autor).lower()
-            categoria_str = libro.categoria.lower()
-            if valor in titulo_str or valor in autor_str or valor in categoria_str:
-                resultados.append(libro)
-        return resultados
+    def buscar_libros(self, valor, limite=None):
+        # Busca entre los libros disponibles. Cada palabra de `valor` debe aparecer (AND)
+        # como palabra completa o como inicio de una palabra del título, autor o categoría;
+        # "autor:milton", "titulo:paraiso" o "categoria:clasica" limitan el campo.
+        # No distingue mayúsculas ni tildes. Los resultados van de más a menos relevantes
+        # (ver PESOS_CAMPOS); `limite` corta la lista (útil para autocompletar).
+        terminos = []
+        for parte in valor.split():
+            campo, _, texto = parte.rpartition(":")
+            campo = normalizar(campo)
+            if campo not in PESOS_CAMPOS:
+                campo, texto = None, parte
+            terminos.extend((campo, t) for t in tokenizar(texto))
+        if not terminos:
+            return []
+        if not self._indice_construido:
+            self._construir_indice()
+
+        # Se empieza por el término con menos coincidencias. Los demás se intersectan con el
+        # índice o, si tienen muchas más coincidencias que candidatos quedan, se comprueban
+        # libro por libro (p. ej. "quijote c": no hace falta reunir todo lo que empieza por "c")
+        terminos = sorted(((self._estimar(campo, termino), campo, termino) for campo, termino in terminos),
+                          key=lambda t: t[0])
+        _, campo, termino = terminos[0]
+        puntajes = self._coincidencias(campo, termino)
+        for estimado, campo, termino in terminos[1:]:
+            if estimado > COMPROBAR_POR_LIBRO * len(puntajes):
+                siguientes = {}
+                for isbn, acumulado in puntajes.items():
+                    puntaje = self._puntaje_en_libro(self.libros[isbn], campo, termino)
+                    if puntaje:
+                        siguientes[isbn] = acumulado + puntaje
+                puntajes = siguientes
+            else:
+                otras = self._coincidencias(campo, termino)
+                puntajes = {isbn: puntajes[isbn] + otras[isbn] for isbn in puntajes.keys() & otras.keys()}
+
+        # Más relevantes primero; a igual relevancia, por ISBN (sort es estable)
+        orden = sorted(puntajes)
+        orden.sort(key=puntajes.__getitem__, reverse=True)
+        if limite is not None:
+            orden = orden[:limite]
+        return [self.libros[isbn] for isbn in orden]
 
     # --- LISTADOS --- #
     def listar_catalogo(self):
@@ -253,9 +535,121 @@ class Biblioteca:
             print(f"- {libro}")
 
 
-# --- MENÚ INTERACTIVO --- #
-def menu():
+# --- PERSISTENCIA SQLITE --- #
+class AlmacenSQLite:
+    # Datos normalizados en un archivo SQLite (módulo estándar sqlite3):
+    #   libros(isbn PK, titulo, autor, categoria) -> todos los libros, también los prestados
+    #                                               (titulo y autor como listas JSON)
+    #   usuarios(id_usuario PK, nombre)
+    #   prestamos(isbn PK -> libros, id_usuario -> usuarios) -> el préstamo solo guarda el ISBN
+    # Un libro está disponible si no tiene fila en prestamos. Cada operación escribe
+    # solo sus filas; el archivo usa modo WAL.
+    def __init__(self, archivo=DEFAULT_DB):
+        self.archivo = archivo
+        # isolation_level=None: autocommit; las transacciones se abren explícitamente
+        self._conexion = sqlite3.connect(archivo, isolation_level=None)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute("PRAGMA foreign_keys=ON")
+        self._conexion.executescript(
+            "CREATE TABLE IF NOT EXISTS libros ("
+            " isbn TEXT PRIMARY KEY, titulo TEXT NOT NULL, autor TEXT NOT NULL, categoria TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS usuarios (id_usuario TEXT PRIMARY KEY, nombre TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS prestamos ("
+            " isbn TEXT PRIMARY KEY REFERENCES libros(isbn),"
+            " id_usuario TEXT NOT NULL REFERENCES usuarios(id_usuario));"
+            "CREATE INDEX IF NOT EXISTS prestamos_usuario ON prestamos(id_usuario);")
+
+    def cerrar(self):
+        self._conexion.close()
+
+    @staticmethod
+    def _fila_libro(libro):
+        return (libro.isbn, json.dumps(list(libro.titulo), ensure_ascii=False),
+                json.dumps(list(libro.autor), ensure_ascii=False), libro.categoria)
+
+    def cargar(self):
+        # Devuelve (libros disponibles por isbn, usuarios por id con sus préstamos),
+        # en el orden en que se insertaron
+        libros = {}
+        for isbn, titulo, autor, categoria in self._conexion.execute(
+                "SELECT isbn, titulo, autor, categoria FROM libros ORDER BY rowid"):
+            libros[isbn] = Libro(tuple(json.loads(titulo)), tuple(json.loads(autor)), categoria, isbn)
+        usuarios = {uid: Usuario(nombre, uid) for uid, nombre in self._conexion.execute(
+            "SELECT id_usuario, nombre FROM usuarios ORDER BY rowid")}
+        for isbn, uid in self._conexion.execute("SELECT isbn, id_usuario FROM prestamos ORDER BY rowid"):
+            usuarios[uid].agregar_prestamo(libros.pop(isbn))
+        return libros, usuarios
+
+    # Una operación de Biblioteca = un método (ver Biblioteca._guardar)
+    def agregar_libro(self, libro):
+        self._conexion.execute("INSERT INTO libros (isbn, titulo, autor, categoria) VALUES (?, ?, ?, ?)",
+                               self._fila_libro(libro))
+
+    def quitar_libro(self, isbn):
+        self._conexion.execute("DELETE FROM libros WHERE isbn = ?", (isbn,))
+
+    def registrar_usuario(self, usuario):
+        self._conexion.execute("INSERT INTO usuarios (id_usuario, nombre) VALUES (?, ?)",
+                               (usuario.id_usuario, usuario.nombre))
+
+    def dar_baja_usuario(self, id_usuario):
+        with self._transaccion():
+            self._conexion.execute("DELETE FROM prestamos WHERE id_usuario = ?", (id_usuario,))
+            self._conexion.execute("DELETE FROM usuarios WHERE id_usuario = ?", (id_usuario,))
+
+    def prestar(self, id_usuario, isbn):
+        self._conexion.execute("INSERT INTO prestamos (isbn, id_usuario) VALUES (?, ?)", (isbn, id_usuario))
+
+    def devolver(self, id_usuario, isbn):
+        self._conexion.execute("DELETE FROM prestamos WHERE isbn = ? AND id_usuario = ?", (isbn, id_usuario))
+
+    @contextmanager
+    def _transaccion(self):
+        self._conexion.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conexion.execute("ROLLBACK")
+            raise
+        self._conexion.execute("COMMIT")
+
+    def reemplazar_todo(self, libros, usuarios):
+        # Sustituye todo el contenido en una sola transacción (usado por el migrador).
+        # libros: los disponibles; los prestados salen de usuario.libros_prestados
+        with self._transaccion():
+            for tabla in ("prestamos", "usuarios", "libros"):
+                self._conexion.execute(f"DELETE FROM {tabla}")
+            usuarios = list(usuarios)
+            prestados = [libro for usuario in usuarios for libro in usuario.libros_prestados]
+            # INSERT OR IGNORE: datos antiguos pueden repetir un ISBN (se queda el primero)
+            self._conexion.executemany(
+                "INSERT OR IGNORE INTO libros (isbn, titulo, autor, categoria) VALUES (?, ?, ?, ?)",
+                (self._fila_libro(libro) for libro in list(libros) + prestados))
+            self._conexion.executemany("INSERT INTO usuarios (id_usuario, nombre) VALUES (?, ?)",
+                                       ((u.id_usuario, u.nombre) for u in usuarios))
+            self._conexion.executemany(
+                "INSERT OR IGNORE INTO prestamos (isbn, id_usuario) VALUES (?, ?)",
+                ((libro.isbn, u.id_usuario) for u in usuarios for libro in u.libros_prestados))
+        self._conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return tuple(self._conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+                     for tabla in ("libros", "usuarios", "prestamos"))
+
+
+def migrar_json_a_sqlite(ruta_db=DEFAULT_DB):
+    # Copia libros.json, usuarios.json y prestamos.json (carpeta actual) a una base SQLite.
+    # Devuelve (libros, usuarios, préstamos) migrados.
     biblioteca = Biblioteca()
+    almacen = AlmacenSQLite(ruta_db)
+    try:
+        return almacen.reemplazar_todo(biblioteca.libros.values(), biblioteca.usuarios_data.values())
+    finally:
+        almacen.cerrar()
+
+
+# --- MENÚ INTERACTIVO --- #
+def menu(almacen=None, carga_diferida=False):
+    biblioteca = Biblioteca(almacen, carga_diferida)
 
     while True:
         print("\n===== BIBLIOTECA DIGITAL PROFESIONAL =====")
@@ -265,7 +659,7 @@ def menu():
         print("4. Dar de baja usuario")
         print("5. Prestar libro")
         print("6. Devolver libro")
-        print("7. Buscar libros (título, autor o categoría)")
+        print("7. Buscar libros (título, autor o categoría; admite autor:, titulo:, categoria:)")
         print("8. Ver libros prestados de un usuario")
         print("9. Ver catálogo completo")
         print("10. Mostrar todos los libros prestados")
@@ -325,7 +719,7 @@ def menu():
             biblioteca.devolver_libro(id_usuario, isbn)
 
         elif opcion == "7":
-            valor = input("Buscar libro por título, autor o categoría: ").strip()
+            valor = input("Buscar (palabras o inicios de palabra; p. ej. 'paraiso autor:milton'): ").strip()
             if not valor:
                 print("Debe ingresar un valor para buscar.")
                 continue
@@ -362,4 +756,15 @@ def menu():
 
 
 if __name__ == "__main__":
-    menu()
+    parser = argparse.ArgumentParser(description="Biblioteca digital")
+    parser.add_argument("--sqlite", action="store_true", help=f"guardar en una base SQLite ({DEFAULT_DB})")
+    parser.add_argument("--migrar", metavar="DB",
+                        help="migrar libros.json, usuarios.json y prestamos.json a una base SQLite y salir")
+    parser.add_argument("--carga-diferida", action="store_true",
+                        help="crear los libros prestados de cada usuario solo cuando se consultan")
+    args = parser.parse_args()
+    if args.migrar:
+        libros, usuarios, prestamos = migrar_json_a_sqlite(args.migrar)
+        print(f"Migrados {libros} libros, {usuarios} usuarios y {prestamos} préstamos a {args.migrar}.")
+    else:
+        menu(AlmacenSQLite() if args.sqlite else None, args.carga_diferida)
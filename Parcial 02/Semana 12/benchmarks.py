@@ -0,0 +1,228 @@
+"""
+Benchmarks de la Biblioteca (Semana 12).
+
+Cada benchmark trabaja sobre archivos en un directorio temporal, nunca sobre los
+libros.json / usuarios.json / prestamos.json de esta carpeta. Uso:
+
+    python benchmarks.py persistencia [--libros N] [--usuarios N] [--prestamos N] [--presupuesto S]
+    python benchmarks.py arranque [--libros N] [--usuarios N] [--prestamos N]
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+
+from tarea12 import AlmacenSQLite, Biblioteca, modulo
+
+
+# -------------------------
+# Utilidades
+# -------------------------
+PALABRAS = ["el", "la", "de", "mar", "noche", "sombra", "camino", "tiempo", "ciudad", "jardín",
+            "silencio", "fuego", "historia", "viaje", "memoria", "luz", "río", "guerra", "amor", "sueño"]
+NOMBRES = ["Ana", "Luis", "Marta", "Jorge", "Lucía", "Pedro", "Sofía", "Diego", "Elena", "Pablo"]
+APELLIDOS = ["García", "López", "Pérez", "Rosseti", "Torres", "Vega", "Ruiz", "Milton", "Goethe", "Cruz"]
+CATEGORIAS = ["Clásica", "Novela", "Poesía", "Historia", "Ciencia ficción", "Ensayo"]
+
+
+def libro_sintetico(rng: random.Random, isbn: str) -> dict:
+    titulo = [rng.choice(PALABRAS).capitalize()] + [rng.choice(PALABRAS) for _ in range(rng.randint(0, 4))]
+    return {"titulo": titulo, "autor": [rng.choice(NOMBRES), rng.choice(APELLIDOS)],
+            "categoria": rng.choice(CATEGORIAS), "isbn": isbn}
+
+
+def crear_archivos(directorio: str, libros: int, usuarios: int, prestamos: int, semilla: int = 12) -> None:
+    """
+    Escribe los tres JSON con el formato de Biblioteca: `libros` libros en total, de los
+    que `prestamos` están prestados (repartidos al azar entre `usuarios` usuarios).
+    Como hace Biblioteca, los prestados aparecen en prestamos.json y en usuarios.json.
+    """
+    rng = random.Random(semilla)
+    todos = [libro_sintetico(rng, f"{i:010d}") for i in range(libros)]
+    por_usuario = [[] for _ in range(usuarios)]
+    for libro in todos[:prestamos]:
+        por_usuario[rng.randrange(usuarios)].append(libro)
+    ids = [f"u{i:07d}" for i in range(usuarios)]
+    datos = {
+        Biblioteca.LIBROS_FILE: todos[prestamos:],
+        Biblioteca.USUARIOS_FILE: [{"nombre": f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}", "id_usuario": uid,
+                                    "libros_prestados": prestados} for uid, prestados in zip(ids, por_usuario)],
+        Biblioteca.PRESTAMOS_FILE: dict(zip(ids, por_usuario)),
+    }
+    for nombre, contenido in datos.items():
+        with open(os.path.join(directorio, nombre), "w", encoding="utf-8") as f:
+            json.dump(contenido, f, indent=4, ensure_ascii=False)
+
+
+@contextlib.contextmanager
+def en_directorio(directorio: str):
+    """Biblioteca usa rutas relativas: se trabaja dentro de `directorio` sin imprimir nada."""
+    anterior = os.getcwd()
+    os.chdir(directorio)
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            yield
+    finally:
+        os.chdir(anterior)
+
+
+def cronometrar(funcion) -> float:
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def medir(operacion, maximo: int, presupuesto: float) -> float:
+    """Ejecuta operacion(i) hasta `maximo` veces o `presupuesto` segundos; devuelve ms por operación."""
+    hechas = 0
+    inicio = time.perf_counter()
+    while hechas < maximo:
+        operacion(hechas)
+        hechas += 1
+        if time.perf_counter() - inicio > presupuesto:
+            break
+    return (time.perf_counter() - inicio) / hechas * 1000
+
+
+# -------------------------
+# Persistencia: tres JSON vs. SQLite normalizado (user-024)
+# -------------------------
+def tamano(directorio: str, nombres) -> int:
+    return sum(os.path.getsize(os.path.join(directorio, n)) for n in nombres
+               if os.path.exists(os.path.join(directorio, n)))
+
+
+def medir_operaciones(bib: Biblioteca, args) -> dict:
+    rng = random.Random(24)
+    disponibles = list(bib.libros)
+    usuarios = list(bib.usuarios_data)
+    k, t = args.operaciones, args.presupuesto
+    pares = [(rng.choice(usuarios), isbn) for isbn in rng.sample(disponibles, k)]
+    resultados = {"prestar": medir(lambda i: bib.prestar_libro(*pares[i]), k, t)}
+    # se devuelven los que se prestaron (medir puede haber parado antes por presupuesto)
+    prestados = [par for par in pares if bib.prestamos.get(par[1]) == par[0]]
+    resultados["devolver"] = medir(lambda i: bib.devolver_libro(*prestados[i]), len(prestados), t)
+    nuevos = [modulo.Libro(("Nuevo", str(i)), ("Autor",), "Novela", f"nuevo{i}") for i in range(k)]
+    resultados["agregar_libro"] = medir(lambda i: bib.agregar_libro(nuevos[i]), k, t)
+    usuarios_nuevos = [modulo.Usuario("Nuevo", f"nuevo{i}") for i in range(k)]
+    resultados["registrar_usuario"] = medir(lambda i: bib.registrar_usuario(usuarios_nuevos[i]), k, t)
+    return resultados
+
+
+def bench_persistencia(args) -> None:
+    archivos_json = (Biblioteca.LIBROS_FILE, Biblioteca.USUARIOS_FILE, Biblioteca.PRESTAMOS_FILE)
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_archivos(tmp, args.libros, args.usuarios, args.prestamos)
+        with en_directorio(tmp):
+            bytes_json = tamano(tmp, archivos_json)
+            t_migrar = cronometrar(lambda: modulo.migrar_json_a_sqlite("biblioteca.db"))
+            bytes_db = tamano(tmp, ["biblioteca.db"])
+            json_ms = medir_operaciones(Biblioteca(), args)
+            almacen = AlmacenSQLite("biblioteca.db")
+            sqlite_ms = medir_operaciones(Biblioteca(almacen), args)
+            almacen.cerrar()
+
+    print(f"{args.libros} libros ({args.prestamos} prestados), {args.usuarios} usuarios")
+    print(f"  tamaño en disco: tres JSON {bytes_json / 1e6:.1f} MB | SQLite {bytes_db / 1e6:.1f} MB"
+          f" (migración: {t_migrar:.1f} s)")
+    print(f"  {'ms por operación':<20} | {'tres JSON':>10} | {'SQLite':>10}")
+    for operacion in json_ms:
+        print(f"  {operacion:<20} | {json_ms[operacion]:>10.2f} | {sqlite_ms[operacion]:>10.3f}")
+
+
+# -------------------------
+# Arranque: carga de los tres JSON (user-025)
+# -------------------------
+class BibliotecaAnterior(Biblioteca):
+    """Carga como era antes: archivos en secuencia, prestados convertidos dos veces y con el recolector activo."""
+
+    def cargar_datos(self) -> None:
+        self._cargar_json()
+        self.prestamos = {isbn: uid for uid, u in self.usuarios_data.items() for isbn in u.isbns_prestados}
+
+    def _cargar_json(self) -> None:
+        if os.path.exists(self.LIBROS_FILE):
+            with open(self.LIBROS_FILE, "r", encoding="utf-8") as f:
+                for d in json.load(f):
+                    libro = modulo.Libro.from_dict(d)
+                    self.libros[libro.isbn] = libro
+        if os.path.exists(self.USUARIOS_FILE):
+            with open(self.USUARIOS_FILE, "r", encoding="utf-8") as f:
+                for d in json.load(f):
+                    usuario = modulo.Usuario.from_dict(d)
+                    self.usuarios.add(usuario.id_usuario)
+                    self.usuarios_data[usuario.id_usuario] = usuario
+        if os.path.exists(self.PRESTAMOS_FILE):
+            with open(self.PRESTAMOS_FILE, "r", encoding="utf-8") as f:
+                for uid, libros in json.load(f).items():
+                    if uid in self.usuarios_data:
+                        self.usuarios_data[uid].asignar_prestamos(modulo.Libro.from_dict(d) for d in libros)
+
+
+def bench_arranque(args) -> None:
+    modos = {
+        "antes (secuencial, doble conversión)": (BibliotecaAnterior, {}),
+        "secuencial": (Biblioteca, {"paralelo": False}),
+        "paralela": (Biblioteca, {"paralelo": True}),
+        "secuencial + diferida": (Biblioteca, {"paralelo": False, "carga_diferida": True}),
+        "paralela + diferida": (Biblioteca, {"paralelo": True, "carga_diferida": True}),
+    }
+    archivos_json = (Biblioteca.LIBROS_FILE, Biblioteca.USUARIOS_FILE, Biblioteca.PRESTAMOS_FILE)
+    tiempos, acceso = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        crear_archivos(tmp, args.libros, args.usuarios, args.prestamos)
+        with en_directorio(tmp):
+            bytes_json = tamano(tmp, archivos_json)
+            with modulo._sin_recolector():
+                t_libros = cronometrar(lambda: modulo._leer_json(Biblioteca.LIBROS_FILE))
+            t_usuarios = cronometrar(lambda: modulo._leer_usuarios(Biblioteca.USUARIOS_FILE,
+                                                                   Biblioteca.PRESTAMOS_FILE))
+            for nombre, (clase, opciones) in modos.items():
+                cargada = []
+                tiempos[nombre] = cronometrar(lambda: cargada.append(clase(**opciones)))
+                if opciones.get("carga_diferida"):
+                    usuarios = cargada[0].usuarios_data.values()
+                    acceso[nombre] = cronometrar(lambda: [u.libros_prestados for u in usuarios])
+                del cargada
+
+    print(f"{args.libros} libros ({args.prestamos} prestados), {args.usuarios} usuarios;"
+          f" tres JSON {bytes_json / 1e6:.1f} MB; {os.cpu_count()} CPU")
+    print(f"  lectura: libros.json {t_libros:.2f} s | usuarios.json + prestamos.json {t_usuarios:.2f} s")
+    print(f"  {'carga':<38} | {'arranque':>9} | {'préstamos al primer acceso':>26}")
+    for nombre, segundos in tiempos.items():
+        diferido = f"{acceso[nombre]:.2f} s" if nombre in acceso else "-"
+        print(f"  {nombre:<38} | {segundos:>7.2f} s | {diferido:>26}")
+
+
+# -------------------------
+# Línea de comandos
+# -------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks de la Biblioteca (Semana 12)")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p = sub.add_parser("persistencia", help="tamaño en disco y latencia de escritura: tres JSON vs. SQLite")
+    p.add_argument("--libros", type=int, default=100_000)
+    p.add_argument("--usuarios", type=int, default=20_000)
+    p.add_argument("--prestamos", type=int, default=20_000, help="libros prestados al empezar")
+    p.add_argument("--operaciones", type=int, default=200, help="máximo de repeticiones por operación")
+    p.add_argument("--presupuesto", type=float, default=10.0, help="segundos máximos por operación")
+    p.set_defaults(funcion=bench_persistencia)
+
+    p = sub.add_parser("arranque", help="tiempo de cargar_datos: secuencial, en paralelo y con carga diferida")
+    p.add_argument("--libros", type=int, default=1_000_000)
+    p.add_argument("--usuarios", type=int, default=200_000)
+    p.add_argument("--prestamos", type=int, default=200_000, help="libros prestados")
+    p.set_defaults(funcion=bench_arranque)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Permite importar "Tarea semana 12.py" como módulo normal.
+
+El nombre del archivo tiene espacios, así que no se puede usar `import` directo;
+lo cargamos con importlib y reexportamos las clases que usan los demás scripts
+de esta carpeta (benchmarks, herramientas, etc.).
+"""
+import importlib.util
+import os
+import sys
+
+_NOMBRE = "tarea_semana_12"
+_RUTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Tarea semana 12.py")
+
+if _NOMBRE in sys.modules:
+    modulo = sys.modules[_NOMBRE]
+else:
+    _spec = importlib.util.spec_from_file_location(_NOMBRE, _RUTA)
+    modulo = importlib.util.module_from_spec(_spec)
+    sys.modules[_NOMBRE] = modulo
+    _spec.loader.exec_module(modulo)
+
+Libro = modulo.Libro
+Usuario = modulo.Usuario
+Biblioteca = modulo.Biblioteca
+AlmacenSQLite = modulo.AlmacenSQLite
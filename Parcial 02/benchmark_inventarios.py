@@ -0,0 +1,282 @@
+"""
+Benchmark comparativo de las tres generaciones de Inventario:
+
+  - Semana 09: dict por ID, sin índices.
+  - Semana 10: productos en orden de inserción (antes una lista con búsquedas
+    lineales por ID; ahora una colección ordenada indexada por ID).
+  - Semana 11: dict por ID + índices (también en modo diario).
+
+Todas se someten a las mismas cargas (añadir, actualizar, eliminar, buscar,
+guardar y cargar) con 1k, 10k, 100k y 1M productos. Los archivos JSON se
+redirigen a un directorio temporal y la salida por consola de las versiones
+antiguas se descarta.
+
+Como las versiones antiguas reescriben el archivo en cada cambio, cada operación
+se repite hasta `--operaciones` veces o hasta agotar `--presupuesto` segundos, y
+se informa el tiempo medio por operación. Con --sin-disco, añadir, actualizar y
+eliminar no escriben el archivo: se mide solo el costo en memoria de cada estructura.
+
+Uso:
+    python benchmark_inventarios.py [--tamanos 1000 10000] [--salida resultados.json]
+                                    [--comparar resultados_anteriores.json] [--sin-disco]
+"""
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+OPERACIONES = ["añadir", "actualizar", "eliminar", "buscar", "guardar", "cargar"]
+
+
+def cargar_modulo(nombre: str, ruta_relativa: str):
+    """Importa un script por ruta (los nombres de archivo tienen espacios)."""
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(BASE, ruta_relativa))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# -------------------------
+# Adaptadores: misma interfaz para las tres versiones
+# -------------------------
+class Adaptador(ABC):
+    nombre = ""
+    metodo_guardar = "guardar"  # método que escribe a disco tras cada cambio
+
+    def __init__(self, modulo, archivo: str):
+        self.m = modulo
+        self.archivo = archivo
+        self.inv = None
+
+    @abstractmethod
+    def poblar(self, productos: List[tuple]) -> None:
+        """Carga los productos directamente en memoria y los guarda una vez (sin cronometrar)."""
+
+    @abstractmethod
+    def abrir(self):
+        ...
+
+    @abstractmethod
+    def añadir(self, p: tuple) -> None:
+        ...
+
+    @abstractmethod
+    def actualizar(self, pid: str, cantidad: int) -> None:
+        ...
+
+    def eliminar(self, pid: str) -> None:
+        self.inv.eliminar_producto(pid)
+
+    @abstractmethod
+    def buscar(self, texto: str) -> None:
+        ...
+
+    @abstractmethod
+    def guardar(self) -> None:
+        ...
+
+    def desactivar_disco(self) -> None:
+        setattr(self.inv, self.metodo_guardar, lambda *args, **kwargs: None)
+
+    def activar_disco(self) -> None:
+        self.inv.__dict__.pop(self.metodo_guardar, None)
+
+
+class Semana09(Adaptador):
+    nombre = "semana 09 (dict)"
+
+    def poblar(self, productos):
+        self.inv = self.m.Inventario(self.archivo)
+        for p in productos:
+            self.inv.productos[p[0]] = self.m.Producto(*p)
+        self.inv.guardar()
+
+    def abrir(self):
+        return self.m.Inventario(self.archivo)
+
+    def añadir(self, p):
+        self.inv.agregar_producto(self.m.Producto(*p))
+
+    def actualizar(self, pid, cantidad):
+        self.inv.actualizar_producto(pid, cantidad=cantidad)
+
+    def buscar(self, texto):
+        self.inv.buscar_por_nombre(texto)
+
+    def guardar(self):
+        self.inv.guardar()
+
+
+class Semana10(Adaptador):
+    nombre = "semana 10 (lista)"  # se mantiene el nombre para poder comparar con resultados anteriores
+    metodo_guardar = "guardar_en_archivo"
+
+    def poblar(self, productos):
+        self.inv = self.m.Inventario(self.archivo)
+        self.inv.productos.extend(self.m.Producto(*p) for p in productos)
+        self.inv.guardar_en_archivo()
+
+    def abrir(self):
+        return self.m.Inventario(self.archivo)
+
+    def añadir(self, p):
+        self.inv.agregar_producto(self.m.Producto(*p))
+
+    def actualizar(self, pid, cantidad):
+        self.inv.actualizar_producto(pid, cantidad=cantidad)
+
+    def buscar(self, texto):
+        self.inv.buscar_producto(texto)
+
+    def guardar(self):
+        self.inv.guardar_en_archivo()
+
+
+class Semana11(Adaptador):
+    nombre = "semana 11 (índices)"
+    opciones: Dict = {}
+
+    def poblar(self, productos):
+        self.inv = self.abrir()
+        for p in productos:
+            prod = self.m.Producto(*p)
+            self.inv._productos[prod.id] = prod
+            self.inv._indexar(prod)
+        self.inv.guardar()
+
+    def abrir(self):
+        return self.m.Inventario(self.archivo, **self.opciones)
+
+    def añadir(self, p):
+        self.inv.añadir_producto(self.m.Producto(*p))
+
+    def actualizar(self, pid, cantidad):
+        self.inv.actualizar_cantidad(pid, cantidad)
+
+    def buscar(self, texto):
+        self.inv.buscar_por_nombre(texto)
+
+    def guardar(self):
+        self.inv.guardar()
+
+
+class Semana11Diario(Semana11):
+    nombre = "semana 11 (diario)"
+    opciones = {"diario": True}
+    metodo_guardar = "_escribir_diario"
+
+
+# -------------------------
+# Cargas de trabajo
+# -------------------------
+def medir(operacion: Callable[[int], None], maximo: int, presupuesto: float) -> Dict:
+    """Ejecuta operacion(i) hasta `maximo` veces o `presupuesto` segundos; devuelve la media."""
+    hechas = 0
+    inicio = time.perf_counter()
+    while hechas < maximo:
+        operacion(hechas)
+        hechas += 1
+        if time.perf_counter() - inicio > presupuesto:
+            break
+    total = time.perf_counter() - inicio
+    return {"ops": hechas, "ms_por_op": total / hechas * 1000}
+
+
+def ejecutar(clase, modulo, n: int, args) -> Dict[str, Dict]:
+    rng = random.Random(n)
+    productos = [(f"{i:07d}", f"Producto {i}", rng.randint(0, 100), round(rng.uniform(1, 100), 2))
+                 for i in range(n)]
+    ids = [p[0] for p in productos]
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        adaptador = clase(modulo, os.path.join(tmp, "inventario.json"))
+        adaptador.poblar(productos)
+        k, t = args.operaciones, args.presupuesto
+        if args.sin_disco:
+            adaptador.desactivar_disco()
+
+        nuevos = [(f"nuevo-{i:06d}", f"Producto nuevo {i}", 1, 1.0) for i in range(k)]
+        resultados["añadir"] = medir(lambda i: adaptador.añadir(nuevos[i]), k, t)
+        resultados["actualizar"] = medir(lambda i: adaptador.actualizar(rng.choice(ids), i % 100), k, t)
+        # se eliminan los recién añadidos para volver al tamaño original
+        añadidos = resultados["añadir"]["ops"]
+        resultados["eliminar"] = medir(lambda i: adaptador.eliminar(nuevos[i][0]), añadidos, t)
+        resultados["buscar"] = medir(lambda i: adaptador.buscar(f"producto {rng.randrange(n)}"), k, t)
+        adaptador.activar_disco()
+        resultados["guardar"] = medir(lambda i: adaptador.guardar(), 3, t)
+        resultados["cargar"] = medir(lambda i: adaptador.abrir(), 3, t)
+    return resultados
+
+
+# -------------------------
+# Informe
+# -------------------------
+def imprimir_tabla(resultados: Dict, anteriores: Dict) -> None:
+    ancho = 20 if anteriores else 12
+    for n, por_impl in resultados.items():
+        print(f"\n== {int(n):,} productos (ms por operación) ==")
+        print(f"{'implementación':<22}" + "".join(f"{op:>{ancho}}" for op in OPERACIONES))
+        for impl, ops in por_impl.items():
+            fila = f"{impl:<22}"
+            for op in OPERACIONES:
+                valor = ops[op]["ms_por_op"]
+                celda = f"{valor:.3f}"
+                previo = anteriores.get(n, {}).get(impl, {}).get(op)
+                if previo:
+                    celda += f" ({(valor / previo['ms_por_op'] - 1) * 100:+.0f}%)"
+                fila += f"{celda:>{ancho}}"
+            print(fila)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark comparativo de Inventario (semanas 09, 10 y 11)")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--operaciones", type=int, default=100, help="máximo de repeticiones por operación")
+    parser.add_argument("--presupuesto", type=float, default=5.0, help="segundos máximos por operación")
+    parser.add_argument("--salida", default="resultados_inventarios.json")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para mostrar la variación")
+    parser.add_argument("--sin-disco", action="store_true",
+                        help="añadir/actualizar/eliminar sin escribir el archivo (solo costo en memoria)")
+    args = parser.parse_args()
+
+    modulos = {
+        Semana09: cargar_modulo("tarea_semana_09", "Semana 09/Tarea semana 09.py"),
+        Semana10: cargar_modulo("tarea_semana_10", "Semana 10/Tarea semana 10.py"),
+        Semana11: cargar_modulo("tarea_semana_11", "Semana 11/Tarea semana 11.py"),
+    }
+    modulos[Semana11Diario] = modulos[Semana11]
+
+    resultados: Dict[str, Dict] = {}
+    for n in args.tamanos:
+        resultados[str(n)] = {}
+        for clase, modulo in modulos.items():
+            print(f"{clase.nombre}: {n} productos...", flush=True)
+            resultados[str(n)][clase.nombre] = ejecutar(clase, modulo, n, args)
+
+    anteriores = {}
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            anteriores = json.load(f)["resultados"]
+    imprimir_tabla(resultados, anteriores)
+
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump({
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "parametros": {"operaciones": args.operaciones, "presupuesto": args.presupuesto,
+                           "sin_disco": args.sin_disco},
+            "resultados": resultados,
+        }, f, ensure_ascii=False, indent=4)
+    print(f"\nResultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
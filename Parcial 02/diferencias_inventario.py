@@ -0,0 +1,395 @@
+"""
+Diferencias, parches y fusión de archivos de inventario (formato dict de dicts de
+las semanas 09 y 11: {"id": {...registro...}, ...}).
+
+Los archivos se leen en streaming, registro a registro, sin cargarlos enteros:
+
+  - diff: recorre A y guarda solo id -> huella (blake2b de 8 bytes del registro
+    canónico); luego recorre B y compara. En memoria queda un entero por producto
+    de A, nunca dos grafos de objetos completos.
+  - parche: JSON por línea con una cabecera y una línea por diferencia:
+        {"parche": 1, "base": <huella de A>, "resultado": <huella de B>}
+        {"op": "add", "id": "007", "registro": {...}}
+        {"op": "set", "id": "001", "registro": {...}}     (registro completo nuevo)
+        {"op": "del", "id": "003"}
+  - aplicar: carga solo el parche (el delta) y reescribe la base en streaming,
+    comprobando que la base es la misma sobre la que se calculó el parche.
+  - fusionar: une A y B; los productos solo en uno de los dos se conservan y en
+    los que difieren gana `preferir` ("a" o "b").
+
+Uso:
+    python diferencias_inventario.py diff tienda1.json tienda2.json [--parche delta.jsonl]
+    python diferencias_inventario.py aplicar tienda1.json delta.jsonl salida.json
+    python diferencias_inventario.py fusionar tienda1.json tienda2.json salida.json [--preferir b]
+    python diferencias_inventario.py medir [--registros 1000000] [--cambios 1000]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+TAMANO_BLOQUE = 1 << 20  # bytes leídos de cada vez
+MASCARA_64 = (1 << 64) - 1
+_ESPACIOS = re.compile(r"[ \t\n\r]*")
+
+
+# -------------------------
+# Lectura en streaming
+# -------------------------
+class _LectorObjeto:
+    """Recorre los pares clave/valor del objeto JSON de primer nivel de un archivo."""
+
+    def __init__(self, archivo, tamano_bloque: int):
+        self._archivo = archivo
+        self._tamano_bloque = tamano_bloque
+        self._buffer = ""
+        self._pos = 0
+        self._fin_archivo = False
+        self._decodificador = json.JSONDecoder()
+
+    def _leer_mas(self) -> None:
+        bloque = self._archivo.read(self._tamano_bloque)
+        if not bloque:
+            self._fin_archivo = True
+        self._buffer = self._buffer[self._pos:] + bloque
+        self._pos = 0
+
+    def _siguiente(self) -> str:
+        """Salta espacios y devuelve el siguiente carácter sin consumirlo ('' al final)."""
+        while True:
+            self._pos = _ESPACIOS.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._fin_archivo:
+                return ""
+            self._leer_mas()
+
+    def _consumir(self, esperado: str) -> None:
+        encontrado = self._siguiente()
+        if encontrado != esperado:
+            raise ValueError(f"JSON inválido: se esperaba '{esperado}' y hay '{encontrado}'.")
+        self._pos += 1
+
+    def _valor(self) -> Any:
+        self._siguiente()
+        while True:
+            try:
+                valor, fin = self._decodificador.raw_decode(self._buffer, self._pos)
+                # un número al final del buffer podría seguir en el próximo bloque
+                if fin < len(self._buffer) or self._fin_archivo:
+                    self._pos = fin
+                    return valor
+            except json.JSONDecodeError:
+                if self._fin_archivo:
+                    raise
+            self._leer_mas()
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        self._consumir("{")
+        if self._siguiente() == "}":
+            return
+        while True:
+            clave = self._valor()
+            if not isinstance(clave, str):
+                raise ValueError("JSON inválido: las claves deben ser cadenas.")
+            self._consumir(":")
+            yield clave, self._valor()
+            separador = self._siguiente()
+            self._pos += 1
+            if separador == "}":
+                return
+            if separador != ",":
+                raise ValueError(f"JSON inválido: se esperaba ',' o '}}' y hay '{separador}'.")
+
+
+def leer_registros(ruta: str, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[Tuple[str, Any]]:
+    """Genera (id, registro) de un archivo de inventario sin cargarlo entero."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        yield from _LectorObjeto(f, tamano_bloque)
+
+
+_CANONICO = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def huella(registro: Any) -> int:
+    """Huella de 64 bits del registro en forma canónica (claves ordenadas, sin espacios)."""
+    canonico = _CANONICO.encode(registro).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(canonico, digest_size=8).digest(), "little")
+
+
+def _huella_par(clave: str, h: int) -> int:
+    """Huella de (id, huella del registro); su suma da la huella del archivo, sin importar el orden."""
+    datos = clave.encode("utf-8") + b"\0" + h.to_bytes(8, "little")
+    return int.from_bytes(hashlib.blake2b(datos, digest_size=8).digest(), "little")
+
+
+class _EscritorObjeto:
+    """Escribe un dict de dicts con el mismo formato que json.dump(indent=4), registro a registro."""
+
+    def __init__(self, archivo):
+        self._archivo = archivo
+        self._primero = True
+
+    def escribir(self, clave: str, registro: Any) -> None:
+        cuerpo = json.dumps(registro, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+        self._archivo.write(("{\n" if self._primero else ",\n") + f"    {json.dumps(clave, ensure_ascii=False)}: {cuerpo}")
+        self._primero = False
+
+    def cerrar(self) -> None:
+        self._archivo.write("{}" if self._primero else "\n}")
+
+
+# -------------------------
+# Diferencias
+# -------------------------
+def _comparar(ruta_a: str, ruta_b: str) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Genera ("add" | "set" | "del", id, registro_de_b) y, al final,
+    ("fin", huella_a, huella_b): huellas de archivo independientes del orden.
+    """
+    huellas: Dict[str, int] = {}
+    total_a = 0
+    for clave, registro in leer_registros(ruta_a):
+        h = huella(registro)
+        huellas[clave] = h
+        total_a = (total_a + _huella_par(clave, h)) & MASCARA_64
+    total_b = 0
+    for clave, registro in leer_registros(ruta_b):
+        h = huella(registro)
+        total_b = (total_b + _huella_par(clave, h)) & MASCARA_64
+        anterior = huellas.pop(clave, None)
+        if anterior is None:
+            yield "add", clave, registro
+        elif anterior != h:
+            yield "set", clave, registro
+    for clave in huellas:
+        yield "del", clave, None
+    yield "fin", total_a, total_b
+
+
+def diff(ruta_a: str, ruta_b: str, ruta_parche: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Compara dos archivos. Devuelve {"añadidos": [ids], "eliminados": [ids], "cambiados": [ids]}
+    y, si se indica ruta_parche, escribe el parche que convierte A en B.
+    """
+    informe: Dict[str, List[str]] = {"añadidos": [], "eliminados": [], "cambiados": []}
+    nombres = {"add": "añadidos", "del": "eliminados", "set": "cambiados"}
+    parche = None
+    if ruta_parche:
+        temporal = ruta_parche + ".tmp"
+        parche = open(temporal, "w", encoding="utf-8")
+        # la cabecera se escribe al final (hace falta la huella de B) reservando su sitio
+        parche.write(" " * 80 + "\n")
+    try:
+        for op, clave, registro in _comparar(ruta_a, ruta_b):
+            if op == "fin":
+                cabecera = {"parche": 1, "base": clave, "resultado": registro}
+                break
+            informe[nombres[op]].append(clave)
+            if parche is not None:
+                linea = {"op": op, "id": clave} if op == "del" else {"op": op, "id": clave, "registro": registro}
+                parche.write(json.dumps(linea, ensure_ascii=False, separators=(",", ":")) + "\n")
+        if parche is not None:
+            parche.seek(0)
+            parche.write(json.dumps(cabecera, separators=(",", ":")).ljust(80))
+            parche.close()
+            os.replace(temporal, ruta_parche)
+    finally:
+        if parche is not None and not parche.closed:
+            parche.close()
+            os.remove(temporal)
+    return informe
+
+
+def leer_parche(ruta: str) -> Tuple[Dict, Dict[str, Optional[Any]]]:
+    """Devuelve (cabecera, {id: registro nuevo o None si se elimina})."""
+    cambios: Dict[str, Optional[Any]] = {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        cabecera = json.loads(f.readline())
+        if cabecera.get("parche") != 1:
+            raise ValueError(f"'{ruta}' no es un parche de inventario.")
+        for linea in f:
+            if linea.strip():
+                d = json.loads(linea)
+                cambios[d["id"]] = None if d["op"] == "del" else d["registro"]
+    return cabecera, cambios
+
+
+def _reescribir(ruta_base: str, cambios: Dict[str, Optional[Any]], ruta_salida: str,
+                base_esperada: Optional[int] = None) -> int:
+    """Copia la base aplicando `cambios` en streaming. Devuelve los registros escritos."""
+    temporal = ruta_salida + ".tmp"
+    pendientes = dict(cambios)
+    escritos = 0
+    total = 0
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            escritor = _EscritorObjeto(f)
+            for clave, registro in leer_registros(ruta_base):
+                total = (total + _huella_par(clave, huella(registro))) & MASCARA_64
+                if clave in pendientes:
+                    registro = pendientes.pop(clave)
+                    if registro is None:
+                        continue
+                escritor.escribir(clave, registro)
+                escritos += 1
+            for clave, registro in pendientes.items():
+                if registro is not None:
+                    escritor.escribir(clave, registro)
+                    escritos += 1
+            escritor.cerrar()
+        if base_esperada is not None and total != base_esperada:
+            raise ValueError("El parche se calculó sobre otra versión del archivo base.")
+        os.replace(temporal, ruta_salida)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return escritos
+
+
+def aplicar(ruta_base: str, ruta_parche: str, ruta_salida: str) -> int:
+    """Aplica un parche a la base y escribe el resultado. Devuelve los registros escritos."""
+    cabecera, cambios = leer_parche(ruta_parche)
+    return _reescribir(ruta_base, cambios, ruta_salida, cabecera["base"])
+
+
+def fusionar(ruta_a: str, ruta_b: str, ruta_salida: str, preferir: str = "b") -> Dict[str, List[str]]:
+    """
+    Une A y B: conserva lo que solo está en A, añade lo que solo está en B y, si un
+    producto difiere, se queda con la versión de `preferir`. Devuelve el informe del diff.
+    """
+    if preferir not in ("a", "b"):
+        raise ValueError("preferir debe ser 'a' o 'b'.")
+    cambios: Dict[str, Any] = {}
+    informe: Dict[str, List[str]] = {"añadidos": [], "eliminados": [], "cambiados": []}
+    for op, clave, registro in _comparar(ruta_a, ruta_b):
+        if op == "add":
+            cambios[clave] = registro
+            informe["añadidos"].append(clave)
+        elif op == "set":
+            if preferir == "b":
+                cambios[clave] = registro
+            informe["cambiados"].append(clave)
+        elif op == "del":
+            informe["eliminados"].append(clave)
+    _reescribir(ruta_a, cambios, ruta_salida)
+    return informe
+
+
+# -------------------------
+# Medición con archivos grandes
+# -------------------------
+def _generar(ruta: str, n: int, rng: random.Random, cambios: int) -> None:
+    """Escribe n registros; si cambios > 0 modifica, elimina y añade algunos (para la versión B)."""
+    tocados = set(rng.sample(range(n), cambios)) if cambios else set()
+    with open(ruta, "w", encoding="utf-8") as f:
+        escritor = _EscritorObjeto(f)
+        for i in range(n):
+            registro = {"id": f"{i:07d}", "nombre": f"Producto {i}", "cantidad": i % 100, "precio": 1.0 + i % 50}
+            if i in tocados:
+                if i % 3 == 0:
+                    continue
+                registro["cantidad"] += 1
+            escritor.escribir(registro["id"], registro)
+        for j in range(cambios // 3):
+            escritor.escribir(f"nuevo{j:05d}", {"id": f"nuevo{j:05d}", "nombre": "Nuevo", "cantidad": 1, "precio": 1.0})
+        escritor.cerrar()
+
+
+def medir(args) -> None:
+    rng = random.Random(19)
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = os.path.join(tmp, "a.json"), os.path.join(tmp, "b.json")
+        parche, salida = os.path.join(tmp, "delta.jsonl"), os.path.join(tmp, "salida.json")
+        _generar(a, args.registros, random.Random(1), 0)
+        _generar(b, args.registros, rng, args.cambios)
+
+        def con_pico(funcion):
+            # tracemalloc ralentiza mucho: el tiempo y el pico de memoria se miden en pasadas distintas
+            inicio = time.perf_counter()
+            resultado = funcion()
+            duracion = time.perf_counter() - inicio
+            tracemalloc.start()
+            funcion()
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return resultado, duracion, pico
+
+        def cargar_y_comparar():
+            with open(a, "r", encoding="utf-8") as f:
+                datos_a = json.load(f)
+            with open(b, "r", encoding="utf-8") as f:
+                datos_b = json.load(f)
+            return sorted(k for k in datos_a.keys() | datos_b.keys() if datos_a.get(k) != datos_b.get(k))
+
+        informe, t_diff, pico_diff = con_pico(lambda: diff(a, b, parche))
+        _, t_aplicar, pico_aplicar = con_pico(lambda: aplicar(a, parche, salida))
+        distintos, t_cargar, pico_cargar = con_pico(cargar_y_comparar)
+        assert sorted(sum(informe.values(), [])) == distintos
+        assert dict(leer_registros(salida)) == dict(leer_registros(b))
+        tamanos = (os.path.getsize(a), os.path.getsize(parche))
+
+    print(f"{args.registros} registros ({tamanos[0] / 1e6:.0f} MB), "
+          f"{len(distintos)} diferencias, parche de {tamanos[1] / 1e3:.1f} KB")
+    print(f"  {'operación':<28} | {'tiempo (s)':>10} | {'pico de memoria (MB)':>20}")
+    print(f"  {'json.load de ambos + comparar':<28} | {t_cargar:>10.2f} | {pico_cargar / 1e6:>20.1f}")
+    print(f"  {'diff en streaming':<28} | {t_diff:>10.2f} | {pico_diff / 1e6:>20.1f}")
+    print(f"  {'aplicar parche':<28} | {t_aplicar:>10.2f} | {pico_aplicar / 1e6:>20.1f}")
+
+
+# -------------------------
+# Línea de comandos
+# -------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diferencias, parches y fusión de archivos de inventario")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("diff", help="productos añadidos, eliminados y cambiados de A a B")
+    p.add_argument("a")
+    p.add_argument("b")
+    p.add_argument("--parche", help="escribir el parche A -> B en esta ruta")
+    p.add_argument("--mostrar", type=int, default=20, help="IDs listados por categoría")
+
+    p = sub.add_parser("aplicar", help="aplicar un parche a un archivo base")
+    p.add_argument("base")
+    p.add_argument("parche")
+    p.add_argument("salida")
+
+    p = sub.add_parser("fusionar", help="unir dos archivos")
+    p.add_argument("a")
+    p.add_argument("b")
+    p.add_argument("salida")
+    p.add_argument("--preferir", choices=["a", "b"], default="b", help="versión que gana si difieren")
+
+    p = sub.add_parser("medir", help="tiempo y memoria con archivos grandes sintéticos")
+    p.add_argument("--registros", type=int, default=1_000_000)
+    p.add_argument("--cambios", type=int, default=1_000)
+
+    args = parser.parse_args()
+    if args.comando == "diff":
+        informe = diff(args.a, args.b, args.parche)
+        for categoria, ids in informe.items():
+            muestra = ", ".join(ids[:args.mostrar]) + (" ..." if len(ids) > args.mostrar else "")
+            print(f"{categoria}: {len(ids)}" + (f"  [{muestra}]" if ids else ""))
+        if args.parche:
+            print(f"Parche escrito en {args.parche}")
+    elif args.comando == "aplicar":
+        n = aplicar(args.base, args.parche, args.salida)
+        print(f"{n} productos escritos en {args.salida}")
+    elif args.comando == "fusionar":
+        informe = fusionar(args.a, args.b, args.salida, args.preferir)
+        print(f"Fusionado en {args.salida}: {len(informe['añadidos'])} añadidos desde B, "
+              f"{len(informe['cambiados'])} en conflicto (gana {args.preferir.upper()}), "
+              f"{len(informe['eliminados'])} solo en A")
+    else:
+        medir(args)
+
+
+if __name__ == "__main__":
+    main()